@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+OCR Benchmark
+
+Measures OCR accuracy and throughput offline over a directory of captured HP
+region frames labeled with their true value (see src/processing/ocr_benchmark.py
+for the corpus layout). Results are written as JSON so runs can be compared
+across changes.
+
+Usage:
+    python benchmark_ocr.py CORPUS_DIR [--strategies fast,cascade] [--output results.json]
+"""
+
+import argparse
+import json
+import sys
+
+from src.core.config import GameConfig
+from src.processing.ocr_benchmark import STRATEGIES, load_corpus, run_benchmark, format_report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OCR strategies over a labeled frame corpus")
+    parser.add_argument('corpus', help="Directory of labeled HP region frames")
+    parser.add_argument('--strategies', default=','.join(STRATEGIES),
+                        help=f"Comma-separated strategies (default: {','.join(STRATEGIES)})")
+    parser.add_argument('--backend', help="Tesseract backend override (auto, tesserocr, capi, subprocess)")
+    parser.add_argument('--max-hp', type=int, help="Max HP override (default: from config.json)")
+    parser.add_argument('--output', help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    config = GameConfig()
+    if args.backend:
+        config.tesseract_backend = args.backend
+    if args.max_hp:
+        config.max_hp = args.max_hp
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        print(f"❌ No labeled frames found in {args.corpus}", file=sys.stderr)
+        return 1
+
+    print(f"🔬 Benchmarking {len(corpus)} frames...", file=sys.stderr)
+    report = run_benchmark(config, corpus, args.strategies.split(','))
+
+    for line in format_report(report):
+        print(f"   {line}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Report saved to {args.output}", file=sys.stderr)
+    else:
+        print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Flight Recorder Dump
+
+Writes the last seconds captured by the flight recorder as a readable
+timeline (time, HP, decision, key pressed) plus one PNG per region frame.
+Works on the live file, on the .prev file kept from the previous session,
+and on a file left behind by a crash.
+
+Usage:
+    python dump_flight_recorder.py [RECORDING] [--output DIR]
+"""
+
+import argparse
+import datetime
+import mmap
+import os
+import sys
+
+from src.core.config import GameConfig
+from src.processing.flight_recorder import read_slots, dump_cycles
+
+
+def main():
+    config = GameConfig()
+    parser = argparse.ArgumentParser(description="Dump the flight recorder ring in readable form")
+    parser.add_argument('recording', nargs='?', default=config.flight_recorder_file,
+                        help=f"Flight recorder file (default: {config.flight_recorder_file})")
+    parser.add_argument('--output', help=f"Output directory (default: {config.flight_dump_dir}/dump_<time>)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.recording):
+        print(f"❌ No flight recording at {args.recording}", file=sys.stderr)
+        return 1
+
+    with open(args.recording, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            cycles = read_slots(data)
+
+    if not cycles:
+        print("⚠️  The flight recording is empty")
+        return 0
+
+    output_dir = args.output or os.path.join(config.flight_dump_dir, datetime.datetime.now().strftime('dump_%Y%m%d_%H%M%S'))
+    timeline = dump_cycles(cycles, output_dir)
+    span = cycles[-1]['timestamp'] - cycles[0]['timestamp']
+    print(f"🛩️ Dumped {len(cycles)} cycles ({span:.1f}s) to {output_dir}")
+    print(f"   Timeline: {timeline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
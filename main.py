@@ -14,6 +14,8 @@ The original monolithic file has been split into multiple classes for better org
 
 Usage:
     python main.py
+    python main.py --record session.frames           # also save every captured frame
+    python main.py --replay session.frames [--fast]  # rerun a recording, no screen or keys
 
 The tool will guide you through setup and then monitor your game's HP values,
 automatically pressing hotkeys when healing is needed.
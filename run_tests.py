@@ -22,6 +22,28 @@ def run_tests():
         ('Extended Health Tests', 'tests/test_health_monitor_extended.py'),
         ('Auto-Haste Tests', 'tests/test_auto_haste.py'),
         ('Skinner Tests', 'tests/test_skinner.py'),
+        ('Digit Recognizer Tests', 'tests/test_digit_recognizer.py'),
+        ('Tesseract Engine Tests', 'tests/test_tesseract_engine.py'),
+        ('Frame Cache Tests', 'tests/test_frame_cache.py'),
+        ('HP Bar Reader Tests', 'tests/test_hp_bar_reader.py'),
+        ('OCR Strategy Tests', 'tests/test_ocr_strategy.py'),
+        ('Parallel OCR Tests', 'tests/test_ocr_parallel.py'),
+        ('Montage Batch Tests', 'tests/test_montage.py'),
+        ('Screen Capture Tests', 'tests/test_screen_capture.py'),
+        ('Frame Tests', 'tests/test_frame.py'),
+        ('Health Parser Tests', 'tests/test_health_parser.py'),
+        ('HP Estimator Tests', 'tests/test_hp_estimator.py'),
+        ('Sensing Loop Tests', 'tests/test_sensing_loop.py'),
+        ('OCR Deadline Tests', 'tests/test_deadline.py'),
+        ('Latency Histogram Tests', 'tests/test_latency.py'),
+        ('OCR Benchmark Tests', 'tests/test_ocr_benchmark.py'),
+        ('Frame Recorder Tests', 'tests/test_frame_recorder.py'),
+        ('Flight Recorder Tests', 'tests/test_flight_recorder.py'),
+        ('Overlay Tests', 'tests/test_overlay.py'),
+        ('Performance HUD Tests', 'tests/test_perf_hud.py'),
+        ('Rate Controller Tests', 'tests/test_rate_controller.py'),
+        ('Input Dispatcher Tests', 'tests/test_input_dispatcher.py'),
+        ('Debug Logger Tests', 'tests/test_debug_logger.py'),
     ]
     
     all_passed = True
@@ -22,15 +22,69 @@ class GameConfig:
         # Timing settings
         self.monitor_frequency = 0.05  # 20 Hz
         
+        # Adaptive sampling - slow while HP is stable and high, max rate on any sign of danger
+        sampling = config_data.get('sampling', {})
+        self.adaptive_sampling = sampling.get('adaptive', True)
+        self.sampling_min_rate = sampling.get('min_rate', 5.0)  # Hz while stable
+        self.sampling_max_rate = sampling.get('max_rate', 20.0)  # Hz on danger
+        self.sampling_stable_seconds = sampling.get('stable_seconds', 3.0)  # Calm time before slowing down
+        self.sampling_threshold_margin = sampling.get('threshold_margin', 0.1)  # Max rate below hp_threshold + margin
+        
         # OCR settings
         self.max_failures_warning = 5
         self.dramatic_drop_threshold = 0.4
         self.critical_confirmation_time = 0.5
         
+        # OCR engine settings
+        ocr = config_data.get('ocr', {})
+        self.use_digit_recognizer = ocr.get('digit_recognizer', True)
+        self.template_min_confidence = ocr.get('template_min_confidence', 0.9)
+        self.digit_atlas_file = ocr.get('digit_atlas_file', 'digit_atlas.npz')
+        self.tesseract_backend = ocr.get('tesseract_backend', 'auto')
+        self.tesseract_language = ocr.get('tesseract_language', 'eng')
+        self.use_frame_cache = ocr.get('frame_cache', True)
+        self.adaptive_ocr = ocr.get('adaptive_strategy', True)
+        self.ocr_stats_file = ocr.get('strategy_stats_file', 'ocr_strategy_stats.json')
+        self.ocr_execution = ocr.get('execution', 'sequential')  # 'sequential', 'parallel' or 'batch'
+        self.ocr_workers = ocr.get('parallel_workers', min(4, os.cpu_count() or 1))
+        self.ocr_cycle_budget = ocr.get('cycle_budget', 0.25)  # seconds per reading, null = unbounded
+        
+        # Sensing settings - 'digits' (OCR), 'bar' (HP bar fill) or 'both' (cross-check)
+        sensing = config_data.get('sensing', {})
+        self.sensing_mode = sensing.get('mode', 'digits')
+        self.bar_fill_color = sensing.get('bar_fill_color', None)
+        self.bar_color_tolerance = sensing.get('bar_color_tolerance', 40)
+        self.bar_cross_check_tolerance = sensing.get('cross_check_tolerance', 0.1)
+        
+        # Screen capture settings - 'auto', 'xshm', 'mss', 'pyautogui' or 'file'
+        capture = config_data.get('capture', {})
+        self.capture_backend = capture.get('backend', 'auto')
+        self.capture_file = capture.get('file_path', None)
+        
+        # HP estimator settings - jumps use dramatic_drop_threshold and critical_confirmation_time
+        estimator = config_data.get('estimator', {})
+        self.use_estimator = estimator.get('enabled', True)
+        self.estimator_window = estimator.get('window', 5)
+        self.estimator_tolerance = estimator.get('consistency_tolerance', 0.02)
+        
         # Debug settings
         debug = config_data.get('debug', {})
         self.enable_debug = debug.get('enabled', True)
         self.debug_log_file = debug.get('log_file', 'debug/logs/game_helper_debug.log')
+        self.debug_max_bytes = debug.get('max_bytes', 5 * 1024 * 1024)  # Rotate above this size
+        self.debug_backup_count = debug.get('backup_count', 3)
+        self.debug_flush_interval = debug.get('flush_interval', 0.5)  # Background writer batch period
+        self.debug_level = debug.get('level', 'debug')  # 'trace', 'debug', 'info' or 'warn'
+        self.debug_collapse_window = debug.get('collapse_window', 5.0)  # Repeats within this many seconds are counted, not written
+        
+        # Flight recorder - the last seconds of frames and decisions in a memory-mapped ring
+        flight = config_data.get('flight_recorder', {})
+        self.use_flight_recorder = flight.get('enabled', True)
+        self.flight_recorder_file = flight.get('file', 'debug/flight_recorder.bin')
+        self.flight_recorder_seconds = flight.get('seconds', 10)
+        self.flight_recorder_region_bytes = flight.get('region_bytes', 16384)  # Larger regions keep their top rows
+        self.flight_dump_dir = flight.get('dump_dir', 'debug/flights')
+        self.flight_dump_on_critical = flight.get('dump_on_critical', True)
         
         # PyAutoGUI settings
         self.failsafe_enabled = True
@@ -40,11 +94,17 @@ class GameConfig:
         overlay = config_data.get('overlay', {})
         self.overlay_enabled = overlay.get('enabled', True)
         self.overlay_opacity = overlay.get('opacity', 0.9)
+        self.overlay_perf_hud = overlay.get('perf_hud', False)  # Loop rate / latency / OCR rate section
+        self.overlay_perf_window = overlay.get('perf_window', 5.0)  # Seconds the HUD figures cover
         
         # Hotkey settings
         hotkeys = config_data.get('hotkeys', {})
         self.toggle_key = hotkeys.get('toggle_bot', 'f9')
         
+        # Input settings
+        input_settings = config_data.get('input', {})
+        self.use_input_dispatcher = input_settings.get('dispatcher', True)  # One prioritized thread sends every key
+        
         # Skinner settings
         skinner = config_data.get('skinner', {})
         self.skinner_hotkey = skinner.get('hotkey', 'f3')
@@ -78,6 +138,14 @@ class GameConfig:
         
         return {}  # Return empty dict if no config found
     
+    def uses_digits(self):
+        """Check if HP is read from the digits"""
+        return self.sensing_mode in ('digits', 'both')
+    
+    def uses_bar(self):
+        """Check if HP is read from the HP bar"""
+        return self.sensing_mode in ('bar', 'both')
+    
     def set_max_values(self, max_hp):
         """Set maximum HP value"""
         self.max_hp = max_hp
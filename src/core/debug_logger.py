@@ -1,53 +1,256 @@
+import atexit
+import collections
 import datetime
 import os
+import sys
+import threading
+import time
 
 
 class DebugLogger:
+    """Levelled debug log with a background writer
+
+    log() drops records below the configured level before doing any work and
+    otherwise only appends (timestamp, level, message, args) to an in-memory
+    queue. A writer thread collapses repeats, applies the %-style args and
+    writes the records in batches through a file handle kept open for the
+    session.
+    The log is rotated before a write would take it past max_bytes (only a
+    single line longer than that can exceed it) and flushed when monitoring
+    stops, at exit and on an unhandled exception in any thread.
+
+    Trace and debug records are collapsed by message template (the format
+    string before its args): the first record of a template is written, the
+    others within the collapse window are only counted - the per-cycle lines
+    alternate, so comparing with the previous line alone would fold nothing.
+    Once the window ends one line reports the count with the last record's
+    text. Info and warn records are always written. Unknown level names are
+    treated as 'debug'.
+    """
+
+    LEVELS = {'trace': 5, 'debug': 10, 'info': 20, 'warn': 30}
+
+    # Records below this level are collapsed, the rest are always written
+    COLLAPSE_BELOW = LEVELS['info']
+
     def __init__(self, config):
         self.config = config
         self.log_file = config.debug_log_file
         self.enabled = config.enable_debug
+        self.max_bytes = config.debug_max_bytes
+        self.backup_count = config.debug_backup_count
+        self.flush_interval = config.debug_flush_interval
+        self.level = self.LEVELS.get(config.debug_level, self.LEVELS['debug'])
+        self.collapse_window = config.debug_collapse_window
+
+        # message template -> [window start, suppressed count, last suppressed time, last args]
+        self._recent = {}
+
+        # deque.append is atomic, so any thread can log without taking a lock
+        self.queue = collections.deque()
+
+        # Serializes draining between the writer thread and explicit flushes
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = False
+        self._file = None
+        self._bytes_written = 0
+        self._writer = None
+
         self.init_log()
-    
+
     def init_log(self):
         """Initialize debug log file"""
         if self.enabled:
             try:
-                with open(self.log_file, 'w') as f:
-                    f.write(f"=== Game Helper Debug Log Started ===\n")
-                    f.write(f"Timestamp: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                    f.write(f"Max HP: {self.config.max_hp}\n")
-                    thresholds = self.config.get_threshold_info()
-                    f.write(f"Thresholds: HP Critical={thresholds['hp_critical']}, HP Moderate={thresholds['hp_moderate']}\n")
-                    f.write(f"Cooldown: {self.config.cooldown}s\n")
-                    f.write("="*50 + "\n\n")
+                directory = os.path.dirname(self.log_file)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._file = open(self.log_file, 'w', encoding='utf-8')
+                header = (
+                    f"=== Game Helper Debug Log Started ===\n"
+                    f"Timestamp: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                    f"Max HP: {self.config.max_hp}\n"
+                )
+                thresholds = self.config.get_threshold_info()
+                header += f"Thresholds: HP Critical={thresholds['hp_critical']}, HP Moderate={thresholds['hp_moderate']}\n"
+                header += f"Cooldown: {self.config.cooldown}s\n"
+                header += "="*50 + "\n\n"
+                self._file.write(header)
+                self._file.flush()
+                self._bytes_written = len(header.encode('utf-8'))
                 print(f"📝 Debug logging enabled: {self.log_file}")
             except Exception as e:
                 print(f"⚠️  Warning: Could not initialize debug log: {e}")
                 self.enabled = False
-    
-    def log(self, message):
-        """Write debug message to log file with timestamp"""
-        if not self.enabled:
+                return
+
+            self._writer = threading.Thread(target=self._run_writer, name='debug-log', daemon=True)
+            self._writer.start()
+
+            # Queued records must reach the file however the process ends
+            atexit.register(self.close)
+            self._previous_excepthook = sys.excepthook
+            sys.excepthook = self._on_crash
+            self._previous_thread_excepthook = threading.excepthook
+            threading.excepthook = self._on_thread_crash
+
+    def log(self, message, *args, level='debug'):
+        """Queue a message at a level - args are %-formatted on the writer thread"""
+        level = self.LEVELS.get(level, self.LEVELS['debug'])
+        if not self.enabled or level < self.level:
             return
+        self.queue.append((time.time(), level, message, args))
+
+    def is_enabled(self, level):
+        """Check if a level is written (guards log arguments that are costly to build)"""
+        return self.enabled and self.LEVELS.get(level, self.LEVELS['debug']) >= self.level
+
+    def _run_writer(self):
+        """Write queued records in batches until closed"""
+        while not self._stop:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self, final=False):
+        """Write every queued record to the file now
+
+        Collapsed repeats are reported once their window has ended, or all of
+        them when final is set.
+        """
+        with self._write_lock:
+            if self._file is None:
+                return
+
+            lines = []
+            try:
+                while True:
+                    timestamp, level, message, args = self.queue.popleft()
+                    self._collapse(lines, timestamp, level, message, args)
+            except IndexError:
+                pass
+            self._report_repeats(lines, None if final else time.time())
+            if not lines:
+                return
+
+            try:
+                batch, batch_bytes = [], 0
+                for line in lines:
+                    size = len(line.encode('utf-8'))
+                    if self.max_bytes and self._bytes_written + batch_bytes + size > self.max_bytes \
+                            and self._bytes_written + batch_bytes:
+                        self._write(batch, batch_bytes)
+                        self._rotate()
+                        batch, batch_bytes = [], 0
+                    batch.append(line)
+                    batch_bytes += size
+                self._write(batch, batch_bytes)
+            except Exception as e:
+                pass  # Silently fail to avoid disrupting the main flow
+
+    def _write(self, batch, batch_bytes):
+        """Write a batch of lines to the current file (write lock held)"""
+        if batch:
+            self._file.write("".join(batch))
+            self._file.flush()
+            self._bytes_written += batch_bytes
+
+    @staticmethod
+    def _format(message, args):
+        """Apply %-style args, keeping the raw message if they do not fit"""
+        if not args:
+            return message
         try:
-            timestamp = datetime.datetime.now().strftime('%H:%M:%S.%f')[:-3]  # Include milliseconds
-            with open(self.log_file, 'a') as f:
-                f.write(f"[{timestamp}] {message}\n")
-        except Exception as e:
-            pass  # Silently fail to avoid disrupting the main flow
-    
+            return message % args
+        except (TypeError, ValueError):
+            return f"{message} {args}"
+
+    @staticmethod
+    def _line(timestamp, text):
+        stamp = datetime.datetime.fromtimestamp(timestamp).strftime('%H:%M:%S.%f')[:-3]  # Include milliseconds
+        return f"[{stamp}] {text}\n"
+
+    def _collapse(self, lines, timestamp, level, message, args):
+        """Write a record unless its template was already written within the collapse window
+
+        Counted records are never formatted.
+        """
+        if level < self.COLLAPSE_BELOW:
+            entry = self._recent.get(message)
+            if entry is not None and timestamp - entry[0] < self.collapse_window:
+                entry[1] += 1
+                entry[2] = timestamp
+                entry[3] = args
+                return
+            if entry is not None:
+                self._write_repeats(lines, message, entry)
+            self._recent[message] = [timestamp, 0, timestamp, args]
+        lines.append(self._line(timestamp, self._format(message, args)))
+
+    def _write_repeats(self, lines, message, entry):
+        start, count, last, args = entry
+        if count:
+            lines.append(self._line(last, f"{self._format(message, args)} (+{count} similar in {last - start:.1f}s)"))
+
+    def _report_repeats(self, lines, now):
+        """Report and forget repeats whose window has ended (all of them when now is None)"""
+        expired = [(entry[2], message, entry) for message, entry in self._recent.items()
+                   if now is None or now - entry[0] >= self.collapse_window]
+        for _, message, entry in sorted(expired, key=lambda item: item[0]):
+            self._write_repeats(lines, message, entry)
+            del self._recent[message]
+
+    def _rotate(self):
+        """Shift log -> log.1 -> log.2 ... and start a new file (write lock held)"""
+        self._file.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.log_file}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.log_file}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.log_file, f"{self.log_file}.1")
+        self._file = open(self.log_file, 'w', encoding='utf-8')
+        self._bytes_written = 0
+
+    def _on_crash(self, exc_type, exc_value, exc_traceback):
+        """Record an unhandled exception and flush before the process dies"""
+        self.log("CRASH: Unhandled %s: %s", exc_type.__name__, exc_value, level='warn')
+        self.flush(final=True)
+        self._previous_excepthook(exc_type, exc_value, exc_traceback)
+
+    def _on_thread_crash(self, args):
+        """Record an exception that ended a thread (sensing, input, ...) and flush"""
+        thread = args.thread.name if args.thread else 'unknown'
+        self.log("CRASH: Unhandled %s in thread %s: %s", args.exc_type.__name__, thread, args.exc_value, level='warn')
+        self.flush(final=True)
+        self._previous_thread_excepthook(args)
+
+    def close(self):
+        """Stop the writer thread and flush the remaining records"""
+        self._stop = True
+        self._wake.set()
+        if self._writer and self._writer is not threading.current_thread():
+            self._writer.join(timeout=1)
+        self.enabled = False
+        self.flush(final=True)
+        with self._write_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
     def log_section(self, section_name):
         """Log a section separator"""
-        self.log(f"=== {section_name} ===")
-    
+        self.log("=== %s ===", section_name, level='info')
+
     def log_monitoring_start(self, regions):
         """Log monitoring session start"""
         current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.log(f"=== MONITORING SESSION START: {current_time} ===")
-        self.log(f"Region: HP{regions.get('hp')}")
-    
+        self.log("=== MONITORING SESSION START: %s ===", current_time, level='info')
+        self.log("Region: HP%s HP bar%s", regions.get('hp'), regions.get('hp_bar'), level='info')
+
     def log_monitoring_stop(self, reason="USER"):
         """Log monitoring stop information"""
         self.log_section(f"MONITORING STOPPED BY {reason}")
-        self.log("=== SESSION ENDED ===\n") 
\ No newline at end of file
+        self.log("=== SESSION ENDED ===\n", level='info')
+        self.flush(final=True)
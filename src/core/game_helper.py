@@ -2,39 +2,102 @@ import time
 import pyautogui
 import signal
 import sys
+import argparse
 from .config import GameConfig
 from .debug_logger import DebugLogger
 from .hotkey_manager import HotkeyManager
 from ..processing.ocr_processor import OCRProcessor
 from ..processing.region_manager import RegionManager
+from ..processing.hp_bar_reader import HPBarReader
+from ..processing.screen_capture import create_screen_capture, ReplayCapture
+from ..processing.frame_recorder import FrameRecorder, FrameReader
+from ..processing.flight_recorder import FlightRecorder
+from ..processing.hp_estimator import HPEstimator
+from ..processing.latency import LatencyRecorder
 from ..monitors.health_monitor import HealthMonitor
 from ..monitors.skinner import Skinner
 from ..monitors.auto_haste import AutoHaste
+from ..monitors.sensing_loop import SensingLoop
+from ..monitors.rate_controller import RateController
+from ..monitors.input_dispatcher import InputDispatcher
+from ..monitors.replay_keyboard import ReplayKeyboard
 from ..ui.overlay import GameOverlay
+from ..ui.perf_hud import PerfHUD
 
 
 class GameHelper:
-    def __init__(self):
+    def __init__(self, record_path=None, replay_path=None):
         # Initialize configuration
         self.config = GameConfig()
         
         # Initialize debug logger
         self.debug_logger = DebugLogger(self.config)
         
+        # Initialize per-stage latency histograms (shared by the whole pipeline)
+        self.latency = LatencyRecorder()
+        
+        # Initialize screen capture backend - replay swaps the screen and keyboard
+        # for stand-ins and runs on the recorded capture clock
+        self.replay_path = replay_path
+        self.keyboard = None
+        self.input_dispatcher = None
+        clock = None
+        if replay_path:
+            self.screen_capture = ReplayCapture(self.debug_logger)
+            clock = self.screen_capture.now
+            self.keyboard = ReplayKeyboard(clock)
+            # Start every replay from the default variant order and keep learned stats intact
+            # (the digit atlas is frozen once the OCR processor has loaded it, below). Variants
+            # run one at a time, so which of them finish first never depends on machine load
+            self.config.ocr_stats_file = None
+            self.config.ocr_execution = 'sequential'
+        else:
+            self.screen_capture = create_screen_capture(self.config, self.debug_logger)
+            if self.config.use_input_dispatcher:
+                # One prioritized thread sends every key - critical heals first
+                try:
+                    self.input_dispatcher = InputDispatcher(self.config, self.debug_logger, self.latency,
+                                                            on_failsafe=self._on_failsafe)
+                    self.keyboard = self.input_dispatcher
+                except ValueError as e:
+                    print(f"⚠️  Warning: {e} - sending keys directly instead")
+        
+        # Initialize frame recorder (saves every captured frame for replay)
+        self.frame_recorder = FrameRecorder(record_path, self.debug_logger) if record_path else None
+        
+        # Initialize flight recorder (last seconds of frames and decisions, kept after a crash)
+        self.flight_recorder = None
+        if self.config.use_flight_recorder and not replay_path:
+            try:
+                self.flight_recorder = FlightRecorder(self.config, self.debug_logger)
+            except Exception as e:
+                print(f"⚠️  Warning: Could not start flight recorder: {e}")
+        
         # Initialize OCR processor
-        self.ocr_processor = OCRProcessor(self.config, self.debug_logger)
+        self.ocr_processor = OCRProcessor(self.config, self.debug_logger, self.screen_capture, self.latency)
+        if replay_path:
+            # Replays read with the saved atlas and the default variant order and learn nothing,
+            # so every run of a recording sees the same OCR state and nothing is written
+            self.ocr_processor.freeze()
+        
+        # Initialize HP estimator (filters misreads before they reach the health monitor)
+        self.hp_estimator = HPEstimator(self.config, self.debug_logger, clock)
+        self.ocr_processor.register_estimator("hp", self.hp_estimator)
+        
+        # Initialize HP bar reader (OCR-free sensing mode)
+        self.hp_bar_reader = HPBarReader(self.config, self.debug_logger)
         
         # Initialize region manager
-        self.region_manager = RegionManager(self.config, self.debug_logger, self.ocr_processor)
+        self.region_manager = RegionManager(self.config, self.debug_logger, self.ocr_processor, self.hp_bar_reader)
         
         # Initialize health monitor
-        self.health_monitor = HealthMonitor(self.config, self.debug_logger)
+        self.health_monitor = HealthMonitor(self.config, self.debug_logger, self.latency, self.keyboard, clock)
         
         # Initialize skinner
-        self.skinner = Skinner(self.config, self.debug_logger)
+        self.skinner = Skinner(self.config, self.debug_logger, self.input_dispatcher)
         
         # Initialize auto-haste
-        self.auto_haste = AutoHaste(self.config, self.debug_logger)
+        self.auto_haste = AutoHaste(self.config, self.debug_logger, self.input_dispatcher)
         
         # Control flags
         self.running = True
@@ -43,6 +106,12 @@ class GameHelper:
         # Initialize hotkey manager (F9 only)
         self.hotkey_manager = HotkeyManager(self.config, self._on_toggle)
         
+        # Initialize sensing thread - capture, OCR and healing run off the Tk thread
+        self.sensing_loop = SensingLoop(self.config, self._monitoring_cycle, self.debug_logger, self.latency)
+        
+        # Adaptive sensing rate (fixed monitor_frequency when disabled)
+        self.rate_controller = RateController(self.config, self.debug_logger) if self.config.adaptive_sampling else None
+        
         # Initialize overlay (will be started later)
         self.overlay = None
         
@@ -55,7 +124,7 @@ class GameHelper:
         self.paused = not self.paused
         status = "ZATRZYMANY" if self.paused else "AKTYWNY"
         print(f"\n🎮 Bot {status} (F9)")
-        self.debug_logger.log(f"TOGGLE: Bot state changed to {'PAUSED' if self.paused else 'ACTIVE'}")
+        self.debug_logger.log("TOGGLE: Bot state changed to %s", 'PAUSED' if self.paused else 'ACTIVE', level='info')
     
     def _get_paused_state(self):
         """Get current paused state (for overlay)"""
@@ -86,13 +155,74 @@ class GameHelper:
         print(f"🛡️ SAFETY: Critical healing is ALWAYS checked first to prevent death!")
         print(f"🎯 Toggle hotkey: {self.config.toggle_key.upper()} to pause/resume bot")
     
-    def get_current_values(self):
-        """Get current HP value from OCR"""
+    def capture_frames(self):
+        """Capture every region the sensing mode needs - one grab per cycle"""
         regions = self.region_manager.get_regions()
-        hp_value = self.ocr_processor.extract_number_with_fallback(regions['hp'], "hp")
+        needed = {
+            'hp': self.config.uses_digits(),
+            'hp_bar': self.config.uses_bar()
+        }
+        wanted = {name: region for name, region in regions.items() if needed.get(name)}
+        
+        try:
+            return self.ocr_processor.capture_frames(wanted)
+        except Exception as e:
+            self.debug_logger.log("FRAME: Capture failed: %s", e, level='warn')
+            return {}
+    
+    def get_current_values(self, frames=None):
+        """Get current HP value from OCR and/or the HP bar"""
+        if frames is None:
+            frames = self.capture_frames()
+        regions = self.region_manager.get_regions()
+        
+        hp_value = None
+        if self.config.uses_digits():
+            frame = frames.get('hp')
+            if frame is not None:
+                # Replays run without the wall-clock budget, so the variants tried never depend on load
+                budget = None if self.replay_path else self.config.ocr_cycle_budget
+                hp_value, truncated = self.ocr_processor.extract_number_with_budget(
+                    regions['hp'], "hp", budget,
+                    self.health_monitor.consecutive_failures, frame
+                )
+                if self.debug_logger.is_enabled('trace'):
+                    budget_note = ", budget spent" if truncated else ""
+                    self.debug_logger.log("OCR_RESULTS: HP: %s (%s%s)", hp_value, frame.describe(), budget_note, level='trace')
+        
+        if self.config.uses_bar():
+            bar_value = self.read_hp_bar(frames.get('hp_bar'))
+            self.debug_logger.log("BAR_RESULTS: HP: %s", bar_value, level='trace')
+            
+            if self.config.uses_digits():
+                hp_value = self.cross_check_hp(hp_value, bar_value)
+            else:
+                hp_value = bar_value
+        
+        # Hold back implausible jumps until the next frame confirms them
+        captured_at = min((frame.timestamp for frame in frames.values()), default=None)
+        return self.hp_estimator.update(hp_value, captured_at)
+    
+    def read_hp_bar(self, frame):
+        """Read HP from the HP bar fill"""
+        if frame is None:
+            return None
+        return self.hp_bar_reader.read_hp(frame.pixels)
+    
+    def cross_check_hp(self, digit_value, bar_value):
+        """Combine the digit and bar readings into one HP value"""
+        if digit_value is None:
+            return bar_value
+        if bar_value is None:
+            return digit_value
         
-        self.debug_logger.log(f"OCR_RESULTS: HP: {hp_value}")
-        return hp_value
+        difference = abs(digit_value - bar_value) / self.config.max_hp
+        if difference <= self.config.bar_cross_check_tolerance:
+            return digit_value
+        
+        # Readings disagree - trust the lower one so a misread never skips a heal
+        self.debug_logger.log("CROSS_CHECK: Digits %s vs bar %s differ by %.1f%% - using lower", digit_value, bar_value, difference*100, level='info')
+        return min(digit_value, bar_value)
     
     def display_status(self, hp_value):
         """Display current status"""
@@ -106,14 +236,28 @@ class GameHelper:
         """Check HP value and respond with appropriate actions"""
         # Skip healing actions if paused
         if self.paused:
-            self.debug_logger.log(f"DECISION: Bot is PAUSED - skipping healing check")
+            self.debug_logger.log("DECISION: Bot is PAUSED - skipping healing check")
             return
         
-        self.debug_logger.log(f"DECISION: Checking thresholds - HP: {hp_value}")
+        self.debug_logger.log("DECISION: Checking thresholds - HP: %s", hp_value, level='trace')
         
         # Check HP and heal if needed
         self.health_monitor.check_hp_and_heal(hp_value)
     
+    def record_flight(self, frames, hp_value):
+        """Store the cycle in the flight recorder and dump it when a critical heal fires"""
+        if self.paused:
+            decision, key, key_time = 'paused', None, None
+        else:
+            monitor = self.health_monitor
+            decision, key, key_time = monitor.last_decision, monitor.last_key, monitor.last_key_time
+        
+        timestamp = min((frame.timestamp for frame in frames.values()), default=time.time())
+        self.flight_recorder.record(timestamp, frames, hp_value, decision, key, key_time)
+        
+        if self.config.flight_dump_on_critical and decision == 'critical' and key:
+            self.flight_recorder.dump_in_background()
+    
     def display_healing_summary(self):
         """Display healing usage summary"""
         summary = self.health_monitor.get_healing_summary()
@@ -124,26 +268,87 @@ class GameHelper:
         print(f"💊 Moderate heals used: {summary['moderate_heals']}")
         print(f"🚨 Critical heals used:  {summary['critical_heals']}")
         print(f"📊 Total heals used:     {summary['total_heals']}")
+        
+        cache = self.ocr_processor.get_cache_stats()
+        print(f"🧠 OCR skipped (frame unchanged): {cache['hits']}/{cache['hits'] + cache['misses']} ({cache['hit_rate']*100:.1f}%)")
+        
+        budget = self.ocr_processor.get_budget_stats()
+        print(f"⏱️ OCR budget: {budget['truncated']}/{budget['calls']} readings cut short, {budget['overruns']} overruns")
+        
+        capture = self.screen_capture.get_stats()
+        print(f"📷 Screen capture ({capture['backend']}): {capture['grabs']} grabs, mean {capture['mean_ms']:.2f}ms, max {capture['max_ms']:.2f}ms")
+        
+        estimator = self.hp_estimator.get_stats()
+        print(f"📉 HP misreads held back: {estimator['rejected']} (confirmed jumps: {estimator['confirmed_jumps']})")
+        
+        loop = self.sensing_loop.get_stats()
+        print(f"🔄 Sensing loop: {loop['cycles']} cycles, {loop['overruns']} overruns ({loop['skipped_ticks']} ticks skipped), "
+              f"start jitter mean {loop['mean_jitter_ms']:.2f}ms max {loop['max_jitter_ms']:.2f}ms")
+        
+        if self.input_dispatcher:
+            sent = self.input_dispatcher.get_stats()
+            actions = ", ".join(f"{action} {count}" for action, count in sent['sent'].items())
+            print(f"⌨️ Keys sent: {sent['total']} ({actions or 'none'}) - decision-to-send times in the latency summary")
+        
+        if self.rate_controller:
+            sampling = self.rate_controller.get_stats()
+            total = sampling['total_seconds'] or 1.0
+            shares = ", ".join(f"{rate:.1f} Hz {seconds:.0f}s ({seconds / total * 100:.0f}%)"
+                               for rate, seconds in sorted(sampling['time_at_rate'].items(), reverse=True))
+            print(f"📶 Sampling rate: {shares or 'no cycles'} - {sampling['changes']} changes")
+        print("="*50)
+    
+    def display_latency_summary(self):
+        """Display per-stage latency percentiles"""
+        lines = self.latency.format_summary()
+        if not lines:
+            return
+        
+        print("\n" + "="*50)
+        print("⏱️ LATENCY BY STAGE")
+        print("="*50)
+        for line in lines:
+            print(line)
         print("="*50)
     
+    def _on_failsafe(self):
+        """Stop monitoring after the pyautogui fail-safe (mouse in a screen corner)"""
+        print("\nFail-safe triggered! Mouse moved to corner.")
+        self.debug_logger.log_monitoring_stop("FAILSAFE")
+        self.running = False
+        if self.overlay:
+            self.overlay.stop()
+    
     def _monitoring_cycle(self):
-        """Single monitoring cycle - called by overlay's after() scheduler"""
+        """Single monitoring cycle - called by the sensing thread"""
         if not self.running:
             return
         
         try:
-            hp_value = self.get_current_values()
-            self.display_status(hp_value)
-            self.check_and_respond(hp_value)
+            with self.latency.time('cycle'):
+                with self.latency.time('capture'):
+                    frames = self.capture_frames()
+                if self.frame_recorder:
+                    with self.latency.time('record'):
+                        self.frame_recorder.record(frames)
+                with self.latency.time('sensing'):
+                    hp_value = self.get_current_values(frames)
+                self.display_status(hp_value)
+                with self.latency.time('decision'):
+                    self.check_and_respond(hp_value)
+                if self.flight_recorder:
+                    with self.latency.time('flight'):
+                        self.record_flight(frames, hp_value)
+                if self.rate_controller:
+                    healed = not self.paused and self.health_monitor.last_key is not None
+                    pending = self.hp_estimator.pending
+                    held_back = pending[1] if pending else None
+                    self.sensing_loop.set_period(self.rate_controller.update(hp_value, healed, self.paused, held_back))
         except pyautogui.FailSafeException:
-            print("\nFail-safe triggered! Mouse moved to corner.")
-            self.debug_logger.log_monitoring_stop("FAILSAFE")
-            self.running = False
-            if self.overlay:
-                self.overlay.stop()
+            self._on_failsafe()
         except Exception as e:
             print(f"\nError in monitoring: {e}")
-            self.debug_logger.log(f"ERROR: {str(e)}")
+            self.debug_logger.log("ERROR: %s", e, level='warn')
     
     def run_monitoring_loop(self):
         """Main monitoring loop with overlay"""
@@ -163,41 +368,119 @@ class GameHelper:
         regions = self.region_manager.get_regions()
         self.debug_logger.log_monitoring_start(regions)
         
-        # Start hotkey listener, skinner, and auto-haste
+        # Start input dispatcher, hotkey listener, skinner, and auto-haste
+        if self.input_dispatcher:
+            self.input_dispatcher.start()
         self.hotkey_manager.start()
         self.skinner.start()
         self.auto_haste.start()
         
         try:
+            # Sensing and healing run on their own thread from here on
+            self.sensing_loop.start()
+            
             if self.config.overlay_enabled:
-                # Create overlay and run with integrated monitoring
+                # Create overlay - Tk stays on the main thread
+                perf_hud = None
+                if self.config.overlay_perf_hud:
+                    perf_hud = PerfHUD(self.config, self.sensing_loop, self.latency, self.ocr_processor, self.health_monitor)
                 self.overlay = GameOverlay(
                     self.config, 
                     self.health_monitor, 
                     self._get_paused_state,
                     self.skinner,
-                    self.auto_haste
+                    self.auto_haste,
+                    perf_hud
                 )
                 # This blocks until overlay is closed
-                self.overlay.run_with_monitoring(self._monitoring_cycle)
+                self.overlay.run()
             else:
                 # Run without overlay (fallback mode)
                 while self.running:
-                    self._monitoring_cycle()
-                    time.sleep(self.config.monitor_frequency)
+                    time.sleep(0.2)
         except KeyboardInterrupt:
             print("\nStopped by user")
             self.debug_logger.log_monitoring_stop("USER")
         finally:
             self.running = False
+            self.sensing_loop.stop()
             self.hotkey_manager.stop()
             self.skinner.stop()
             self.auto_haste.stop()
+            if self.input_dispatcher:
+                self.input_dispatcher.stop()
+            self.ocr_processor.close()
+            self.close_recorder()
+            if self.flight_recorder:
+                self.flight_recorder.close()
         
         # Display healing summary before exit
         self.display_healing_summary()
+        self.display_latency_summary()
         print("Health monitor stopped.")
     
+    def close_recorder(self):
+        """Finish the frame recording, if any"""
+        if not self.frame_recorder:
+            return
+        self.frame_recorder.close()
+        stats = self.frame_recorder.get_stats()
+        print(f"🎞️ Recorded {stats['cycles']} cycles ({stats['repeats']}/{stats['frames']} frames unchanged, "
+              f"{stats['bytes'] / 1024:.1f} KB) to {stats['path']}")
+    
+    def use_recorded_regions(self, frames):
+        """Monitor the regions a recording was captured from"""
+        if 'hp' in frames and frames['hp'].region:
+            self.region_manager.hp_region = frames['hp'].region
+        if 'hp_bar' in frames and frames['hp_bar'].region:
+            self.region_manager.hp_bar_region = frames['hp_bar'].region
+    
+    def run_replay(self, realtime=True):
+        """Run the full pipeline against a frame recording
+        
+        Each recorded cycle goes through capture, OCR, the estimator and the
+        health monitor exactly as live, but frames come from the recording and
+        key presses go to the stand-in keyboard. OCR runs without its time
+        budget and learns nothing, so a recording always replays the same way.
+        With realtime, cycles are paced at their recorded intervals; otherwise
+        they run back to back.
+        Returns the recorded key presses as [(timestamp, key)].
+        """
+        print(f"=== Replay: {self.replay_path} ===")
+        print(f"⏩ Speed: {'recorded' if realtime else 'as fast as possible'}")
+        
+        cycles = 0
+        first_timestamp = None
+        start = time.perf_counter()
+        try:
+            for timestamp, frames in FrameReader(self.replay_path):
+                self.use_recorded_regions(frames)
+                
+                if first_timestamp is None:
+                    first_timestamp = timestamp
+                if realtime:
+                    delay = (timestamp - first_timestamp) - (time.perf_counter() - start)
+                    if delay > 0:
+                        time.sleep(delay)
+                
+                self.screen_capture.load(timestamp, frames)
+                self._monitoring_cycle()
+                cycles += 1
+        except KeyboardInterrupt:
+            print("\nReplay stopped by user")
+        finally:
+            self.ocr_processor.close()
+        
+        elapsed = time.perf_counter() - start
+        rate = cycles / elapsed if elapsed > 0 else 0.0
+        print(f"\n🎞️ Replayed {cycles} cycles in {elapsed:.2f}s ({rate:.1f} cycles/s)")
+        presses = ", ".join(f"{key.upper()} x{count}" for key, count in self.keyboard.get_summary().items())
+        print(f"⌨️ Key presses: {presses or 'none'}")
+        
+        self.display_healing_summary()
+        self.display_latency_summary()
+        return self.keyboard.presses
+    
     def run(self):
         """Main entry point - auto-starts using config.json values"""
         print("=== Health Monitor ===")
@@ -212,7 +495,7 @@ class GameHelper:
         
         # Show regions being used
         regions = self.region_manager.get_regions()
-        print(f"📍 Using saved region: HP{regions['hp']}")
+        print(f"📍 Sensing mode: {self.config.sensing_mode} - HP{regions['hp']} HP bar{regions['hp_bar']}")
         
         # Start monitoring immediately
         self.run_monitoring_loop()
@@ -220,8 +503,17 @@ class GameHelper:
 
 def main():
     """Main function"""
-    game_helper = GameHelper()
-    game_helper.run()
+    parser = argparse.ArgumentParser(description="Game Helper - HP monitoring and auto-healing")
+    parser.add_argument('--record', metavar='PATH', help="Save every captured frame to PATH for replay")
+    parser.add_argument('--replay', metavar='PATH', help="Replay a frame recording instead of the screen (no keys are sent)")
+    parser.add_argument('--fast', action='store_true', help="Replay as fast as possible instead of at recorded speed")
+    args = parser.parse_args()
+    
+    game_helper = GameHelper(record_path=args.record, replay_path=args.replay)
+    if args.replay:
+        game_helper.run_replay(realtime=not args.fast)
+    else:
+        game_helper.run()
 
 
 if __name__ == "__main__":
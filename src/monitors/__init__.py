@@ -3,8 +3,16 @@ Monitor Components
 
 This package contains the monitoring components:
 - HealthMonitor: HP monitoring and healing logic
+- SensingLoop: Dedicated thread running the monitoring cycle
+- ReplayKeyboard: Stand-in keyboard for replayed sessions
+- Observable: State change events for the overlay
+- RateController: Adaptive sensing rate from the HP trend
 """
 
 from .health_monitor import HealthMonitor
+from .sensing_loop import SensingLoop
+from .replay_keyboard import ReplayKeyboard
+from .observable import Observable
+from .rate_controller import RateController
 
-__all__ = ['HealthMonitor'] 
\ No newline at end of file
+__all__ = ['HealthMonitor', 'SensingLoop', 'ReplayKeyboard', 'Observable', 'RateController'] 
\ No newline at end of file
@@ -10,15 +10,24 @@ import time
 import threading
 from pynput import keyboard
 
+from .observable import Observable
 
-class AutoHaste:
-    """Automatically casts haste spell at regular intervals"""
+
+class AutoHaste(Observable):
+    """Automatically casts haste spell at regular intervals
+    
+    Publishes 'enabled' and 'cast_count' events.
+    """
     
-    def __init__(self, config, debug_logger=None):
+    def __init__(self, config, debug_logger=None, dispatcher=None):
+        Observable.__init__(self)
         self.config = config
         self.debug_logger = debug_logger
         self.keyboard_controller = keyboard.Controller()
         
+        # Presses go through the input dispatcher when given, else straight to the controller
+        self.dispatcher = dispatcher
+        
         self.enabled = False
         self._running = False
         self._thread = None
@@ -27,17 +36,21 @@ class AutoHaste:
         self.cast_count = 0
         self.last_cast_time = 0
     
-    def debug_log(self, message):
-        """Write debug message through the logger"""
+    def debug_log(self, message, *args, level=None):
+        """Write debug message through the logger (%-style args, default level unless given)"""
         if self.debug_logger:
-            self.debug_logger.log(message)
+            if level:
+                self.debug_logger.log(message, *args, level=level)
+            else:
+                self.debug_logger.log(message, *args)
     
     def toggle(self):
         """Toggle auto-haste on/off"""
         self.enabled = not self.enabled
+        self.publish('enabled', self.enabled)
         status = "WŁĄCZONY" if self.enabled else "WYŁĄCZONY"
         print(f"\n⚡ Auto-Haste {status}")
-        self.debug_log(f"AUTO_HASTE: Toggled to {'ENABLED' if self.enabled else 'DISABLED'}")
+        self.debug_log("AUTO_HASTE: Toggled to %s", 'ENABLED' if self.enabled else 'DISABLED', level='info')
         
         if self.enabled:
             # Cast immediately when enabled
@@ -50,7 +63,9 @@ class AutoHaste:
         key = self.config.haste_hotkey.lower()
         
         # Press the key
-        if len(key) == 1:
+        if self.dispatcher:
+            self.dispatcher.press(key)
+        elif len(key) == 1:
             self.keyboard_controller.press(key)
             self.keyboard_controller.release(key)
         else:
@@ -60,7 +75,8 @@ class AutoHaste:
         
         self.cast_count += 1
         self.last_cast_time = time.time()
-        self.debug_log(f"AUTO_HASTE: Cast haste ({self.config.haste_hotkey.upper()})")
+        self.publish('cast_count', self.cast_count)
+        self.debug_log("AUTO_HASTE: Cast haste (%s)", self.config.haste_hotkey.upper())
         print(f"⚡ Auto-Haste: {self.config.haste_hotkey.upper()} pressed")
     
     def _haste_loop(self):
@@ -99,7 +115,9 @@ class AutoHaste:
     def stop(self):
         """Stop the auto-haste thread"""
         self._running = False
-        self.enabled = False
+        if self.enabled:
+            self.enabled = False
+            self.publish('enabled', False)
         if self._thread:
             self._thread.join(timeout=1)
             self._thread = None
@@ -1,18 +1,39 @@
+import threading
 import time
 import pyautogui
 
+from .observable import Observable
 
-class HealthMonitor:
-    def __init__(self, config, debug_logger=None):
+# Republish the snapshot with the HP value it already has (toggles on the Tk thread)
+_KEEP_HP = object()
+
+
+class HealthMonitor(Observable):
+    # Snapshot fields published as events when they change (hp_value and
+    # timestamp change every cycle and are read from the snapshot instead)
+    EVENT_FIELDS = ('heal_enabled', 'critical_enabled', 'moderate_heals', 'critical_heals', 'error_status')
+    
+    def __init__(self, config, debug_logger=None, latency=None, keyboard=None, clock=None):
+        Observable.__init__(self)
         self.config = config
         self.debug_logger = debug_logger
         
+        # Optional per-stage latency recorder (times the key press)
+        self.latency = latency
+        
+        # Key presses go to pyautogui unless a keyboard is given (input dispatcher, or replay stand-in)
+        self.keyboard = keyboard
+        
+        # Cooldowns follow the recorded capture time during replay
+        self.clock = clock
+        
         # Timing tracking - GLOBAL cooldown for ALL heals
         # This prevents race conditions where moderate heal blocks critical heal
         self.last_heal_press = 0  # Single timer for ANY heal type
         
         # Failure tracking
         self.consecutive_failures = 0
+        self.last_valid_time = None  # When the last valid HP reading was checked
         
         # Healing usage counters
         self.moderate_heal_count = 0
@@ -21,10 +42,22 @@ class HealthMonitor:
         # Enable/disable flags for healing
         self.heal_enabled = True
         self.critical_enabled = True
+        
+        # Outcome of the last check_hp_and_heal call (for the flight recorder)
+        self.last_decision = 'none'
+        self.last_key = None
+        self.last_key_time = None
+        
+        # Immutable state published for the overlay (read from the Tk thread)
+        self.snapshot = None
+        # Serializes publishing between the sensing thread and toggles from the Tk thread
+        self._snapshot_lock = threading.Lock()
+        self._publish_snapshot(None)
     
     def toggle_heal(self):
         """Toggle normal heal on/off"""
         self.heal_enabled = not self.heal_enabled
+        self._publish_snapshot(_KEEP_HP)
         status = "WŁĄCZONY" if self.heal_enabled else "WYŁĄCZONY"
         print(f"💊 Heal {status}")
         return self.heal_enabled
@@ -32,62 +65,83 @@ class HealthMonitor:
     def toggle_critical(self):
         """Toggle critical heal on/off"""
         self.critical_enabled = not self.critical_enabled
+        self._publish_snapshot(_KEEP_HP)
         status = "WŁĄCZONY" if self.critical_enabled else "WYŁĄCZONY"
         print(f"🚨 Critical {status}")
         return self.critical_enabled
         
-    def debug_log(self, message):
-        """Write debug message through the logger"""
+    def debug_log(self, message, *args, level=None):
+        """Write debug message through the logger (%-style args, default level unless given)"""
         if self.debug_logger:
-            self.debug_logger.log(message)
+            if level:
+                self.debug_logger.log(message, *args, level=level)
+            else:
+                self.debug_logger.log(message, *args)
     
     def press_key_with_cooldown(self, key, last_press_time, action_type="ACTION", cooldown=None):
         """Press a key with cooldown protection"""
-        current_time = time.time()
+        current_time = self.clock() if self.clock else time.time()
         time_since_last = current_time - last_press_time
         
         # Use provided cooldown or default to regular cooldown
         effective_cooldown = cooldown if cooldown is not None else self.config.cooldown
         
         if time_since_last >= effective_cooldown:
-            pyautogui.press(key)
-            self.debug_log(f"KEY_PRESS: {key.upper()} pressed for {action_type} (cooldown: {time_since_last:.3f}s, required: {effective_cooldown:.3f}s)")
+            if self.keyboard:
+                # The keyboard times the actual send ('press' stage) itself
+                self.keyboard.press(key)
+            else:
+                press_start = time.perf_counter()
+                pyautogui.press(key)
+                if self.latency:
+                    self.latency.record('press', time.perf_counter() - press_start)
+            self.last_key = key
+            self.last_key_time = current_time
+            self.debug_log("KEY_PRESS: %s pressed for %s (cooldown: %.3fs, required: %.3fs)", key.upper(), action_type, time_since_last, effective_cooldown, level='info')
             print(f"\n🚨 {action_type}: {key.upper()} pressed at {time.strftime('%H:%M:%S')}", flush=True)
             return current_time
         else:
-            self.debug_log(f"KEY_BLOCKED: {key.upper()} blocked for {action_type} (cooldown remaining: {effective_cooldown - time_since_last:.3f}s)")
+            self.debug_log("KEY_BLOCKED: %s blocked for %s (cooldown remaining: %.3fs)", key.upper(), action_type, effective_cooldown - time_since_last)
             return last_press_time
     
     def check_hp_and_heal(self, hp_value):
         """Check HP value and perform healing if needed - CRITICAL HEALING IS IMMEDIATE!"""
+        self.last_key = None
+        self.last_key_time = None
+        
         if hp_value is None or hp_value <= 0:
-            self.debug_log(f"DECISION: HP value invalid or zero - no HP action")
+            self.last_decision = 'invalid'
+            self.debug_log("DECISION: HP value invalid or zero - no HP action")
             self.consecutive_failures += 1
             if self.consecutive_failures == self.config.max_failures_warning:
                 print(f"⚠️  Warning: HP reading has failed {self.consecutive_failures} times in a row")
+            self._publish_snapshot(None)
             return None
         
         # Handle invalid max HP configuration gracefully
         if self.config.max_hp <= 0:
-            self.debug_log(f"ERROR: Invalid max HP configuration: {self.config.max_hp}")
+            self.debug_log("ERROR: Invalid max HP configuration: %s", self.config.max_hp, level='warn')
             print(f"❌ Error: Invalid max HP configuration: {self.config.max_hp}")
             return None
         
         # Reset failure counter on successful reading
         self.consecutive_failures = 0
+        self.last_valid_time = self.clock() if self.clock else time.time()
         
         hp_percentage = hp_value / self.config.max_hp
         
-        self.debug_log(f"DECISION: HP {hp_value} = {hp_percentage*100:.1f}% (Critical<{self.config.hp_critical_threshold*100}%, Moderate<{self.config.hp_threshold*100}%)")
+        self.debug_log("DECISION: HP %s = %.1f%% (Critical<%s%%, Moderate<%s%%)", hp_value, hp_percentage*100, self.config.hp_critical_threshold*100, self.config.hp_threshold*100)
         
         # ==========================================
         # STEP 1: CRITICAL HEALING - FIRST PRIORITY!
         # ==========================================
         if hp_percentage < self.config.hp_critical_threshold:
             if not self.critical_enabled:
-                self.debug_log(f"CRITICAL HEAL DISABLED - skipping")
+                self.last_decision = 'critical_disabled'
+                self.debug_log("CRITICAL HEAL DISABLED - skipping")
             else:
-                self.debug_log(f"🚨 CRITICAL ALERT: HP {hp_percentage*100:.1f}% < {self.config.hp_critical_threshold*100}% - CRITICAL HEALING!")
+                self.last_decision = 'critical'
+                self.debug_log("🚨 CRITICAL ALERT: HP %.1f%% < %s%% - CRITICAL HEALING!", hp_percentage*100, self.config.hp_critical_threshold*100, level='info')
                 old_time = self.last_heal_press
                 # Use GLOBAL cooldown timer - prevents race condition with moderate heal
                 self.last_heal_press = self.press_key_with_cooldown(
@@ -105,9 +159,11 @@ class HealthMonitor:
         # ==========================================
         elif hp_percentage < self.config.hp_threshold:
             if not self.heal_enabled:
-                self.debug_log(f"MODERATE HEAL DISABLED - skipping")
+                self.last_decision = 'moderate_disabled'
+                self.debug_log("MODERATE HEAL DISABLED - skipping")
             else:
-                self.debug_log(f"DECISION: HP {hp_percentage*100:.1f}% needs moderate healing")
+                self.last_decision = 'moderate'
+                self.debug_log("DECISION: HP %.1f%% needs moderate healing", hp_percentage*100)
                 old_time = self.last_heal_press
                 # Use SAME global cooldown timer - shares cooldown with critical heal
                 self.last_heal_press = self.press_key_with_cooldown(
@@ -124,10 +180,44 @@ class HealthMonitor:
         # STEP 3: HEALTHY - NO HEALING NEEDED
         # ==========================================
         else:
-            self.debug_log(f"DECISION: HP {hp_percentage*100:.1f}% is healthy - no healing needed")
+            self.last_decision = 'healthy'
+            self.debug_log("DECISION: HP %.1f%% is healthy - no healing needed", hp_percentage*100)
         
+        self._publish_snapshot(hp_value)
         return hp_percentage
     
+    def _publish_snapshot(self, hp_value):
+        """Replace the published snapshot - a single reference swap, safe to read from any thread
+        
+        Fields in EVENT_FIELDS that differ from the previous snapshot are also
+        published as events. Publishers (the sensing thread and toggles from
+        the Tk thread) take a lock, so no change is lost or reported twice and
+        events arrive in snapshot order.
+        """
+        with self._snapshot_lock:
+            previous = self.snapshot
+            if hp_value is _KEEP_HP:
+                hp_value = previous['hp_value']
+            snapshot = {
+                'hp_value': hp_value,
+                'timestamp': time.time(),
+                'heal_enabled': self.heal_enabled,
+                'critical_enabled': self.critical_enabled,
+                'moderate_heals': self.moderate_heal_count,
+                'critical_heals': self.critical_heal_count,
+                'error_status': self.get_error_status(),
+                'last_valid_time': self.last_valid_time
+            }
+            self.snapshot = snapshot
+            if previous is not None:
+                for field in self.EVENT_FIELDS:
+                    if snapshot[field] != previous[field]:
+                        self.publish(field, snapshot[field])
+    
+    def get_snapshot(self):
+        """Get the latest published state (for the overlay thread)"""
+        return self.snapshot
+    
     def get_hp_status(self, hp_value):
         """Get HP status information"""
         if hp_value is not None and hp_value > 0:
@@ -0,0 +1,215 @@
+"""
+Input Dispatcher - Single prioritized thread for every key press
+
+Heals, haste casts and skinner presses are queued here instead of being
+sent from the sensing thread, the haste thread and the mouse listener
+through separate controllers. One worker thread sends them in priority
+order, so a queued critical heal always goes out before a waiting haste or
+skinner press.
+
+pyautogui's fail-safe and PAUSE still apply: the mouse-in-corner check runs
+before every key and the configured pause follows it. A triggered fail-safe
+drops every queued press, stops the dispatcher and calls on_failsafe.
+
+The configured keys are resolved to pynput key objects once, when the
+dispatcher is created. Names pynput has no key for raise ValueError there
+instead of falling back to another key. Every press records the time from the decision
+(the moment it was queued) to the key being sent, per action, and the
+press and release themselves as the 'press' stage.
+"""
+
+import itertools
+import queue
+import threading
+import time
+
+import pyautogui
+from pynput import keyboard
+
+
+
+# Lower sends first
+PRIORITY_CRITICAL = 0
+PRIORITY_HEAL = 1
+PRIORITY_HASTE = 2
+PRIORITY_SKINNER = 3
+PRIORITY_OTHER = 4
+
+_STOP = None
+
+# pyautogui key names -> pynput Key attribute names (names that differ or have aliases)
+KEY_ALIASES = {
+    'pageup': 'page_up', 'pgup': 'page_up',
+    'pagedown': 'page_down', 'pgdn': 'page_down',
+    'del': 'delete', 'return': 'enter', 'escape': 'esc',
+    'win': 'cmd', 'winleft': 'cmd', 'winright': 'cmd_r', 'command': 'cmd',
+    'capslock': 'caps_lock', 'numlock': 'num_lock', 'scrolllock': 'scroll_lock',
+    'prtsc': 'print_screen', 'prtscr': 'print_screen', 'printscreen': 'print_screen',
+    'shiftleft': 'shift', 'shiftright': 'shift_r',
+    'ctrlleft': 'ctrl', 'ctrlright': 'ctrl_r',
+    'altleft': 'alt', 'altright': 'alt_r', 'option': 'alt',
+}
+
+# pynput Key attribute names a key string may name directly
+NAMED_KEYS = {
+    'space', 'enter', 'tab', 'esc', 'backspace', 'delete', 'insert', 'home', 'end',
+    'page_up', 'page_down', 'up', 'down', 'left', 'right', 'pause', 'menu',
+    'shift', 'shift_r', 'ctrl', 'ctrl_r', 'alt', 'alt_r', 'cmd', 'cmd_r',
+    'caps_lock', 'num_lock', 'scroll_lock', 'print_screen',
+}
+
+
+def resolve_key(key_string):
+    """Convert a pyautogui key name to a pynput key
+
+    Raises ValueError for names with no pynput key (e.g. numpad keys), so a
+    misconfigured key is caught up front instead of pressing a different one.
+    """
+    name = key_string.lower()
+    if len(name) == 1:
+        return name
+
+    name = KEY_ALIASES.get(name, name)
+    if name in NAMED_KEYS or (name[:1] == 'f' and name[1:].isdigit() and 1 <= int(name[1:]) <= 24):
+        key = getattr(keyboard.Key, name, None)
+        if key is not None:
+            return key
+
+    raise ValueError(f"Key '{key_string}' cannot be sent through the input dispatcher")
+
+
+class InputDispatcher:
+    """Sends queued key presses from one worker thread, most urgent first"""
+
+    def __init__(self, config, debug_logger=None, latency=None, controller=None, on_failsafe=None):
+        self.config = config
+        self.debug_logger = debug_logger
+
+        # Optional per-stage latency recorder (decision-to-send time as 'key_<action>', send time as 'press')
+        self.latency = latency
+
+        # Called from the dispatcher thread when the pyautogui fail-safe triggers
+        self.on_failsafe = on_failsafe
+
+        self.controller = controller or keyboard.Controller()
+
+        # key string -> (action, priority), most urgent action first if keys are shared
+        self.actions = {}
+        for key, action, priority in [
+            (config.critical_heal_key, 'critical', PRIORITY_CRITICAL),
+            (config.heal_key, 'heal', PRIORITY_HEAL),
+            (config.haste_hotkey, 'haste', PRIORITY_HASTE),
+            (config.skinner_hotkey, 'skinner', PRIORITY_SKINNER),
+        ]:
+            self.actions.setdefault(key.lower(), (action, priority))
+
+        # key string -> pynput key, resolved once (ValueError for unknown names)
+        self.keys = {key: resolve_key(key) for key in self.actions}
+
+        # (priority, sequence, key string, queued at) - sequence keeps FIFO order within a priority
+        self.queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._thread = None
+        self._running = False
+
+        # Statistics
+        self.sent = {}  # action -> count
+
+    def debug_log(self, message, *args, level=None):
+        """Write debug message through the logger (%-style args, default level unless given)"""
+        if self.debug_logger:
+            if level:
+                self.debug_logger.log(message, *args, level=level)
+            else:
+                self.debug_logger.log(message, *args)
+
+    def press(self, key):
+        """Queue a key press (the decision time is now)"""
+        key = key.lower()
+        _, priority = self.actions.get(key, ('other', PRIORITY_OTHER))
+        self.queue.put((priority, next(self._sequence), key, time.perf_counter()))
+
+    def _send(self, key, queued_at):
+        """Press and release one key and record its decision-to-send time"""
+        resolved = self.keys.get(key)
+        if resolved is None:
+            resolved = self.keys[key] = resolve_key(key)
+
+        # Raises pyautogui.FailSafeException while the mouse is in a screen corner
+        pyautogui.failSafeCheck()
+
+        press_start = time.perf_counter()
+        self.controller.press(resolved)
+        self.controller.release(resolved)
+        sent_at = time.perf_counter()
+
+        action, _ = self.actions.get(key, ('other', PRIORITY_OTHER))
+        waited = sent_at - queued_at
+        self.sent[action] = self.sent.get(action, 0) + 1
+        if self.latency:
+            self.latency.record('press', sent_at - press_start)
+            self.latency.record(f'key_{action}', waited)
+        self.debug_log("INPUT: %s sent for %s %.2fms after the decision", key.upper(), action, waited * 1000, level='trace')
+
+        if self.config.gui_pause:
+            time.sleep(self.config.gui_pause)
+
+    def _failsafe(self):
+        """Drop every queued press and stop sending"""
+        self._running = False
+        dropped = 0
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                break
+            dropped += 1
+        self.debug_log("INPUT: Fail-safe triggered - stopped, %s queued presses dropped", dropped, level='warn')
+        if self.on_failsafe:
+            self.on_failsafe()
+
+    def _run(self):
+        """Worker loop - send queued presses until stopped"""
+        while True:
+            _, _, key, queued_at = self.queue.get()
+            if key is _STOP:
+                return
+            try:
+                self._send(key, queued_at)
+            except pyautogui.FailSafeException:
+                self._failsafe()
+                return
+            except Exception as e:
+                self.debug_log("INPUT: Sending %s failed: %s", key.upper(), e, level='warn')
+
+    def start(self):
+        """Start the dispatcher thread"""
+        if self._running:
+            return
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='input', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the dispatcher thread (presses still queued are dropped)"""
+        if not self._running:
+            return
+
+        self._running = False
+        self.queue.put((-1, next(self._sequence), _STOP, 0.0))
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1)
+        self._thread = None
+
+    def is_running(self):
+        """Check if the dispatcher thread is running"""
+        return self._running
+
+    def get_stats(self):
+        """Get the number of keys sent per action"""
+        return {
+            'sent': dict(self.sent),
+            'total': sum(self.sent.values()),
+            'queued': self.queue.qsize()
+        }
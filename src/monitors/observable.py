@@ -0,0 +1,29 @@
+"""
+Observable - State change events for the overlay
+
+Monitors publish (event, value) when a piece of their displayed state
+changes, so the overlay redraws only what changed instead of polling every
+monitor. Callbacks run on the publisher's thread and must only hand the
+event off (the overlay queues it for the Tk thread).
+"""
+
+
+class Observable:
+    """Mixin publishing state change events to subscribed callbacks"""
+
+    def __init__(self):
+        self._subscribers = []
+
+    def subscribe(self, callback):
+        """Call callback(event, value) on every published change"""
+        self._subscribers = self._subscribers + [callback]
+
+    def unsubscribe(self, callback):
+        """Stop calling a subscribed callback"""
+        self._subscribers = [subscriber for subscriber in self._subscribers if subscriber is not callback]
+
+    def publish(self, event, value):
+        """Notify subscribers of a changed value"""
+        # The list is replaced, never mutated, so iterating it needs no lock
+        for callback in self._subscribers:
+            callback(event, value)
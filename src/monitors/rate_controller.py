@@ -0,0 +1,112 @@
+"""
+Rate Controller - Adaptive sensing rate from the HP trend and bot state
+
+Sampling at the maximum rate while HP sits full for minutes wastes CPU on
+capture and OCR. The controller drops to the minimum rate once HP has been
+stable and clear of the heal threshold for a while, and returns to the
+maximum rate on the very next cycle when:
+
+- the reading fails
+- HP drops, including a sharp drop the HP estimator is still holding back
+  for confirmation (the value it returns meanwhile looks unchanged)
+- HP is within a margin of the heal threshold
+- a heal key was pressed
+
+While the bot is paused nothing is healed, so it samples at the minimum
+rate. Time spent at each rate is accumulated for the session summary.
+"""
+
+import time
+
+
+class RateController:
+    """Picks the sensing period for the next cycle"""
+
+    # HP falling by more than this fraction of max HP counts as a drop (OCR noise stays below it)
+    DROP_TOLERANCE = 0.01
+
+    def __init__(self, config, debug_logger=None, clock=None):
+        self.config = config
+        self.debug_logger = debug_logger
+        self.clock = clock or time.monotonic
+
+        self.min_rate = config.sampling_min_rate
+        self.max_rate = config.sampling_max_rate
+        self.rate = self.max_rate
+
+        self.last_hp = None
+        self.calm_since = None  # When the current run of calm readings started
+
+        # Statistics
+        self.time_at_rate = {}  # rate (Hz) -> seconds
+        self.rate_changes = 0
+        self._last_update = None
+
+    def debug_log(self, message, *args, level=None):
+        """Write debug message through the logger (%-style args, default level unless given)"""
+        if self.debug_logger:
+            if level:
+                self.debug_logger.log(message, *args, level=level)
+            else:
+                self.debug_logger.log(message, *args)
+
+    def _urgency(self, hp_value, healed, held_back):
+        """Get why this reading needs the maximum rate, or None if it is calm"""
+        if hp_value is None or hp_value <= 0:
+            return "no reading"
+
+        previous = self.last_hp
+        self.last_hp = hp_value
+
+        if healed:
+            return "heal pressed"
+        if held_back is not None and held_back < hp_value:
+            return "HP drop held back"
+        if previous is not None and previous - hp_value > self.DROP_TOLERANCE * self.config.max_hp:
+            return "HP dropping"
+        if hp_value / self.config.max_hp < self.config.hp_threshold + self.config.sampling_threshold_margin:
+            return "HP near heal threshold"
+        return None
+
+    def update(self, hp_value, healed=False, paused=False, held_back=None):
+        """Account the last period to the current rate and get the period (seconds) for the next one
+
+        held_back is a raw reading the HP estimator rejected and has not confirmed yet, if any.
+        """
+        now = self.clock()
+        if self._last_update is not None:
+            self.time_at_rate[self.rate] = self.time_at_rate.get(self.rate, 0.0) + now - self._last_update
+        self._last_update = now
+
+        if paused:
+            rate, reason = self.min_rate, "paused"
+            self.calm_since = None
+        else:
+            reason = self._urgency(hp_value, healed, held_back)
+            if reason:
+                rate = self.max_rate
+                self.calm_since = None
+            else:
+                if self.calm_since is None:
+                    self.calm_since = now
+                if now - self.calm_since >= self.config.sampling_stable_seconds:
+                    rate, reason = self.min_rate, "HP stable"
+                else:
+                    rate = self.max_rate
+
+        if rate != self.rate:
+            self.debug_log("RATE: %.1f Hz -> %.1f Hz (%s)", self.rate, rate, reason, level='info')
+            self.rate = rate
+            self.rate_changes += 1
+
+        return 1.0 / self.rate
+
+    def get_stats(self):
+        """Get the current rate and the seconds spent at each rate"""
+        total = sum(self.time_at_rate.values())
+        return {
+            'rate': self.rate,
+            'changes': self.rate_changes,
+            'time_at_rate': dict(self.time_at_rate),
+            'total_seconds': total
+        }
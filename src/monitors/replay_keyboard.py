@@ -0,0 +1,28 @@
+"""
+Replay Keyboard - Stand-in keyboard for replaying recorded sessions
+
+Takes the place of pyautogui during replay: key presses are recorded with
+the replay clock instead of reaching the game, so the healing decisions of a
+replayed session can be inspected and compared between runs.
+"""
+
+import time
+
+
+class ReplayKeyboard:
+    """Records key presses instead of sending them"""
+
+    def __init__(self, clock=None):
+        self.clock = clock or time.time
+        self.presses = []
+
+    def press(self, key):
+        """Record a key press at the current (replay) time"""
+        self.presses.append((self.clock(), key))
+
+    def get_summary(self):
+        """Get the number of presses per key"""
+        summary = {}
+        for _, key in self.presses:
+            summary[key] = summary.get(key, 0) + 1
+        return summary
@@ -0,0 +1,131 @@
+"""
+Sensing Loop - Dedicated thread for capture, OCR and healing decisions
+
+Runs the monitoring cycle on its own thread so a slow OCR frame never
+freezes the overlay and overlay redraws or drags never delay an HP check.
+Tk stays on the main thread (required on macOS); the overlay only reads the
+snapshot HealthMonitor publishes after every decision.
+
+Cycles start on a fixed grid of absolute deadlines on the monotonic clock,
+one period apart, so the cycle's own work time does not stretch the period.
+A cycle that runs past its next deadline skips the missed ticks - the loop
+resumes on the next grid tick instead of running the backlog back to back.
+set_period() changes the spacing from the next deadline on (adaptive rate).
+"""
+
+import threading
+import time
+
+
+class SensingLoop:
+    """Calls the monitoring cycle every monitor_frequency seconds on a worker thread"""
+
+    def __init__(self, config, cycle_callback, debug_logger=None, latency=None, clock=None):
+        self.config = config
+        self.cycle_callback = cycle_callback
+        self.debug_logger = debug_logger
+
+        # Optional per-stage latency recorder (records start jitter as 'jitter')
+        self.latency = latency
+
+        # Monotonic clock the deadlines are set on (injectable for tests)
+        self.clock = clock or time.monotonic
+
+        # Seconds between cycle starts
+        self.period = config.monitor_frequency
+
+        self._running = False
+        self._thread = None
+        self._wake = threading.Event()
+
+        # Statistics
+        self.cycle_count = 0
+        self.overruns = 0
+        self.skipped_ticks = 0
+        self.jitter_total = 0.0
+        self.jitter_max = 0.0
+
+    def debug_log(self, message, *args, level=None):
+        """Write debug message through the logger (%-style args, default level unless given)"""
+        if self.debug_logger:
+            if level:
+                self.debug_logger.log(message, *args, level=level)
+            else:
+                self.debug_logger.log(message, *args)
+
+    def _loop(self):
+        """Background loop - one cycle per tick of the deadline grid"""
+        deadline = self.clock()
+        while self._running:
+            self._record_jitter(self.clock() - deadline)
+            try:
+                self.cycle_callback()
+            except Exception as e:
+                self.debug_log("SENSING: Cycle raised %s: %s", type(e).__name__, e, level='warn')
+            self.cycle_count += 1
+
+            deadline = self._next_deadline(deadline, self.clock())
+
+            # Event wait instead of sleep so stop() wakes the thread at once
+            self._wake.wait(max(0.0, deadline - self.clock()))
+
+    def _next_deadline(self, deadline, now):
+        """Advance to the next grid tick after now, counting an overrun if ticks were missed"""
+        deadline += self.period
+        if now > deadline and self.period > 0:
+            missed = int((now - deadline) // self.period) + 1
+            deadline += missed * self.period
+            self.overruns += 1
+            self.skipped_ticks += missed
+        return deadline
+
+    def _record_jitter(self, jitter):
+        """Record how late a cycle started relative to its deadline"""
+        jitter = max(0.0, jitter)
+        self.jitter_total += jitter
+        if jitter > self.jitter_max:
+            self.jitter_max = jitter
+        if self.latency:
+            self.latency.record('jitter', jitter)
+
+    def start(self):
+        """Start the sensing thread"""
+        if self._running:
+            return
+
+        self._running = True
+        self._wake.clear()
+        self._thread = threading.Thread(target=self._loop, name='sensing', daemon=True)
+        self._thread.start()
+        self.debug_log("SENSING: Thread started")
+
+    def stop(self):
+        """Stop the sensing thread and wait for the current cycle to finish"""
+        self._running = False
+        self._wake.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        self._thread = None
+        stats = self.get_stats()
+        self.debug_log("SENSING: Thread stopped after %s cycles (%s overruns, %s ticks skipped, "
+                       "jitter mean %.2fms max %.2fms)", self.cycle_count, stats['overruns'],
+                       stats['skipped_ticks'], stats['mean_jitter_ms'], stats['max_jitter_ms'], level='info')
+
+    def set_period(self, period):
+        """Space cycle starts period seconds apart from the next deadline on"""
+        self.period = period
+
+    def is_running(self):
+        """Check if the sensing thread is running"""
+        return self._running
+
+    def get_stats(self):
+        """Get scheduling statistics"""
+        return {
+            'cycles': self.cycle_count,
+            'period_ms': self.period * 1000,
+            'overruns': self.overruns,
+            'skipped_ticks': self.skipped_ticks,
+            'mean_jitter_ms': self.jitter_total / self.cycle_count * 1000 if self.cycle_count else 0.0,
+            'max_jitter_ms': self.jitter_max * 1000
+        }
@@ -9,6 +9,8 @@ import random
 import time
 from pynput import mouse, keyboard
 
+from .observable import Observable
+
 
 def get_key_from_string(key_string: str):
     """Convert string to pynput key object."""
@@ -45,14 +47,24 @@ def get_key_from_string(key_string: str):
     return keyboard.Key.f3  # Default to F3
 
 
-class Skinner:
-    """Right-click to hotkey - 'skins' monsters automatically"""
+class Skinner(Observable):
+    """Right-click to hotkey - 'skins' monsters automatically
+    
+    Publishes 'enabled' and 'click_count' events.
+    """
     
-    def __init__(self, config, debug_logger=None):
+    def __init__(self, config, debug_logger=None, dispatcher=None):
+        Observable.__init__(self)
         self.config = config
         self.debug_logger = debug_logger
         self.keyboard_controller = keyboard.Controller()
         
+        # Presses go through the input dispatcher when given, else straight to the controller
+        self.dispatcher = dispatcher
+        
+        # Resolved once - the hotkey does not change while running
+        self.target_key = get_key_from_string(config.skinner_hotkey)
+        
         self.enabled = False  # Starts disabled
         self._running = False
         self.listener = None
@@ -60,17 +72,21 @@ class Skinner:
         # Statistics
         self.click_count = 0
     
-    def debug_log(self, message):
-        """Write debug message through the logger"""
+    def debug_log(self, message, *args, level=None):
+        """Write debug message through the logger (%-style args, default level unless given)"""
         if self.debug_logger:
-            self.debug_logger.log(message)
+            if level:
+                self.debug_logger.log(message, *args, level=level)
+            else:
+                self.debug_logger.log(message, *args)
     
     def toggle(self):
         """Toggle skinner on/off"""
         self.enabled = not self.enabled
+        self.publish('enabled', self.enabled)
         status = "WŁĄCZONY" if self.enabled else "WYŁĄCZONY"
         print(f"\n🔪 Skinner {status}")
-        self.debug_log(f"SKINNER: Toggled to {'ENABLED' if self.enabled else 'DISABLED'}")
+        self.debug_log("SKINNER: Toggled to %s", 'ENABLED' if self.enabled else 'DISABLED', level='info')
         return self.enabled
     
     def _on_click(self, x, y, button, pressed):
@@ -84,15 +100,16 @@ class Skinner:
             )
             time.sleep(delay)
             
-            # Get target key
-            target_key = get_key_from_string(self.config.skinner_hotkey)
-            
             # Press the key
-            self.keyboard_controller.press(target_key)
-            self.keyboard_controller.release(target_key)
+            if self.dispatcher:
+                self.dispatcher.press(self.config.skinner_hotkey)
+            else:
+                self.keyboard_controller.press(self.target_key)
+                self.keyboard_controller.release(self.target_key)
             
             self.click_count += 1
-            self.debug_log(f"SKINNER: Right-click → {self.config.skinner_hotkey.upper()} (delay: {delay:.3f}s)")
+            self.publish('click_count', self.click_count)
+            self.debug_log("SKINNER: Right-click → %s (delay: %.3fs)", self.config.skinner_hotkey.upper(), delay)
             print(f"🔪 Prawy przycisk → {self.config.skinner_hotkey.upper()} (opóźnienie: {delay:.3f}s)")
     
     def start(self):
@@ -3,10 +3,36 @@ Processing Components
 
 This package contains the processing components:
 - OCRProcessor: OCR and image processing logic
+- HealthParser: Confusion-aware scoring parser for OCR text
+- DigitRecognizer: Template-matching recognizer for the HP font
+- TesseractEngine: Persistent in-process Tesseract backend
+- Frame: One captured region with memoized derived images
+- FrameCache: Unchanged-frame short-circuit for OCR
+- FrameRecorder / FrameReader: On-disk frame store for session replay
+- FlightRecorder: Memory-mapped ring of the last seconds of cycles
+- HPEstimator: Temporal HP filter with outlier rejection
+- HPBarReader: Pixel-ratio HP sensing from the HP bar
+- Deadline: Time budget for one OCR extraction
+- LatencyRecorder: Per-stage latency histograms
+- OCRStrategy: Adaptive OCR variant ordering and effort tiers
+- ScreenCapture: Pluggable screen capture backends
 - RegionManager: Screen region selection and management
 """
 
 from .ocr_processor import OCRProcessor
+from .health_parser import HealthParser
+from .digit_recognizer import DigitRecognizer
+from .tesseract_engine import TesseractEngine
+from .frame import Frame
+from .frame_cache import FrameCache
+from .frame_recorder import FrameRecorder, FrameReader
+from .flight_recorder import FlightRecorder
+from .hp_estimator import HPEstimator
+from .hp_bar_reader import HPBarReader
+from .deadline import Deadline
+from .latency import LatencyRecorder
+from .ocr_strategy import OCRStrategy
+from .screen_capture import ScreenCapture, ReplayCapture, create_screen_capture
 from .region_manager import RegionManager
 
-__all__ = ['OCRProcessor', 'RegionManager'] 
\ No newline at end of file
+__all__ = ['OCRProcessor', 'HealthParser', 'DigitRecognizer', 'TesseractEngine', 'Frame', 'FrameCache', 'FrameRecorder', 'FrameReader', 'FlightRecorder', 'HPEstimator', 'HPBarReader', 'Deadline', 'LatencyRecorder', 'OCRStrategy', 'ScreenCapture', 'ReplayCapture', 'create_screen_capture', 'RegionManager'] 
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""
+Deadline - Time budget for one OCR extraction
+
+Created once per cycle and checked between OCR variants. A variant that has
+started always runs to completion, so an extraction can end slightly past
+its deadline. Such overruns are reported by the caller.
+"""
+
+import time
+
+
+class Deadline:
+    """Tracks the remaining budget and whether any work was cut short"""
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.start = time.perf_counter()
+        self.end = self.start + budget if budget is not None else None
+
+        # Set once a check finds the budget spent - remaining variants were skipped
+        self.truncated = False
+
+    def remaining(self):
+        """Seconds left, or None without a budget"""
+        if self.end is None:
+            return None
+        return max(0.0, self.end - time.perf_counter())
+
+    def expired(self):
+        """Check the budget - an expired check marks the extraction truncated"""
+        if self.end is None or time.perf_counter() < self.end:
+            return False
+        self.truncated = True
+        return True
+
+    def elapsed(self):
+        """Seconds since the deadline was created"""
+        return time.perf_counter() - self.start
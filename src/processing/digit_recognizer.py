@@ -0,0 +1,220 @@
+"""
+Digit Recognizer - Template-matching OCR for the HP number
+
+The HP number is always drawn in the same fixed bitmap font, so instead of
+starting Tesseract for every frame the region is split into glyph columns and
+each glyph is matched against a stored digit atlas with one vectorized NumPy
+correlation. The atlas is learned from confirmed Tesseract readings and saved
+between sessions.
+"""
+
+import os
+import cv2
+import numpy as np
+
+
+class DigitRecognizer:
+    """Recognizes HP digits by correlating glyphs against a learned atlas"""
+
+    # Every glyph is normalized onto a canvas of this size before matching
+    GLYPH_HEIGHT = 16
+    GLYPH_WIDTH = 12
+
+    # Templates kept per digit (the same digit can render slightly differently)
+    MAX_TEMPLATES_PER_DIGIT = 4
+
+    # A new glyph more similar than this to a stored template is not added
+    DUPLICATE_SIMILARITY = 0.98
+
+    # Glyphs with fewer ink pixels than this are treated as noise
+    MIN_GLYPH_PIXELS = 3
+
+    MAX_DIGITS = 5
+
+    def __init__(self, config, debug_logger=None):
+        self.config = config
+        self.debug_logger = debug_logger
+        self.atlas_file = config.digit_atlas_file
+        self.min_confidence = config.template_min_confidence
+
+        # Off for replays - the atlas then stays as loaded
+        self.learning = True
+
+        vector_size = self.GLYPH_HEIGHT * self.GLYPH_WIDTH
+        self._templates = np.empty((0, vector_size), dtype=np.float32)
+        self._labels = np.empty(0, dtype=np.int8)
+
+        self.load_atlas()
+
+    def debug_log(self, message, *args, level=None):
+        """Write debug message through the logger (%-style args, default level unless given)"""
+        if self.debug_logger:
+            if level:
+                self.debug_logger.log(message, *args, level=level)
+            else:
+                self.debug_logger.log(message, *args)
+
+    def has_atlas(self):
+        """Check if any digit templates are available"""
+        return len(self._labels) > 0
+
+    def known_digits(self):
+        """Get the set of digits present in the atlas"""
+        return set(int(label) for label in np.unique(self._labels))
+
+    def binarize(self, gray):
+        """Threshold a grayscale region so that glyph pixels are True"""
+        _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        mask = thresh > 0
+
+        # Text covers less of the region than the background
+        if mask.mean() > 0.5:
+            mask = ~mask
+        return mask
+
+    def segment(self, mask):
+        """Split a binary mask into glyph column spans"""
+        rows = np.flatnonzero(mask.any(axis=1))
+        if len(rows) == 0:
+            return []
+        top, bottom = rows[0], rows[-1] + 1
+        line = mask[top:bottom]
+
+        # Column runs of ink separated by empty columns are glyphs
+        occupied = line.any(axis=0).astype(np.int8)
+        edges = np.diff(np.concatenate(([0], occupied, [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+
+        glyphs = []
+        for start, end in zip(starts, ends):
+            glyph = line[:, start:end]
+            if glyph.sum() >= self.MIN_GLYPH_PIXELS:
+                glyphs.append(glyph)
+        return glyphs
+
+    def _normalize_glyphs(self, glyphs):
+        """Convert glyph masks into zero-mean, unit-norm vectors"""
+        vectors = np.zeros((len(glyphs), self.GLYPH_HEIGHT * self.GLYPH_WIDTH), dtype=np.float32)
+
+        for i, glyph in enumerate(glyphs):
+            height, width = glyph.shape
+            scale = self.GLYPH_HEIGHT / height
+            scaled_width = min(self.GLYPH_WIDTH, max(1, int(round(width * scale))))
+
+            # Keep the aspect ratio so narrow digits like 1 stay narrow
+            resized = cv2.resize(glyph.astype(np.float32), (scaled_width, self.GLYPH_HEIGHT),
+                                 interpolation=cv2.INTER_AREA)
+            canvas = np.zeros((self.GLYPH_HEIGHT, self.GLYPH_WIDTH), dtype=np.float32)
+            offset = (self.GLYPH_WIDTH - scaled_width) // 2
+            canvas[:, offset:offset + scaled_width] = resized
+            vectors[i] = canvas.ravel()
+
+        vectors -= vectors.mean(axis=1, keepdims=True)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def recognize(self, gray):
+        """Recognize the number in a grayscale region
+
+        Returns a (value, confidence) tuple. Confidence is the lowest glyph
+        correlation score, so one doubtful digit makes the whole reading doubtful.
+        """
+        if not self.has_atlas():
+            return None, 0.0
+
+        glyphs = self.segment(self.binarize(gray))
+        if not glyphs or len(glyphs) > self.MAX_DIGITS:
+            return None, 0.0
+
+        vectors = self._normalize_glyphs(glyphs)
+        scores = vectors @ self._templates.T
+        best = scores.argmax(axis=1)
+        confidence = float(scores[np.arange(len(glyphs)), best].min())
+
+        digits = ''.join(str(int(label)) for label in self._labels[best])
+        return int(digits), confidence
+
+    def recognize_confident(self, gray):
+        """Recognize the number, returning None if the match is not confident enough"""
+        value, confidence = self.recognize(gray)
+        if value is None:
+            return None
+
+        if confidence < self.min_confidence:
+            self.debug_log("TEMPLATE: Low confidence %.3f for %s - falling back", confidence, value, level='trace')
+            return None
+
+        self.debug_log("TEMPLATE: Matched %s (confidence %.3f)", value, confidence, level='trace')
+        return value
+
+    def learn(self, gray, value):
+        """Add the glyphs of a confirmed reading to the atlas"""
+        return self.learn_text(gray, str(value))
+
+    def learn_text(self, gray, text):
+        """Add glyphs to the atlas, labelled with the digits of text"""
+        if not self.learning:
+            return False
+        glyphs = self.segment(self.binarize(gray))
+        if len(glyphs) != len(text) or not text.isdigit():
+            return False
+
+        vectors = self._normalize_glyphs(glyphs)
+        changed = False
+
+        for vector, char in zip(vectors, text):
+            digit = int(char)
+            same_digit = self._templates[self._labels == digit]
+
+            if len(same_digit) >= self.MAX_TEMPLATES_PER_DIGIT:
+                continue
+            if len(same_digit) and (same_digit @ vector).max() >= self.DUPLICATE_SIMILARITY:
+                continue
+
+            self._templates = np.vstack((self._templates, vector[np.newaxis, :]))
+            self._labels = np.append(self._labels, np.int8(digit))
+            changed = True
+
+        if changed:
+            self.debug_log("TEMPLATE: Learned glyphs from '%s' - atlas now has %s templates", text, len(self._labels), level='info')
+            self.save_atlas()
+        return changed
+
+    def load_atlas(self):
+        """Load digit templates from the atlas file"""
+        if not self.atlas_file or not os.path.exists(self.atlas_file):
+            return False
+
+        try:
+            with np.load(self.atlas_file) as data:
+                templates = data['templates'].astype(np.float32)
+                labels = data['labels'].astype(np.int8)
+
+            if templates.shape[1:] != self._templates.shape[1:]:
+                self.debug_log("TEMPLATE: Ignoring atlas with incompatible glyph size %s", templates.shape)
+                return False
+
+            self._templates = templates
+            self._labels = labels
+            self.debug_log("TEMPLATE: Loaded %s templates from %s", len(labels), self.atlas_file, level='info')
+            return True
+        except Exception as e:
+            self.debug_log("TEMPLATE: Could not load atlas: %s", e, level='warn')
+            return False
+
+    def save_atlas(self):
+        """Save digit templates to the atlas file"""
+        if not self.atlas_file:
+            return False
+
+        try:
+            directory = os.path.dirname(self.atlas_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            np.savez_compressed(self.atlas_file, templates=self._templates, labels=self._labels)
+            return True
+        except Exception as e:
+            self.debug_log("TEMPLATE: Could not save atlas: %s", e, level='warn')
+            return False
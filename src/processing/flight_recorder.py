@@ -0,0 +1,257 @@
+"""
+Flight Recorder - Last seconds of frames and decisions in a memory-mapped ring
+
+Every monitoring cycle overwrites the oldest slot of a fixed-size ring in a
+memory-mapped file with the raw region pixels, the HP value acted on, the
+HealthMonitor decision and the key pressed. A write is a struct pack and a
+memcpy into the mapping - no syscalls, no compression - and the pages belong
+to the OS, so the last seconds survive a crash of the helper. On start an
+existing recording is kept as <file>.prev.
+
+Slots are committed by writing their sequence number last; a slot torn by a
+crash mid-write has sequence 0 and is skipped when reading.
+
+File layout (little-endian):
+
+    header: <8s magic> <I slots> <I slot size> <I regions per slot> <I region bytes>
+    slot:   <Q sequence> <d timestamp> <i hp> <B decision> <8s key> <d key time>
+            region * (<8s name> <4i region> <4H height, stored rows, width, channels> pixels)
+
+Regions larger than the region byte limit keep only their top rows.
+"""
+
+import datetime
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+
+import cv2
+import numpy as np
+
+
+MAGIC = b'TFLIGHT1'
+REGIONS_PER_SLOT = 2
+
+DECISIONS = ['none', 'invalid', 'healthy', 'moderate', 'critical', 'moderate_disabled', 'critical_disabled', 'paused']
+
+_HEADER = struct.Struct('<8sIIII')
+_SLOT = struct.Struct('<QdiB8sd')
+_REGION = struct.Struct('<8s4i4H')
+
+NO_HP = -1
+NO_REGION = (-1, -1, -1, -1)
+
+
+def _slot_size(region_bytes):
+    """Bytes per slot, 8-byte aligned"""
+    size = _SLOT.size + REGIONS_PER_SLOT * (_REGION.size + region_bytes)
+    return (size + 7) // 8 * 8
+
+
+def read_slots(data):
+    """Decode a flight recording (bytes or mmap) as cycle dicts, oldest first"""
+    magic, slots, slot_size, regions_per_slot, region_bytes = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise RuntimeError("Not a flight recording")
+
+    cycles = []
+    for index in range(slots):
+        offset = _HEADER.size + index * slot_size
+        sequence, timestamp, hp, decision, key, key_time = _SLOT.unpack_from(data, offset)
+        if sequence == 0:
+            continue
+
+        frames = {}
+        region_offset = offset + _SLOT.size
+        for _ in range(regions_per_slot):
+            name, *fields = _REGION.unpack_from(data, region_offset)
+            *region, height, rows, width, channels = fields
+            pixel_offset = region_offset + _REGION.size
+            region_offset = pixel_offset + region_bytes
+
+            name = name.rstrip(b'\0').decode('utf-8')
+            if not name:
+                continue
+            shape = (rows, width, channels) if channels else (rows, width)
+            count = rows * width * max(channels, 1)
+            pixels = np.frombuffer(data, dtype=np.uint8, count=count, offset=pixel_offset).reshape(shape).copy()
+            frames[name] = {
+                'region': None if tuple(region) == NO_REGION else tuple(region),
+                'height': height,
+                'pixels': pixels
+            }
+
+        key = key.rstrip(b'\0').decode('utf-8')
+        cycles.append({
+            'sequence': sequence,
+            'timestamp': timestamp,
+            'hp': None if hp == NO_HP else hp,
+            'decision': DECISIONS[decision] if decision < len(DECISIONS) else 'unknown',
+            'key': key or None,
+            'key_time': key_time if key else None,
+            'frames': frames
+        })
+
+    cycles.sort(key=lambda cycle: cycle['sequence'])
+    return cycles
+
+
+def dump_cycles(cycles, output_dir):
+    """Write cycles as a readable timeline plus one PNG per region frame
+
+    Returns the path of the timeline file.
+    """
+    frames_dir = os.path.join(output_dir, 'frames')
+    os.makedirs(frames_dir, exist_ok=True)
+
+    lines = [f"{'time':<12} {'seq':>8} {'hp':>6}  {'decision':<18} {'key':<6} frames"]
+    for cycle in cycles:
+        stamp = datetime.datetime.fromtimestamp(cycle['timestamp']).strftime('%H:%M:%S.%f')[:-3]
+        hp = cycle['hp'] if cycle['hp'] is not None else '-'
+        key = cycle['key'].upper() if cycle['key'] else '-'
+
+        names = []
+        for name, frame in cycle['frames'].items():
+            filename = f"{cycle['sequence']:08d}_{name}.png"
+            cv2.imwrite(os.path.join(frames_dir, filename), frame['pixels'])
+            cropped = " (cropped)" if frame['pixels'].shape[0] < frame['height'] else ""
+            names.append(f"{filename}{cropped}")
+
+        lines.append(f"{stamp:<12} {cycle['sequence']:>8} {hp:>6}  {cycle['decision']:<18} {key:<6} {', '.join(names)}")
+
+    timeline = os.path.join(output_dir, 'timeline.txt')
+    with open(timeline, 'w') as f:
+        f.write("\n".join(lines) + "\n")
+    return timeline
+
+
+class FlightRecorder:
+    """Fixed-size memory-mapped ring of the most recent monitoring cycles"""
+
+    # Minimum seconds between automatic dumps (critical heals repeat during a fight)
+    AUTO_DUMP_INTERVAL = 30.0
+
+    def __init__(self, config, debug_logger=None):
+        self.config = config
+        self.debug_logger = debug_logger
+        self.path = config.flight_recorder_file
+        self.region_bytes = config.flight_recorder_region_bytes
+        # Enough slots for the configured seconds at the fastest rate the loop may run at
+        fastest_period = config.monitor_frequency
+        if config.adaptive_sampling:
+            fastest_period = min(fastest_period, 1.0 / config.sampling_max_rate)
+        self.slots = max(1, math.ceil(config.flight_recorder_seconds / fastest_period))
+        self.slot_size = _slot_size(self.region_bytes)
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.path):
+            os.replace(self.path, self.path + '.prev')
+
+        size = _HEADER.size + self.slots * self.slot_size
+        with open(self.path, 'w+b') as f:
+            f.truncate(size)
+            self.mmap = mmap.mmap(f.fileno(), size)
+        _HEADER.pack_into(self.mmap, 0, MAGIC, self.slots, self.slot_size, REGIONS_PER_SLOT, self.region_bytes)
+
+        # Byte view of the mapping for copying pixels without temporaries
+        self.buffer = np.frombuffer(self.mmap, dtype=np.uint8)
+        self.sequence = 0
+        self.last_dump = 0.0
+
+        self.debug_log("FLIGHT: Recording the last %s cycles (%.1f MB) to %s", self.slots, size / 1024 / 1024, self.path, level='info')
+
+    def debug_log(self, message, *args, level=None):
+        """Write debug message through the logger (%-style args, default level unless given)"""
+        if self.debug_logger:
+            if level:
+                self.debug_logger.log(message, *args, level=level)
+            else:
+                self.debug_logger.log(message, *args)
+
+    def record(self, timestamp, frames, hp_value, decision, key=None, key_time=None):
+        """Overwrite the oldest slot with one cycle"""
+        if self.mmap is None:
+            return
+
+        self.sequence += 1
+        offset = _HEADER.size + (self.sequence - 1) % self.slots * self.slot_size
+
+        # Uncommit the slot first so a crash mid-write leaves it unreadable, not mixed
+        _SLOT.pack_into(self.mmap, offset, 0, 0.0, NO_HP, 0, b'', 0.0)
+
+        region_offset = offset + _SLOT.size
+        names = list(frames)[:REGIONS_PER_SLOT]
+        for index in range(REGIONS_PER_SLOT):
+            if index >= len(names):
+                _REGION.pack_into(self.mmap, region_offset, b'', *NO_REGION, 0, 0, 0, 0)
+                region_offset += _REGION.size + self.region_bytes
+                continue
+
+            frame = frames[names[index]]
+            pixels = frame.pixels
+            height, width = pixels.shape[:2]
+            channels = pixels.shape[2] if pixels.ndim == 3 else 0
+            row_bytes = width * max(channels, 1)
+            rows = min(height, self.region_bytes // row_bytes) if row_bytes else 0
+
+            region = tuple(frame.region) if frame.region else NO_REGION
+            _REGION.pack_into(self.mmap, region_offset, names[index].encode('utf-8')[:8], *region, height, rows, width, channels)
+            pixel_offset = region_offset + _REGION.size
+            self.buffer[pixel_offset:pixel_offset + rows * row_bytes] = pixels[:rows].reshape(-1)
+            region_offset = pixel_offset + self.region_bytes
+
+        _SLOT.pack_into(self.mmap, offset, self.sequence, timestamp,
+                        hp_value if hp_value is not None else NO_HP,
+                        DECISIONS.index(decision) if decision in DECISIONS else 0,
+                        key.encode('utf-8')[:8] if key else b'', key_time or 0.0)
+
+    def read(self):
+        """Decode the ring as cycle dicts, oldest first"""
+        return read_slots(self.mmap)
+
+    def _new_dump_dir(self):
+        return os.path.join(self.config.flight_dump_dir, datetime.datetime.now().strftime('flight_%Y%m%d_%H%M%S'))
+
+    def dump(self, output_dir=None):
+        """Write the ring to a new timestamped directory and return its path"""
+        output_dir = output_dir or self._new_dump_dir()
+        dump_cycles(read_slots(bytes(self.mmap)), output_dir)
+        self.debug_log("FLIGHT: Dumped the last %s cycles to %s", min(self.sequence, self.slots), output_dir, level='info')
+        return output_dir
+
+    def dump_in_background(self):
+        """Snapshot the ring now and write the dump off the sensing thread
+
+        Returns False if the previous automatic dump is too recent.
+        """
+        now = time.time()
+        if now - self.last_dump < self.AUTO_DUMP_INTERVAL or self.mmap is None:
+            return False
+        self.last_dump = now
+
+        snapshot = bytes(self.mmap)
+        output_dir = self._new_dump_dir()
+
+        def write():
+            try:
+                dump_cycles(read_slots(snapshot), output_dir)
+                self.debug_log("FLIGHT: Dumped %s cycles to %s", min(self.sequence, self.slots), output_dir, level='info')
+            except Exception as e:
+                self.debug_log("FLIGHT: Dump failed: %s", e, level='warn')
+
+        threading.Thread(target=write, name='flight-dump', daemon=True).start()
+        return True
+
+    def close(self):
+        """Flush the mapping to disk and unmap it"""
+        if self.mmap is None:
+            return
+        self.buffer = None
+        self.mmap.flush()
+        self.mmap.close()
+        self.mmap = None
@@ -0,0 +1,54 @@
+"""
+Frame - One captured region shared by every consumer in a cycle
+
+A Frame is captured once per monitoring cycle and handed to the primary OCR
+path, the fallback strategies and debug logging. Grayscale conversion,
+threshold variants and the pixel digest are computed on first use and
+memoized, so each happens at most once per cycle.
+"""
+
+import time
+from .frame_cache import FrameCache
+from .screen_capture import to_gray
+
+
+class Frame:
+    """Captured pixels plus lazily computed derived images"""
+
+    def __init__(self, pixels, region=None, timestamp=None):
+        self.pixels = pixels
+        self.region = region
+        self.timestamp = timestamp if timestamp is not None else time.time()
+
+        self._gray = None
+        self._thresholds = {}
+        self._digest = None
+
+    def gray(self):
+        """Get the grayscale image (converted once)"""
+        if self._gray is None:
+            self._gray = to_gray(self.pixels)
+        return self._gray
+
+    def threshold(self, method, threshold_function):
+        """Get a threshold variant, computed once with threshold_function(gray, method)"""
+        thresh = self._thresholds.get(method)
+        if thresh is None:
+            thresh = threshold_function(self.gray(), method)
+            self._thresholds[method] = thresh
+        return thresh
+
+    def digest(self):
+        """Get the pixel checksum used by the unchanged-frame cache"""
+        if self._digest is None:
+            self._digest = FrameCache.checksum(self.pixels)
+        return self._digest
+
+    def age(self):
+        """Seconds since the frame was captured"""
+        return time.time() - self.timestamp
+
+    def describe(self):
+        """Short description for debug logs"""
+        shape, crc = self.digest()
+        return f"frame {shape[1]}x{shape[0]} crc={crc:08x} @ {self.timestamp:.3f}"
@@ -0,0 +1,58 @@
+"""
+Frame Cache - Unchanged-frame short-circuit for OCR
+
+Most cycles see exactly the same pixels as the previous one, because the HP
+number only changes when HP does. A CRC32 checksum of the raw region pixels
+identifies such frames, and the last decoded value is returned without running
+any OCR.
+"""
+
+import zlib
+import numpy as np
+
+
+class FrameCache:
+    """Remembers the last decoded value per region, keyed by a pixel checksum"""
+
+    def __init__(self):
+        self._entries = {}
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def checksum(pixels):
+        """Cheap checksum of the raw region pixels (shape included)"""
+        pixels = np.ascontiguousarray(pixels)
+        return pixels.shape, zlib.crc32(pixels)
+
+    def get(self, key, checksum):
+        """Return (hit, value) for the given region key and checksum"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == checksum:
+            self.hits += 1
+            return True, entry[1]
+
+        self.misses += 1
+        return False, None
+
+    def put(self, key, checksum, value):
+        """Remember the value decoded from a frame"""
+        self._entries[key] = (checksum, value)
+
+    def invalidate(self, key=None):
+        """Forget cached values (all regions if no key is given)"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def get_stats(self):
+        """Get hit/miss statistics"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,165 @@
+"""
+Frame Recorder - Compact on-disk store of captured frames for replay
+
+Every monitoring cycle is appended as one record: its capture timestamp and
+the named region frames it grabbed. Pixels are zlib-compressed (level 1, so
+recording stays cheap on the sensing thread), and a frame identical to the
+previous frame of the same name is stored as a repeat marker without pixels -
+HP digits are unchanged for most cycles.
+
+Store layout (little-endian):
+
+    b'TFRM1\\n'
+    cycle:  <d timestamp> <H frame count> frame*
+    frame:  <H name length> name <4i region> <3H shape> <B kind> [<I length> zlib pixels]
+
+A region of (-1, -1, -1, -1) means the frame had none; a shape channel count
+of 0 means a 2-D (grayscale) frame. Kind 0 carries pixels, kind 1 repeats the
+previous frame of that name.
+"""
+
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from .frame import Frame
+
+
+MAGIC = b'TFRM1\n'
+COMPRESSION_LEVEL = 1
+
+KIND_PIXELS = 0
+KIND_REPEAT = 1
+
+_CYCLE = struct.Struct('<dH')
+_NAME = struct.Struct('<H')
+_FRAME = struct.Struct('<4i3HB')
+_LENGTH = struct.Struct('<I')
+
+NO_REGION = (-1, -1, -1, -1)
+
+
+class FrameRecorder:
+    """Appends monitoring cycles to a frame store"""
+
+    def __init__(self, path, debug_logger=None):
+        self.path = path
+        self.debug_logger = debug_logger
+        self.file = open(path, 'wb')
+        self.file.write(MAGIC)
+
+        # name -> digest of the last stored frame (repeats are not stored again)
+        self.last_digests = {}
+
+        # Statistics
+        self.cycles = 0
+        self.frames = 0
+        self.repeats = 0
+        self.bytes_written = len(MAGIC)
+
+        self.debug_log("RECORD: Recording frames to %s", path, level='info')
+
+    def debug_log(self, message, *args, level=None):
+        """Write debug message through the logger (%-style args, default level unless given)"""
+        if self.debug_logger:
+            if level:
+                self.debug_logger.log(message, *args, level=level)
+            else:
+                self.debug_logger.log(message, *args)
+
+    def record(self, frames, timestamp=None):
+        """Append one cycle of {name: Frame} (an empty dict records a failed capture)"""
+        if self.file is None:
+            return
+
+        if timestamp is None:
+            timestamp = min((frame.timestamp for frame in frames.values()), default=time.time())
+
+        chunks = [_CYCLE.pack(timestamp, len(frames))]
+        for name, frame in frames.items():
+            encoded_name = name.encode('utf-8')
+            pixels = frame.pixels
+            height, width = pixels.shape[:2]
+            channels = pixels.shape[2] if pixels.ndim == 3 else 0
+            region = tuple(frame.region) if frame.region else NO_REGION
+
+            digest = frame.digest()
+            kind = KIND_REPEAT if self.last_digests.get(name) == digest else KIND_PIXELS
+            self.last_digests[name] = digest
+
+            chunks.append(_NAME.pack(len(encoded_name)))
+            chunks.append(encoded_name)
+            chunks.append(_FRAME.pack(*region, height, width, channels, kind))
+            if kind == KIND_PIXELS:
+                payload = zlib.compress(np.ascontiguousarray(pixels, dtype=np.uint8).tobytes(), COMPRESSION_LEVEL)
+                chunks.append(_LENGTH.pack(len(payload)))
+                chunks.append(payload)
+            else:
+                self.repeats += 1
+            self.frames += 1
+
+        record = b''.join(chunks)
+        self.file.write(record)
+        self.bytes_written += len(record)
+        self.cycles += 1
+
+    def get_stats(self):
+        """Get recording statistics"""
+        return {
+            'path': self.path,
+            'cycles': self.cycles,
+            'frames': self.frames,
+            'repeats': self.repeats,
+            'bytes': self.bytes_written
+        }
+
+    def close(self):
+        """Flush and close the store"""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            self.debug_log("RECORD: Saved %s cycles (%s bytes) to %s", self.cycles, self.bytes_written, self.path, level='info')
+
+
+class FrameReader:
+    """Iterates a frame store as (timestamp, {name: Frame}) per recorded cycle"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def __iter__(self):
+        with open(self.path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise RuntimeError(f"'{self.path}' is not a frame recording")
+
+            previous = {}
+            while True:
+                header = f.read(_CYCLE.size)
+                if len(header) < _CYCLE.size:
+                    # End of store (a cycle cut off by a crash is dropped)
+                    return
+                timestamp, count = _CYCLE.unpack(header)
+
+                frames = {}
+                try:
+                    for _ in range(count):
+                        name_length, = _NAME.unpack(f.read(_NAME.size))
+                        name = f.read(name_length).decode('utf-8')
+                        *region, height, width, channels, kind = _FRAME.unpack(f.read(_FRAME.size))
+
+                        if kind == KIND_REPEAT:
+                            pixels = previous[name]
+                        else:
+                            length, = _LENGTH.unpack(f.read(_LENGTH.size))
+                            shape = (height, width, channels) if channels else (height, width)
+                            pixels = np.frombuffer(zlib.decompress(f.read(length)), dtype=np.uint8).reshape(shape)
+                            previous[name] = pixels
+
+                        region = None if tuple(region) == NO_REGION else tuple(region)
+                        frames[name] = Frame(pixels, region, timestamp)
+                except (struct.error, zlib.error, ValueError):
+                    return
+
+                yield timestamp, frames
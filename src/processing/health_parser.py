@@ -0,0 +1,149 @@
+"""
+Health Parser - Confusion-aware single-pass parser for OCR'd HP values
+
+OCR text is scanned once. Every character maps through a precompiled table
+to a digit and a likelihood: real digits are certain, and letters Tesseract
+commonly confuses with digits (S->8, B->8, O->0, G->6, l/I->1) are
+plausible. Each digit window of a valid length becomes a candidate, scored
+by the product of its likelihoods. A join across a single space, truncated
+letters and leading zeros are penalized; a window spanning two gaps is not a
+candidate. Candidates outside 1..max_hp are dropped. The previously accepted
+value only decides between equally scored candidates, in favour of one within
+a plausible change of it, and the first candidate wins the remaining ties.
+"""
+
+
+class HealthParser:
+    """Builds scored integer candidates from OCR text and picks the best"""
+
+    # Character -> (digit, likelihood it was meant as that digit)
+    CHARACTER_TABLE = {str(d): (str(d), 1.0) for d in range(10)}
+    CHARACTER_TABLE.update({
+        'B': ('8', 0.8),
+        'S': ('8', 0.6),
+        'O': ('0', 0.8),
+        'G': ('6', 0.6),
+        'g': ('6', 0.5),
+        'l': ('1', 0.8),
+        'I': ('1', 0.8),
+    })
+    GAP_CHARACTERS = ' \t'
+
+    JOIN_LIKELIHOOD = 0.7          # "86 4" -> 864, at most one join per candidate
+    TRUNCATE_LIKELIHOOD = 0.4      # window leaves out a stray letter: "864l" -> 864
+    LEADING_ZERO_LIKELIHOOD = 0.3  # HP is never printed with a leading zero
+    MIN_SCORE = 0.3
+    MIN_DIGITS = 3
+
+    # Share of max_hp an equally scored candidate may be from the previous value to be preferred
+    PRIOR_RANGE = 0.25
+
+    def __init__(self, config, debug_logger=None):
+        self.config = config
+        self.debug_logger = debug_logger
+
+    def debug_log(self, message, *args, level=None):
+        """Write debug message through the logger (%-style args, default level unless given)"""
+        if self.debug_logger:
+            if level:
+                self.debug_logger.log(message, *args, level=level)
+            else:
+                self.debug_logger.log(message, *args)
+
+    def _runs(self, text):
+        """Split text into runs of (digit, likelihood, gap_before) units"""
+        runs = []
+        units = []
+        gap = False
+        table = self.CHARACTER_TABLE
+
+        for char in text:
+            entry = table.get(char)
+            if entry is not None:
+                units.append((entry[0], entry[1], gap))
+                gap = False
+            elif char in self.GAP_CHARACTERS and units and not gap:
+                gap = True
+            else:
+                if units:
+                    runs.append(units)
+                units = []
+                gap = False
+
+        if units:
+            runs.append(units)
+        return runs
+
+    def _truncation(self, dropped):
+        """Likelihood of a window that leaves out a neighbouring unit
+
+        Dropping a stray confusable letter is plausible; dropping a real digit
+        is not, since 9999 must never be read as 999.
+        """
+        return 0.0 if dropped[1] == 1.0 else self.TRUNCATE_LIKELIHOOD
+
+    def candidates(self, text):
+        """Get every in-range candidate as (value, score, position)"""
+        max_value = self.config.max_hp
+        max_digits = max(self.MIN_DIGITS, len(str(max_value)))
+        found = []
+        position = 0
+
+        for units in self._runs(text):
+            count = len(units)
+            for start in range(count):
+                start_aligned = start == 0 or units[start][2]
+                leading = self.LEADING_ZERO_LIKELIHOOD if units[start][0] == '0' else 1.0
+                digits = ''
+                score = leading
+                joined = False
+                for end in range(start, min(count, start + max_digits)):
+                    digit, likelihood, gap_before = units[end]
+                    if end > start and gap_before:
+                        if joined:
+                            break  # "1 2 3 4" is separate digits, not 123 or 234
+                        joined = True
+                        score *= self.JOIN_LIKELIHOOD
+                    digits += digit
+                    score *= likelihood
+
+                    length = end - start + 1
+                    if length < self.MIN_DIGITS:
+                        continue
+
+                    end_aligned = end + 1 == count or units[end + 1][2]
+                    window_score = score
+                    if not start_aligned:
+                        window_score *= self._truncation(units[start - 1])
+                    if not end_aligned:
+                        window_score *= self._truncation(units[end + 1])
+
+                    value = int(digits)
+                    if window_score >= self.MIN_SCORE and 1 <= value <= max_value:
+                        found.append((value, window_score, position + start))
+            position += count
+
+        return found
+
+    def parse(self, text, value_type="unknown", previous=None):
+        """Parse the most likely HP value from OCR text"""
+        if not text:
+            return None
+
+        self.debug_log("PARSE %s: Raw OCR text: '%s'", value_type.upper(), text, level='trace')
+
+        prior_range = self.PRIOR_RANGE * self.config.max_hp
+        best = None
+        best_key = None
+        for value, score, position in self.candidates(text):
+            near_previous = previous is not None and abs(value - previous) <= prior_range
+            key = (score, near_previous, -position)
+            if best_key is None or key > best_key:
+                best, best_key = value, key
+
+        if best is None:
+            self.debug_log("PARSE %s: No valid candidates found", value_type.upper(), level='trace')
+            return None
+
+        self.debug_log("PARSE %s: Best candidate %s (score %.2f)", value_type.upper(), best, best_key[0], level='trace')
+        return best
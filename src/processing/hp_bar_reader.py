@@ -0,0 +1,72 @@
+"""
+HP Bar Reader - Pixel-ratio HP sensing without OCR
+
+Tibia draws a coloured HP bar whose filled width is proportional to HP.
+Counting the columns that match the calibrated fill colour gives the HP
+percentage with a single vectorized NumPy pass, no OCR involved.
+"""
+
+import numpy as np
+
+
+class HPBarReader:
+    """Reads HP percentage from the filled width of the HP bar"""
+
+    # A column counts as filled when at least this share of its pixels match
+    MIN_COLUMN_FILL = 0.5
+
+    def __init__(self, config, debug_logger=None):
+        self.config = config
+        self.debug_logger = debug_logger
+        self.tolerance = config.bar_color_tolerance
+
+        self.fill_color = None
+        if config.bar_fill_color:
+            self.set_fill_color(config.bar_fill_color)
+
+    def debug_log(self, message, *args, level=None):
+        """Write debug message through the logger (%-style args, default level unless given)"""
+        if self.debug_logger:
+            if level:
+                self.debug_logger.log(message, *args, level=level)
+            else:
+                self.debug_logger.log(message, *args)
+
+    def set_fill_color(self, color):
+        """Set the BGR colour of a filled bar pixel"""
+        self.fill_color = np.array(color[:3], dtype=np.int16)
+
+    def is_calibrated(self):
+        """Check if a fill colour is known"""
+        return self.fill_color is not None
+
+    def calibrate(self, img):
+        """Take the fill colour from a bar image captured at full HP
+
+        Uses the median colour of the middle row, which skips the bar border.
+        """
+        middle_row = img[img.shape[0] // 2, :, :3]
+        color = tuple(int(c) for c in np.median(middle_row, axis=0))
+        self.set_fill_color(color)
+        self.debug_log("HP_BAR: Calibrated fill colour (BGR): %s", color, level='info')
+        return color
+
+    def read_percentage(self, img):
+        """Get the filled share of the bar as a 0.0-1.0 fraction"""
+        if self.fill_color is None or img is None or img.size == 0:
+            return None
+
+        difference = np.abs(img[:, :, :3].astype(np.int16) - self.fill_color)
+        matches = (difference <= self.tolerance).all(axis=2)
+        filled_columns = matches.mean(axis=0) >= self.MIN_COLUMN_FILL
+        return float(filled_columns.mean())
+
+    def read_hp(self, img):
+        """Convert the bar fill into an absolute HP value"""
+        percentage = self.read_percentage(img)
+        if percentage is None:
+            return None
+
+        hp_value = int(round(percentage * self.config.max_hp))
+        self.debug_log("HP_BAR: Fill %.1f%% -> HP %s", percentage * 100, hp_value, level='trace')
+        return hp_value
@@ -0,0 +1,148 @@
+"""
+HP Estimator - Temporal filter between OCR and the health monitor
+
+Keeps a short window of accepted readings and tracks their median (the
+filtered value) and spread (the uncertainty). Every new reading gets a
+plausibility score from its distance to the estimate. A jump larger than
+dramatic_drop_threshold of max HP is held back instead of acted on; the
+next reading either confirms it (the jump was real) or it is dropped as a
+misread. A rejected reading returns the estimate rather than a failure, so
+one bad frame neither triggers a heal nor escalates OCR effort.
+"""
+
+import statistics
+import time
+from collections import deque
+
+
+class HPEstimator:
+    """Robust median filter with outlier rejection for HP readings"""
+
+    # Median absolute deviation -> standard deviation for normal noise
+    MAD_SCALE = 1.4826
+
+    # Readings needed before the estimate is trusted for early OCR stops
+    MIN_READINGS = 3
+
+    # Uncertainty growth while no reading is accepted (share of max HP per second)
+    STALE_GROWTH = 0.1
+
+    def __init__(self, config, debug_logger=None, clock=None):
+        self.config = config
+        self.debug_logger = debug_logger
+        self.enabled = config.use_estimator
+
+        # Staleness is measured on the capture clock (recorded time during replay)
+        self.clock = clock
+
+        self.readings = deque(maxlen=config.estimator_window)
+        self.last_update = None
+
+        # Held-back jump waiting for confirmation: (timestamp, value)
+        self.pending = None
+
+        # Statistics
+        self.accepted = 0
+        self.rejected = 0
+        self.confirmed_jumps = 0
+
+    def debug_log(self, message, *args, level=None):
+        """Write debug message through the logger (%-style args, default level unless given)"""
+        if self.debug_logger:
+            if level:
+                self.debug_logger.log(message, *args, level=level)
+            else:
+                self.debug_logger.log(message, *args)
+
+    def now(self):
+        """Current time on the capture clock"""
+        return self.clock() if self.clock else time.time()
+
+    def estimate(self, now=None):
+        """Get (value, uncertainty) in HP, or (None, None) without readings"""
+        if not self.readings:
+            return None, None
+
+        now = now if now is not None else self.now()
+        median = statistics.median(self.readings)
+        mad = statistics.median(abs(v - median) for v in self.readings)
+
+        uncertainty = self.MAD_SCALE * mad + self.STALE_GROWTH * self.config.max_hp * (now - self.last_update)
+        return median, uncertainty
+
+    def plausibility(self, value, now=None):
+        """Score a reading from 1.0 (matches the estimate) to 0.0 (impossible jump)"""
+        estimate, uncertainty = self.estimate(now)
+        if estimate is None:
+            return 1.0
+
+        allowed = self.config.dramatic_drop_threshold * self.config.max_hp + 2 * uncertainty
+        return max(0.0, 1.0 - abs(value - estimate) / allowed)
+
+    def is_consistent(self, value):
+        """Check if a reading agrees with a confident estimate (OCR may stop early)"""
+        if not self.enabled or len(self.readings) < self.MIN_READINGS:
+            return False
+
+        estimate, uncertainty = self.estimate()
+        tolerance = self.config.estimator_tolerance * self.config.max_hp
+        return uncertainty <= tolerance and abs(value - estimate) <= tolerance
+
+    def update(self, value, now=None):
+        """Feed a reading and get the value to act on
+
+        Plausible readings are accepted and returned as-is, so healing reacts
+        without filter lag. An implausible jump returns the current estimate
+        until the next reading confirms it.
+        """
+        if not self.enabled or value is None:
+            return value
+
+        now = now if now is not None else self.now()
+        score = self.plausibility(value, now)
+
+        if score > 0.0:
+            self._accept(value, now)
+            return value
+
+        if self._confirms_pending(value, now):
+            self.confirmed_jumps += 1
+            self.debug_log("ESTIMATE: Jump to %s confirmed by consecutive readings", value, level='info')
+            pending_value = self.pending[1]
+            self.readings.clear()
+            self._accept(pending_value, now)
+            self._accept(value, now)
+            return value
+
+        estimate, uncertainty = self.estimate(now)
+        self.pending = (now, value)
+        self.rejected += 1
+        self.debug_log("ESTIMATE: Rejected %s (plausibility %.2f, estimate %.0f ± %.0f) - awaiting confirmation", value, score, estimate, uncertainty, level='info')
+        return int(round(estimate))
+
+    def _confirms_pending(self, value, now):
+        """Check if a reading repeats the held-back jump in time"""
+        if self.pending is None:
+            return False
+
+        pending_time, pending_value = self.pending
+        if now - pending_time > self.config.critical_confirmation_time:
+            return False
+        return abs(value - pending_value) <= self.config.dramatic_drop_threshold * self.config.max_hp / 2
+
+    def _accept(self, value, now):
+        self.readings.append(value)
+        self.last_update = now
+        self.pending = None
+        self.accepted += 1
+
+    def get_stats(self):
+        """Get estimator statistics"""
+        estimate, uncertainty = self.estimate()
+        return {
+            'estimate': estimate,
+            'uncertainty': uncertainty,
+            'accepted': self.accepted,
+            'rejected': self.rejected,
+            'confirmed_jumps': self.confirmed_jumps
+        }
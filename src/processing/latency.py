@@ -0,0 +1,143 @@
+"""
+Latency - Per-stage timing histograms for the monitoring pipeline
+
+Each pipeline stage (capture, threshold, tesseract, parse, decision, key
+press, ...) records its duration with a monotonic clock into a histogram with
+fixed log-spaced buckets. Recording is a bisect and a counter increment, so
+it stays cheap enough for every OCR call. Percentiles are resolved to the
+bucket upper bound (about 12% resolution) and clamped to the observed max.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Bucket upper bounds in seconds: 1us to ~60s, each 1.25x the previous
+BUCKET_RATIO = 1.25
+BUCKET_BOUNDS = []
+_bound = 1e-6
+while _bound < 60:
+    BUCKET_BOUNDS.append(_bound)
+    _bound *= BUCKET_RATIO
+del _bound
+
+
+def bucket_percentile(counts, fraction):
+    """Get the index of the bucket below which the given fraction of counts fall
+
+    Returns None if there are no counts.
+    """
+    total = sum(counts)
+    if not total:
+        return None
+
+    target = fraction * total
+    seen = 0
+    for index, bucket_count in enumerate(counts):
+        seen += bucket_count
+        if seen >= target and bucket_count:
+            return index
+    return len(counts) - 1
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations in seconds"""
+
+    def __init__(self):
+        # Last bucket catches everything above the largest bound
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        """Add one duration"""
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction):
+        """Get the duration below which the given fraction of samples fall"""
+        index = bucket_percentile(self.counts, fraction)
+        if index is None:
+            return 0.0
+        bound = BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else self.max
+        return min(bound, self.max)
+
+    def snapshot(self):
+        """Get count, mean, p50/p95/p99 and max in milliseconds"""
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'p50_ms': self.percentile(0.50) * 1000,
+            'p95_ms': self.percentile(0.95) * 1000,
+            'p99_ms': self.percentile(0.99) * 1000,
+            'max_ms': self.max * 1000
+        }
+
+
+class LatencyRecorder:
+    """Named histograms for every pipeline stage, shared across threads"""
+
+    def __init__(self):
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        """Record a duration for a stage"""
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = LatencyHistogram()
+            histogram.record(seconds)
+
+    @contextmanager
+    def time(self, stage):
+        """Time the enclosed block as one sample of a stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def bucket_counts(self, stage):
+        """Get a copy of a stage's bucket counts (None if never recorded)
+
+        Differencing two copies gives the histogram of the samples in between.
+        """
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            return list(histogram.counts) if histogram else None
+
+    @staticmethod
+    def percentile_between(previous, current, fraction):
+        """Get the percentile (seconds, bucket bound) of the samples recorded between two bucket_counts copies
+
+        Returns None if no samples were recorded in between.
+        """
+        if not current:
+            return None
+        previous = previous or [0] * len(current)
+        index = bucket_percentile([count - before for count, before in zip(current, previous)], fraction)
+        if index is None:
+            return None
+        return BUCKET_BOUNDS[min(index, len(BUCKET_BOUNDS) - 1)]
+
+    def snapshot(self):
+        """Get {stage: histogram snapshot} for every recorded stage"""
+        with self._lock:
+            return {stage: histogram.snapshot() for stage, histogram in self.histograms.items()}
+
+    def format_summary(self):
+        """Get one aligned text line per stage, slowest p99 first"""
+        snapshot = self.snapshot()
+        lines = []
+        for stage in sorted(snapshot, key=lambda s: snapshot[s]['p99_ms'], reverse=True):
+            s = snapshot[stage]
+            lines.append(f"{stage:<12} n={s['count']:<6} p50={s['p50_ms']:8.2f}ms p95={s['p95_ms']:8.2f}ms "
+                         f"p99={s['p99_ms']:8.2f}ms max={s['max_ms']:8.2f}ms")
+        return lines
@@ -0,0 +1,50 @@
+"""
+Montage - Batch OCR variants into a single Tesseract pass
+
+Every preprocessed variant of a region is stacked into one tall image with
+blank separator bands between rows. One Tesseract call returns word boxes for
+the whole montage, and each word is mapped back to its variant by the row it
+falls in.
+"""
+
+import bisect
+import numpy as np
+
+
+def build_montage(images, gap=16, background=255):
+    """Stack grayscale images vertically with separator bands
+
+    Returns (montage, rows) where rows holds the (top, bottom) pixel range of
+    every image in the montage.
+    """
+    width = max(img.shape[1] for img in images) + 2 * gap
+    height = sum(img.shape[0] for img in images) + gap * (len(images) + 1)
+    montage = np.full((height, width), background, dtype=np.uint8)
+
+    rows = []
+    top = gap
+    for img in images:
+        img_height, img_width = img.shape[:2]
+        montage[top:top + img_height, gap:gap + img_width] = img
+        rows.append((top, top + img_height))
+        top += img_height + gap
+
+    return montage, rows
+
+
+def split_words_by_row(words, rows):
+    """Group word boxes by montage row
+
+    Returns one text string per row - the row's words joined left to right.
+    Words whose centre falls in a separator band are dropped.
+    """
+    tops = [top for top, _ in rows]
+    row_words = [[] for _ in rows]
+
+    for word in words:
+        center = word['top'] + word['height'] / 2
+        index = bisect.bisect_right(tops, center) - 1
+        if index >= 0 and center < rows[index][1]:
+            row_words[index].append((word['left'], word['text']))
+
+    return [' '.join(text for _, text in sorted(entries)) for entries in row_words]
@@ -0,0 +1,194 @@
+"""
+OCR Benchmark - Offline accuracy and throughput over a labeled frame corpus
+
+A corpus is a directory of captured HP region images (.png, .jpg, .bmp or
+.npy). Each image's true value comes from labels.json ({filename: value})
+when present, otherwise from the leading digits of its filename, e.g.
+"1211_full.png" or "0864-hit.npy".
+
+Every strategy runs on a fresh OCRProcessor so that learned state (the
+parser's prior, the frame cache, the adaptive variant order) never leaks
+between frames or strategies, and on fresh Frames so that each one pays for
+its own grayscale and threshold conversions. The digit recognizer is off for the Tesseract
+strategies, so they measure Tesseract alone and never write the template
+atlas.
+"""
+
+import copy
+import json
+import os
+import re
+import time
+from collections import Counter
+
+import cv2
+import numpy as np
+
+from .ocr_processor import OCRProcessor
+from .ocr_strategy import TIER_BEST, TIER_FULL, TIER_FALLBACK
+from .frame import Frame
+from .latency import LatencyHistogram
+
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.npy')
+LABELS_FILE = 'labels.json'
+
+# Confusion pairs listed per strategy in the report
+MAX_CONFUSIONS = 10
+
+
+def _read_fast(ocr, frame):
+    """Cheapest tier: the best variant of the two best methods"""
+    return ocr.extract_number_from_region(frame.region, 'hp', frame, TIER_BEST)
+
+
+def _read_cascade(ocr, frame):
+    """Every fast variant until two methods agree"""
+    return ocr.extract_number_from_region(frame.region, 'hp', frame, TIER_FULL)
+
+
+def _read_fallback(ocr, frame):
+    """Full cascade plus the fallback strategies"""
+    return ocr._extract_with_fallback(frame.region, 'hp', frame, TIER_FALLBACK)
+
+
+def _read_template(ocr, frame):
+    """Digit template matching only - no Tesseract"""
+    value = ocr.digit_recognizer.recognize_confident(frame.gray())
+    return value if ocr.is_valid_reading(value) else None
+
+
+# name -> (config overrides, reader)
+STRATEGIES = {
+    'template': ({'use_digit_recognizer': True}, _read_template),
+    'fast': ({}, _read_fast),
+    'cascade': ({}, _read_cascade),
+    'parallel': ({'ocr_execution': 'parallel'}, _read_cascade),
+    'batch': ({'ocr_execution': 'batch'}, _read_cascade),
+    'fallback': ({}, _read_fallback),
+}
+
+
+def load_corpus(directory):
+    """Load labeled frames as [(filename, Frame, true value)], sorted by name"""
+    labels = {}
+    labels_path = os.path.join(directory, LABELS_FILE)
+    if os.path.exists(labels_path):
+        with open(labels_path, 'r') as f:
+            labels = json.load(f)
+
+    corpus = []
+    for filename in sorted(os.listdir(directory)):
+        if not filename.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+
+        if filename in labels:
+            value = int(labels[filename])
+        else:
+            match = re.match(r'(\d+)', filename)
+            if not match:
+                continue
+            value = int(match.group(1))
+
+        path = os.path.join(directory, filename)
+        if filename.endswith('.npy'):
+            pixels = np.load(path)
+        else:
+            pixels = cv2.imread(path, cv2.IMREAD_COLOR)
+        if pixels is None:
+            raise RuntimeError(f"Cannot read corpus frame '{path}'")
+
+        height, width = pixels.shape[:2]
+        corpus.append((filename, Frame(pixels, (0, 0, width, height)), value))
+    return corpus
+
+
+def benchmark_strategy(config, corpus, name, debug_logger=None):
+    """Run one strategy over the corpus and return its report entry"""
+    overrides, reader = STRATEGIES[name]
+
+    strategy_config = copy.copy(config)
+    strategy_config.use_digit_recognizer = False
+    strategy_config.use_frame_cache = False
+    strategy_config.adaptive_ocr = False
+    strategy_config.ocr_stats_file = None
+    for key, value in overrides.items():
+        setattr(strategy_config, key, value)
+
+    ocr = OCRProcessor(strategy_config, debug_logger)
+    try:
+        if name == 'template' and not ocr.digit_recognizer.has_atlas():
+            return {'skipped': 'no digit atlas'}
+
+        timings = LatencyHistogram()
+        confusions = Counter()
+        correct = 0
+        failures = []
+
+        for filename, corpus_frame, expected in corpus:
+            ocr.last_values.clear()
+            # Frames memoize their conversions - a shared one would make later strategies look faster
+            frame = Frame(corpus_frame.pixels, corpus_frame.region, corpus_frame.timestamp)
+            start = time.perf_counter()
+            value = reader(ocr, frame)
+            timings.record(time.perf_counter() - start)
+
+            if value == expected:
+                correct += 1
+            else:
+                confusions[(expected, value)] += 1
+                failures.append({'file': filename, 'expected': expected, 'read': value})
+
+        frames = len(corpus)
+        timing = timings.snapshot()
+        return {
+            'frames': frames,
+            'correct': correct,
+            'accuracy': correct / frames if frames else 0.0,
+            'misses': sum(count for (_, read), count in confusions.items() if read is None),
+            'confusions': [
+                {'expected': expected, 'read': read, 'count': count}
+                for (expected, read), count in confusions.most_common(MAX_CONFUSIONS)
+            ],
+            'failures': failures,
+            'tesseract_calls': ocr.tesseract.call_count,
+            'calls_per_frame': ocr.tesseract.call_count / frames if frames else 0.0,
+            'fps': frames / timings.total if timings.total else 0.0,
+            'mean_ms': timing['mean_ms'],
+            'p50_ms': timing['p50_ms'],
+            'p95_ms': timing['p95_ms'],
+            'max_ms': timing['max_ms']
+        }
+    finally:
+        ocr.close()
+
+
+def run_benchmark(config, corpus, strategies=None, debug_logger=None):
+    """Benchmark the given strategies (all by default) as a JSON-ready dict"""
+    strategies = strategies or list(STRATEGIES)
+    unknown = [name for name in strategies if name not in STRATEGIES]
+    if unknown:
+        raise ValueError(f"Unknown OCR strategies: {', '.join(unknown)}")
+
+    return {
+        'timestamp': time.time(),
+        'frames': len(corpus),
+        'max_hp': config.max_hp,
+        'tesseract_backend': config.tesseract_backend,
+        'strategies': {
+            name: benchmark_strategy(config, corpus, name, debug_logger)
+            for name in strategies
+        }
+    }
+
+
+def format_report(report):
+    """Get one aligned text line per strategy"""
+    lines = []
+    for name, result in report['strategies'].items():
+        if 'skipped' in result:
+            lines.append(f"{name:<10} skipped ({result['skipped']})")
+            continue
+        lines.append(f"{name:<10} accuracy={result['accuracy']*100:6.1f}% calls/frame={result['calls_per_frame']:6.1f} "
+                     f"fps={result['fps']:7.1f} p95={result['p95_ms']:8.2f}ms misses={result['misses']}")
+    return lines
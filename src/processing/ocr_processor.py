@@ -1,248 +1,536 @@
 import cv2
-import numpy as np
-import pytesseract
-import pyautogui
 import re
-import datetime
+import time
+import threading
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from .digit_recognizer import DigitRecognizer
+from .tesseract_engine import TesseractEngine
+from .frame_cache import FrameCache
+from .ocr_strategy import OCRStrategy, TIER_FULL, TIER_FALLBACK
+from .montage import build_montage, split_words_by_row
+from .screen_capture import PyAutoGUICapture
+from .frame import Frame
+from .health_parser import HealthParser
+from .deadline import Deadline
+from .latency import LatencyRecorder
 
 
 class OCRProcessor:
-    def __init__(self, config, debug_logger=None):
+    # Primary cascade: every threshold method at every fast scale and PSM
+    THRESHOLD_METHODS = ["OTSU", "InvOTSU", "LowContrast", "HighContrast", "Adaptive"]
+    FAST_SCALES = [3, 5, 8]
+    FAST_CONFIGS = [
+        '--psm 8 -c tesseract_char_whitelist=0123456789',
+        '--psm 7 -c tesseract_char_whitelist=0123456789',
+        '--psm 6 -c tesseract_char_whitelist=0123456789'
+    ]
+    
+    # Batch mode: all variants stacked into one montage, one line per variant
+    BATCH_CONFIG = '--psm 6 -c tesseract_char_whitelist=0123456789'
+    MONTAGE_GAP = 16
+    
+    # Lowest reading the template and Tesseract passes accept
+    MIN_READING = 100
+    
+    def __init__(self, config, debug_logger=None, screen_capture=None, latency=None):
         self.config = config
         self.debug_logger = debug_logger
         
-    def debug_log(self, message):
-        """Write debug message through the logger"""
-        if self.debug_logger:
-            self.debug_logger.log(message)
-    
-    def parse_health_value(self, text, value_type="unknown"):
-        """Parse health value from OCR text - handles corrupted OCR readings"""
-        if not text:
-            return None
-            
-        self.debug_log(f"PARSE {value_type.upper()}: Raw OCR text: '{text}'")
+        # Per-stage timing histograms (shared with the rest of the pipeline when injected)
+        self.latency = latency or LatencyRecorder()
         
-        # Pattern 1: Simple number with word boundaries (preferred)
-        simple_match = re.search(r'\b(\d{3,4})\b', text)
-        if simple_match:
-            result = int(simple_match.group(1))
-            self.debug_log(f"PARSE {value_type.upper()}: Found bounded number: {result}")
-            return result
+        # Capture backend shared with the rest of the helper (pyautogui by default)
+        self.screen_capture = screen_capture or PyAutoGUICapture(debug_logger)
         
-        # Pattern 2: Any sequence of 3-4 digits (fallback)
-        digit_match = re.search(r'(\d{3,4})', text)
-        if digit_match:
-            result = int(digit_match.group(1))
-            self.debug_log(f"PARSE {value_type.upper()}: Found digit sequence: {result}")
-            return result
+        # Tesseract-free recognizer for the fixed HP font (Tesseract is the fallback)
+        self.digit_recognizer = None
+        if config.use_digit_recognizer:
+            self.digit_recognizer = DigitRecognizer(config, debug_logger)
+        
+        # Scores digit-confusion candidates; the last accepted value only breaks ties
+        self.health_parser = HealthParser(config, debug_logger)
+        self.last_values = {}
+        
+        # Temporal estimators per value type - a consistent first vote ends OCR early
+        self.estimators = {}
         
-        # Pattern 3: Handle corrupted OCR - look for numbers with letters mixed in
-        corrupted_patterns = [
-            (r'[SB](\d{2,3})', r'8\1'),  # S64 -> 864, B72 -> 872
-            (r'(\d+)\s+(\d+)', r'\1\2'),  # 86 4 -> 864
-            (r'[O](\d{2,3})', r'0\1'),   # O64 -> 064
-            (r'[Gg](\d{2,3})', r'6\1'),  # G64 -> 664
-            (r'[lI](\d{2,3})', r'1\1'),  # l64 -> 164, I64 -> 164
-            (r'(\d{2,3})[lI]', r'\1'),   # 64l -> 64, 64I -> 64
+        # One Tesseract handle kept alive for the whole session
+        self.tesseract = TesseractEngine(config, debug_logger)
+        
+        # Skips OCR when the region pixels are identical to the previous frame
+        self.frame_cache = FrameCache() if config.use_frame_cache else None
+        
+        # Learns which variants work and escalates effort after failures
+        self.strategy = OCRStrategy(config, debug_logger)
+        self.variants = [
+            (method, scale, ocr_config)
+            for method in self.THRESHOLD_METHODS
+            for scale in self.FAST_SCALES
+            for ocr_config in self.FAST_CONFIGS
         ]
         
-        for pattern, replacement in corrupted_patterns:
-            try:
-                fixed_text = re.sub(pattern, replacement, text)
-                if fixed_text != text:
-                    self.debug_log(f"PARSE {value_type.upper()}: Applied fix '{pattern}' -> '{fixed_text}'")
-                    digit_match = re.search(r'(\d{3,4})', fixed_text)
-                    if digit_match:
-                        result = int(digit_match.group(1))
-                        max_value = self.config.max_hp
-                        if 1 <= result <= max_value:
-                            self.debug_log(f"PARSE {value_type.upper()}: Fixed corrupted text to: {result}")
-                            return result
-            except:
-                continue
-        
-        # Pattern 4: Any digits (last resort - take the largest)
-        all_numbers = re.findall(r'\d+', text)
-        if all_numbers:
-            numbers = [int(num) for num in all_numbers if 100 <= int(num) <= self.config.max_hp]
-            if numbers:
-                result = max(numbers)
-                self.debug_log(f"PARSE {value_type.upper()}: Found largest valid number: {result}")
-                return result
-            
-        self.debug_log(f"PARSE {value_type.upper()}: No valid patterns found")
-        return None
+        # Optional worker pool - variants are independent, CPU-bound Tesseract calls
+        self.executor = None
+        if config.ocr_execution == 'parallel':
+            self.executor = ThreadPoolExecutor(max_workers=config.ocr_workers, thread_name_prefix='ocr')
+        
+        # Deadline statistics for extract_number_with_budget
+        self.budget_calls = 0
+        self.budget_truncated = 0
+        self.budget_overruns = 0
+        
+        # Read statistics (plain counters, sampled by the overlay performance HUD)
+        self.ocr_reads = 0
+        self.ocr_successes = 0
+        self.fallback_runs = 0
+        
+    def debug_log(self, message, *args, level=None):
+        """Write debug message through the logger (%-style args, default level unless given)"""
+        if self.debug_logger:
+            if level:
+                self.debug_logger.log(message, *args, level=level)
+            else:
+                self.debug_logger.log(message, *args)
     
-    def extract_number_from_region(self, region, value_type="unknown"):
-        """Extract number from screen region using OCR"""
+    def parse_health_value(self, text, value_type="unknown"):
+        """Parse health value from OCR text - handles corrupted OCR readings"""
+        return self.health_parser.parse(text, value_type, self.last_values.get(value_type))
+    
+    def is_valid_reading(self, value):
+        """Check a template or Tesseract reading against the accepted range"""
+        return value is not None and self.MIN_READING <= value <= self.config.max_hp
+    
+    def register_estimator(self, value_type, estimator):
+        """Let OCR of value_type stop at the first reading the estimator agrees with"""
+        self.estimators[value_type] = estimator
+    
+    def _consistent(self, value_type, value):
+        """Check a single vote against the value type's estimator"""
+        estimator = self.estimators.get(value_type)
+        return estimator is not None and estimator.is_consistent(value)
+    
+    def capture_region(self, region):
+        """Capture a screen region as a BGR(A) image"""
+        return self.screen_capture.grab(region)
+    
+    def capture_frame(self, region):
+        """Capture a screen region as a Frame shared by every OCR pass"""
+        return Frame(self.capture_region(region), region)
+    
+    def capture_frames(self, regions):
+        """Capture named regions with a single grab as {name: Frame}"""
+        timestamp = self.screen_capture.now()
+        return {
+            name: Frame(pixels, regions[name], timestamp)
+            for name, pixels in self.screen_capture.grab_regions(regions).items()
+        }
+    
+    def extract_number_from_region(self, region, value_type="unknown", frame=None, tier=TIER_FULL, deadline=None):
+        """Extract number from screen region using OCR (frame skips the capture)
+        
+        With a deadline, variants are only started while budget remains; a
+        truncated run returns its best single vote, if any.
+        """
         if not region:
-            self.debug_log(f"OCR {value_type.upper()}: No region defined")
+            self.debug_log("OCR %s: No region defined", value_type.upper())
             return None
             
-        self.debug_log(f"OCR {value_type.upper()}: Starting extraction from region {region}")
+        self.debug_log("OCR %s: Starting extraction from region %s", value_type.upper(), region, level='trace')
+        deadline = deadline or Deadline(None)
         
         try:
-            screenshot = pyautogui.screenshot(region=region)
-            img = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+            if frame is None:
+                frame = self.capture_frame(region)
+            with self.latency.time('grayscale'):
+                gray = frame.gray()
             
-            methods = [
-                ("OTSU", cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]),
-                ("InvOTSU", cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)[1]),
-                ("LowContrast", cv2.threshold(gray, 100, 255, cv2.THRESH_BINARY)[1]),
-                ("HighContrast", cv2.threshold(gray, 180, 255, cv2.THRESH_BINARY)[1]),
-                ("Adaptive", cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2))
-            ]
+            if self.digit_recognizer:
+                with self.latency.time('template'):
+                    result = self.digit_recognizer.recognize_confident(gray)
+                if self.is_valid_reading(result):
+                    self.debug_log("OCR %s: Template match SUCCESS: %s", value_type.upper(), result)
+                    return result
+            
+            plan = self.strategy.plan(self.variants, tier)
+            self.debug_log("OCR %s: Effort tier %s, %s variants", value_type.upper(), tier, sum(len(v) for _, v in plan), level='trace')
             
-            valid_results = []
-            all_results = []
+            if self.config.ocr_execution == 'batch':
+                valid_results, attempts = self._run_plan_batch(frame, plan, value_type, deadline)
+            elif self.executor:
+                valid_results, attempts = self._run_plan_parallel(frame, plan, value_type, deadline)
+            else:
+                valid_results, attempts = self._run_plan_sequential(frame, plan, value_type, deadline)
             
-            for method_name, thresh in methods:
-                result = self._ocr_from_image(thresh, fast_mode=True, value_type=value_type)
+            final_result = None
+            if len(valid_results) >= 2:
+                counts = Counter(valid_results)
+                final_result, votes = counts.most_common(1)[0]
+                self.debug_log("OCR %s: Multiple valid results, returning most common: %s", value_type.upper(), final_result)
                 
-                max_value = self.config.max_hp
-                if result is not None and 1 <= result <= max_value:
-                    valid_results.append(result)
-                    self.debug_log(f"OCR {value_type.upper()}: {method_name} method SUCCESS: {result}")
-                    
-                    if len(valid_results) >= 2:
-                        counts = Counter(valid_results)
-                        most_common = counts.most_common(1)[0][0]
-                        self.debug_log(f"OCR {value_type.upper()}: Multiple valid results, returning most common: {most_common}")
-                        return most_common
-                elif result is not None:
-                    all_results.append(result)
-                    
-            if valid_results:
-                result = valid_results[0]
-                self.debug_log(f"OCR {value_type.upper()}: Single valid result: {result}")
-                return result
+                # Only teach the template atlas from readings two methods agree on
+                if votes >= 2 and self.digit_recognizer:
+                    self.digit_recognizer.learn(gray, final_result)
+            elif valid_results:
+                final_result = valid_results[0]
+                self.debug_log("OCR %s: Single valid result: %s", value_type.upper(), final_result)
             
-            if all_results:
-                if value_type == "hp":
-                    valid_results = [r for r in all_results if 100 <= r <= self.config.max_hp]
-                    if valid_results:
-                        counts = Counter(valid_results)
-                        final_result = counts.most_common(1)[0][0]
-                        self.debug_log(f"OCR {value_type.upper()}: Final result selected: {final_result}")
-                        return final_result
+            self.strategy.record(attempts, final_result)
             
-            self.debug_log(f"OCR {value_type.upper()}: No valid results found")
+            if final_result is not None:
+                return final_result
+            
+            self.debug_log("OCR %s: No valid results found", value_type.upper())
                     
         except Exception as e:
-            self.debug_log(f"OCR {value_type.upper()}: Exception occurred: {str(e)}")
+            self.debug_log("OCR %s: Exception occurred: %s", value_type.upper(), e, level='warn')
         
         return None
     
-    def _ocr_from_image(self, thresh, fast_mode=False, value_type="unknown"):
-        """Enhanced OCR with better text extraction and parsing"""
-        all_texts = []
+    def _run_plan_sequential(self, frame, plan, value_type, deadline):
+        """Run variants one after another until two methods produced a value
         
-        try:
-            if fast_mode:
-                scale_factors = [3, 5, 8]
-                configs = [
-                    '--psm 8 -c tesseract_char_whitelist=0123456789',
-                    '--psm 7 -c tesseract_char_whitelist=0123456789',
-                    '--psm 6 -c tesseract_char_whitelist=0123456789'
-                ]
-            else:
-                scale_factors = [5, 8, 10]
-                configs = [
-                    '--psm 8 -c tesseract_char_whitelist=0123456789',
-                    '--psm 7 -c tesseract_char_whitelist=0123456789',
-                    '--psm 6 -c tesseract_char_whitelist=0123456789',
-                    '--psm 13 -c tesseract_char_whitelist=0123456789'
-                ]
+        Returns (valid_results, attempts) - one valid result per method in
+        plan order, and (variant_key, value, seconds) for every OCR call.
+        """
+        valid_results = []
+        attempts = []
+        
+        for method_name, method_variants in plan:
+            if deadline.expired():
+                break
+            thresh = frame.threshold(method_name, self._threshold)
             
-            height, width = thresh.shape
+            # First successful variant of a method is that method's vote
+            result = None
+            for scale, config in method_variants:
+                if deadline.expired():
+                    break
+                start = time.perf_counter()
+                result = self._run_variant(thresh, scale, config, value_type)
+                attempts.append((self.strategy.variant_key(method_name, scale, config), result, time.perf_counter() - start))
+                if result is not None:
+                    break
             
-            for scale_factor in scale_factors:
-                scaled = cv2.resize(thresh, (width * scale_factor, height * scale_factor), interpolation=cv2.INTER_CUBIC)
+            if result is not None:
+                valid_results.append(result)
+                self.debug_log("OCR %s: %s method SUCCESS: %s", value_type.upper(), method_name, result, level='trace')
+                if len(valid_results) >= 2:
+                    break
+                if self._consistent(value_type, result):
+                    self.debug_log("OCR %s: %s consistent with estimate - stopping early", value_type.upper(), result)
+                    break
+        
+        return valid_results, attempts
+    
+    def _run_plan_parallel(self, frame, plan, value_type, deadline):
+        """Run all variants on the worker pool and stop at the first consensus
+        
+        As soon as two methods agree on a value, or the deadline passes, the
+        remaining variants are cancelled. Returns the same (valid_results,
+        attempts) as the sequential runner.
+        """
+        cancel = threading.Event()
+        futures = {}
+        
+        for method_index, (method_name, method_variants) in enumerate(plan):
+            thresh = frame.threshold(method_name, self._threshold)
+            for scale, config in method_variants:
+                future = self.executor.submit(self._timed_variant, thresh, scale, config, value_type, cancel)
+                futures[future] = (method_index, method_name, scale, config)
+        
+        method_votes = {}
+        attempts = []
+        
+        try:
+            for future in as_completed(futures, timeout=deadline.remaining()):
+                method_index, method_name, scale, config = futures[future]
+                result, seconds = future.result()
+                if seconds is None:
+                    continue  # Cancelled before it ran
+                attempts.append((self.strategy.variant_key(method_name, scale, config), result, seconds))
                 
-                if not fast_mode:
-                    kernel = np.ones((2,2), np.uint8)
-                    cleaned = cv2.morphologyEx(scaled, cv2.MORPH_CLOSE, kernel)
-                    cleaned = cv2.morphologyEx(cleaned, cv2.MORPH_OPEN, kernel)
-                    cleaned = cv2.GaussianBlur(cleaned, (3, 3), 0)
-                else:
-                    cleaned = scaled
+                # First successful variant of a method is that method's vote
+                if result is None or method_index in method_votes:
+                    continue
+                method_votes[method_index] = result
+                self.debug_log("OCR %s: %s method SUCCESS: %s", value_type.upper(), method_name, result, level='trace')
                 
-                for config in configs:
-                    try:
-                        text = pytesseract.image_to_string(cleaned, config=config).strip()
-                        if text and len(text) > 0:
-                            all_texts.append(text)
-                            self.debug_log(f"OCR {value_type.upper()}: Scale {scale_factor}, Config {config.split()[0]}: '{text}'")
-                            
-                            parsed_value = self.parse_health_value(text, value_type)
-                            if parsed_value and 100 <= parsed_value <= self.config.max_hp:
-                                self.debug_log(f"OCR {value_type.upper()}: SUCCESS - Found valid value {parsed_value}")
-                                return parsed_value
-                    except Exception as e:
-                        self.debug_log(f"OCR {value_type.upper()}: Config {config} failed: {str(e)}")
-                        continue
-            
-            self.debug_log(f"OCR {value_type.upper()}: Trying to parse from all texts: {all_texts}")
-            for text in all_texts:
-                parsed_value = self.parse_health_value(text, value_type)
-                if parsed_value and 100 <= parsed_value <= self.config.max_hp:
-                    self.debug_log(f"OCR {value_type.upper()}: FALLBACK SUCCESS - Found valid value {parsed_value}")
-                    return parsed_value
-                    
+                if list(method_votes.values()).count(result) >= 2:
+                    self.debug_log("OCR %s: Consensus on %s - cancelling remaining variants", value_type.upper(), result)
+                    return [result, result], attempts
+                if len(method_votes) == 1 and self._consistent(value_type, result):
+                    self.debug_log("OCR %s: %s consistent with estimate - cancelling remaining variants", value_type.upper(), result)
+                    return [result], attempts
+        except FuturesTimeoutError:
+            deadline.expired()
+            self.debug_log("OCR %s: Deadline reached - cancelling remaining variants", value_type.upper())
+        finally:
+            cancel.set()
+            for future in futures:
+                future.cancel()
+        
+        return [method_votes[i] for i in sorted(method_votes)], attempts
+    
+    def _run_plan_batch(self, frame, plan, value_type, deadline):
+        """Run every (method, scale) variant in a single Tesseract call
+        
+        The scaled variants are stacked into one montage, recognized with one
+        image_to_data pass, and each text line is mapped back to its variant.
+        Returns the same (valid_results, attempts) as the sequential runner.
+        """
+        rows = []
+        seen = set()
+        for method_index, (method_name, method_variants) in enumerate(plan):
+            thresh = frame.threshold(method_name, self._threshold)
+            height, width = thresh.shape
+            for scale, _ in method_variants:
+                if (method_name, scale) in seen:
+                    continue  # PSM variants collapse into one row
+                seen.add((method_name, scale))
+                scaled = cv2.resize(thresh, (width * scale, height * scale), interpolation=cv2.INTER_CUBIC)
+                rows.append((method_index, method_name, scale, scaled))
+        
+        with self.latency.time('montage'):
+            montage, offsets = build_montage([row[3] for row in rows], self.MONTAGE_GAP)
+        if deadline.expired():
+            return [], []
+        
+        start = time.perf_counter()
+        try:
+            words = self.tesseract.image_to_data(montage, config=self.BATCH_CONFIG)
+            self.latency.record('tesseract_batch', time.perf_counter() - start)
         except Exception as e:
-            self.debug_log(f"OCR {value_type.upper()}: Exception in _ocr_from_image: {str(e)}")
+            self.debug_log("OCR %s: Batch OCR failed: %s", value_type.upper(), e, level='warn')
+            return [], []
+        seconds = (time.perf_counter() - start) / len(rows)
+        
+        method_votes = {}
+        attempts = []
+        for (method_index, method_name, scale, _), text in zip(rows, split_words_by_row(words, offsets)):
+            result = None
+            if text:
+                self.debug_log("OCR %s: Batch row %s x%s: '%s'", value_type.upper(), method_name, scale, text, level='trace')
+                parsed_value = self.parse_health_value(text, value_type)
+                if self.is_valid_reading(parsed_value):
+                    result = parsed_value
+            attempts.append((self.strategy.variant_key(method_name, scale, self.BATCH_CONFIG), result, seconds))
+            
+            # First successful scale of a method is that method's vote
+            if result is not None and method_index not in method_votes:
+                method_votes[method_index] = result
+                self.debug_log("OCR %s: %s method SUCCESS: %s", value_type.upper(), method_name, result, level='trace')
         
-        self.debug_log(f"OCR {value_type.upper()}: No valid values found from any method")
+        return [method_votes[i] for i in sorted(method_votes)], attempts
+    
+    def _timed_variant(self, thresh, scale_factor, config, value_type, cancel):
+        """Worker task - returns (value, seconds), or (None, None) if cancelled"""
+        if cancel.is_set():
+            return None, None
+        start = time.perf_counter()
+        result = self._run_variant(thresh, scale_factor, config, value_type)
+        return result, time.perf_counter() - start
+    
+    def _threshold(self, gray, method_name):
+        """Apply one of the cascade or fallback threshold methods (timed)"""
+        start = time.perf_counter()
+        thresh = self._apply_threshold(gray, method_name)
+        self.latency.record('threshold', time.perf_counter() - start)
+        return thresh
+    
+    def _apply_threshold(self, gray, method_name):
+        if method_name == "OTSU":
+            return cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
+        if method_name == "InvOTSU":
+            return cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)[1]
+        if method_name == "LowContrast":
+            return cv2.threshold(gray, 100, 255, cv2.THRESH_BINARY)[1]
+        if method_name == "HighContrast":
+            return cv2.threshold(gray, 180, 255, cv2.THRESH_BINARY)[1]
+        if method_name == "Binary":
+            return cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY)[1]
+        if method_name == "InvBinary":
+            return cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY_INV)[1]
+        return cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
+    
+    def _run_variant(self, thresh, scale_factor, config, value_type="unknown"):
+        """OCR a thresholded image at one scale with one tesseract config"""
+        try:
+            start = time.perf_counter()
+            height, width = thresh.shape
+            scaled = cv2.resize(thresh, (width * scale_factor, height * scale_factor), interpolation=cv2.INTER_CUBIC)
+            scaled_at = time.perf_counter()
+            text = self.tesseract.image_to_string(scaled, config=config).strip()
+            self.latency.record('scale', scaled_at - start)
+            self.latency.record('tesseract', time.perf_counter() - scaled_at)
+            if not text:
+                return None
+            
+            self.debug_log("OCR %s: Scale %s, Config '%s': '%s'", value_type.upper(), scale_factor, config, text, level='trace')
+            parse_start = time.perf_counter()
+            parsed_value = self.parse_health_value(text, value_type)
+            self.latency.record('parse', time.perf_counter() - parse_start)
+            if self.is_valid_reading(parsed_value):
+                return parsed_value
+        except Exception as e:
+            self.debug_log("OCR %s: Config %s failed: %s", value_type.upper(), config, e, level='warn')
         return None
     
-    def extract_number_with_fallback(self, region, value_type="unknown"):
-        """Enhanced OCR with fallback strategies for better reliability"""
+    def freeze(self):
+        """Stop learning and saving - the variant order and digit atlas stay as loaded (replays)"""
+        self.strategy.learning = False
+        if self.digit_recognizer:
+            self.digit_recognizer.learning = False
+            self.digit_recognizer.atlas_file = None
+    
+    def extract_number_with_budget(self, region, value_type="unknown", budget=None, consecutive_failures=0, frame=None):
+        """Extract a number within a time budget (seconds)
+        
+        Returns (value, truncated). A truncated result ran out of budget
+        before the cascade finished: value is the best guess so far, or None.
+        """
+        deadline = Deadline(budget)
+        value = self.extract_number_with_fallback(region, value_type, consecutive_failures, frame, deadline)
+        
+        self.budget_calls += 1
+        elapsed = deadline.elapsed()
+        if deadline.truncated:
+            self.budget_truncated += 1
+        if budget is not None and elapsed > budget:
+            self.budget_overruns += 1
+            self.debug_log("BUDGET %s: Overran %.0fms budget by %.1fms (truncated: %s)", value_type.upper(), budget*1000, (elapsed - budget)*1000, deadline.truncated, level='info')
+        elif deadline.truncated:
+            self.debug_log("BUDGET %s: Budget spent after %.1fms - best guess %s", value_type.upper(), elapsed*1000, value)
+        
+        return value, deadline.truncated
+    
+    def get_budget_stats(self):
+        """Get deadline statistics"""
+        return {
+            'calls': self.budget_calls,
+            'truncated': self.budget_truncated,
+            'overruns': self.budget_overruns
+        }
+    
+    def extract_number_with_fallback(self, region, value_type="unknown", consecutive_failures=0, frame=None, deadline=None):
+        """Enhanced OCR with fallback strategies for better reliability
+        
+        consecutive_failures (from HealthMonitor) selects the effort tier: the
+        cheapest variants while reads succeed, the full cascade and fallback
+        strategies only after failures. The frame (captured once per cycle) is
+        reused by every pass; without one the region is captured here.
+        """
         if not region:
-            self.debug_log(f"FALLBACK {value_type.upper()}: No region defined")
+            self.debug_log("FALLBACK %s: No region defined", value_type.upper())
             return None
-            
-        result = self.extract_number_from_region(region, value_type)
+        
+        tier = self.strategy.tier_for(consecutive_failures)
+        self.ocr_reads += 1
+        
+        if frame is None:
+            try:
+                frame = self.capture_frame(region)
+            except Exception as e:
+                self.debug_log("OCR %s: Exception occurred: %s", value_type.upper(), e, level='warn')
+                return None
+        
+        deadline = deadline or Deadline(None)
+        
+        if not self.frame_cache:
+            return self._accept(value_type, self._extract_with_fallback(region, value_type, frame, tier, deadline))
+        
+        checksum = frame.digest()
+        hit, cached_value = self.frame_cache.get(value_type, checksum)
+        if hit:
+            self.debug_log("CACHE %s: Frame unchanged - reusing %s", value_type.upper(), cached_value)
+            if cached_value is not None:
+                self.ocr_successes += 1
+            return cached_value
+        
+        result = self._extract_with_fallback(region, value_type, frame, tier, deadline)
+        
+        # A failure below the top tier must not stop the next cycle from escalating,
+        # and a run cut short by its deadline is never the frame's final answer
+        if (result is not None or tier == TIER_FALLBACK) and not deadline.truncated:
+            self.frame_cache.put(value_type, checksum, result)
+        return self._accept(value_type, result)
+    
+    def _accept(self, value_type, result):
+        """Remember the accepted value as the parser's prior"""
         if result is not None:
-            self.debug_log(f"FALLBACK {value_type.upper()}: Normal OCR succeeded: {result}")
+            self.last_values[value_type] = result
+            self.ocr_successes += 1
+        return result
+    
+    def get_read_stats(self):
+        """Get read statistics (cumulative counts)"""
+        return {
+            'reads': self.ocr_reads,
+            'successes': self.ocr_successes,
+            'fallbacks': self.fallback_runs
+        }
+    
+    def get_cache_stats(self):
+        """Get unchanged-frame cache statistics"""
+        if not self.frame_cache:
+            return {'hits': 0, 'misses': 0, 'hit_rate': 0.0}
+        return self.frame_cache.get_stats()
+    
+    def _extract_with_fallback(self, region, value_type, frame=None, tier=TIER_FALLBACK, deadline=None):
+        """Run normal OCR, then the fallback strategies if it fails"""
+        if frame is None:
+            frame = self.capture_frame(region)
+        deadline = deadline or Deadline(None)
+        
+        result = self.extract_number_from_region(region, value_type, frame, tier, deadline)
+        if result is not None:
+            self.debug_log("FALLBACK %s: Normal OCR succeeded: %s", value_type.upper(), result)
             return result
         
-        self.debug_log(f"FALLBACK {value_type.upper()}: Normal OCR failed, trying fallback strategies")
+        if tier < TIER_FALLBACK:
+            self.debug_log("FALLBACK %s: Skipped at effort tier %s", value_type.upper(), tier)
+            return None
+        
+        if deadline.expired():
+            self.debug_log("FALLBACK %s: Skipped - no budget left", value_type.upper())
+            return None
+        
+        self.debug_log("FALLBACK %s: Normal OCR failed, trying fallback strategies", value_type.upper())
+        self.fallback_runs += 1
         
         try:
-            screenshot = pyautogui.screenshot(region=region)
-            img = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            
+            # Decode the same frame as the primary pass - no second capture
             fallback_methods = [
-                cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY)[1],
-                cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY_INV)[1],
-                gray
+                frame.threshold("Binary", self._threshold),
+                frame.threshold("InvBinary", self._threshold),
+                frame.gray()
             ]
             
             for i, processed_img in enumerate(fallback_methods):
+                if deadline.expired():
+                    return None
                 try:
-                    text = pytesseract.image_to_string(processed_img, config='--psm 8 -c tesseract_char_whitelist=0123456789').strip()
+                    text = self.tesseract.image_to_string(processed_img, config='--psm 8 -c tesseract_char_whitelist=0123456789').strip()
                     if text:
-                        self.debug_log(f"FALLBACK {value_type.upper()}: Method {i+1} raw text: '{text}'")
+                        self.debug_log("FALLBACK %s: Method %s raw text: '%s'", value_type.upper(), i+1, text, level='trace')
                         parsed = self.parse_health_value(text, value_type)
                         max_value = self.config.max_hp
                         if parsed and 1 <= parsed <= max_value:
-                            self.debug_log(f"FALLBACK {value_type.upper()}: Method {i+1} SUCCESS: {parsed}")
+                            self.debug_log("FALLBACK %s: Method %s SUCCESS: %s", value_type.upper(), i+1, parsed)
                             return parsed
                 except Exception as e:
-                    self.debug_log(f"FALLBACK {value_type.upper()}: Method {i+1} failed: {str(e)}")
+                    self.debug_log("FALLBACK %s: Method %s failed: %s", value_type.upper(), i+1, e, level='warn')
                     continue
             
-            self.debug_log(f"FALLBACK {value_type.upper()}: Trying number extraction from corrupted readings")
+            self.debug_log("FALLBACK %s: Trying number extraction from corrupted readings", value_type.upper())
             
             for processed_img in fallback_methods:
+                if deadline.expired():
+                    return None
                 try:
-                    text = pytesseract.image_to_string(processed_img, config='--psm 7').strip()
+                    text = self.tesseract.image_to_string(processed_img, config='--psm 7').strip()
                     if text:
-                        self.debug_log(f"FALLBACK {value_type.upper()}: Corrupted text analysis: '{text}'")
+                        self.debug_log("FALLBACK %s: Corrupted text analysis: '%s'", value_type.upper(), text, level='trace')
                         digit_sequences = re.findall(r'\d+', text)
                         if digit_sequences:
                             for seq in digit_sequences:
@@ -250,13 +538,21 @@ class OCRProcessor:
                                     num = int(seq)
                                     max_value = self.config.max_hp
                                     if 1 <= num <= max_value:
-                                        self.debug_log(f"FALLBACK {value_type.upper()}: Extracted number from corrupted text: {num}")
+                                        self.debug_log("FALLBACK %s: Extracted number from corrupted text: %s", value_type.upper(), num)
                                         return num
                 except Exception as e:
                     continue
                     
         except Exception as e:
-            self.debug_log(f"FALLBACK {value_type.upper()}: Exception in fallback: {str(e)}")
+            self.debug_log("FALLBACK %s: Exception in fallback: %s", value_type.upper(), e, level='warn')
         
-        self.debug_log(f"FALLBACK {value_type.upper()}: All strategies failed")
-        return None 
\ No newline at end of file
+        self.debug_log("FALLBACK %s: All strategies failed", value_type.upper())
+        return None
+    
+    def close(self):
+        """Release OCR engine resources and save learned statistics"""
+        self.strategy.save()
+        if self.executor:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+        self.tesseract.close()
+        self.screen_capture.close()
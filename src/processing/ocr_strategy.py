@@ -0,0 +1,146 @@
+"""
+OCR Strategy - Adaptive variant ordering with an effort escalation ladder
+
+Tracks how often each OCR variant (threshold method, scale, page segmentation
+mode) produced the accepted reading and how long it took, and always tries the
+historically best variants first. Effort escalates with consecutive failures:
+
+- Tier 0 (best):     the best variant of the two best methods
+- Tier 1 (full):     every fast variant, best first
+- Tier 2 (fallback): the full cascade plus the fallback strategies
+
+Learned statistics are saved between sessions.
+"""
+
+import json
+import os
+
+
+TIER_BEST = 0
+TIER_FULL = 1
+TIER_FALLBACK = 2
+
+
+class OCRStrategy:
+    """Orders OCR variants by past success and picks the effort tier"""
+
+    # Methods tried in the cheapest tier
+    BEST_TIER_METHODS = 2
+
+    def __init__(self, config, debug_logger=None):
+        self.config = config
+        self.debug_logger = debug_logger
+        self.enabled = config.adaptive_ocr
+        self.stats_file = config.ocr_stats_file
+
+        # Off for replays - the variant order then stays as loaded
+        self.learning = True
+
+        # variant key -> [attempts, successes, total_seconds]
+        self.stats = {}
+        self.load()
+
+    def debug_log(self, message, *args, level=None):
+        """Write debug message through the logger (%-style args, default level unless given)"""
+        if self.debug_logger:
+            if level:
+                self.debug_logger.log(message, *args, level=level)
+            else:
+                self.debug_logger.log(message, *args)
+
+    @staticmethod
+    def variant_key(method, scale, config):
+        """Stable name for a (method, scale, tesseract config) variant"""
+        psm = config.split()[1]
+        return f"{method}/x{scale}/psm{psm}"
+
+    def tier_for(self, consecutive_failures):
+        """Map the HealthMonitor failure streak onto an effort tier"""
+        if not self.enabled:
+            return TIER_FALLBACK
+        return min(consecutive_failures, TIER_FALLBACK)
+
+    def score(self, key):
+        """Sort key for a variant - success rate first, then lower latency"""
+        attempts, successes, seconds = self.stats.get(key, (0, 0, 0.0))
+
+        # Laplace prior keeps unseen variants at 50% instead of 0%
+        success_rate = (successes + 1) / (attempts + 2)
+        latency = seconds / attempts if attempts else 0.0
+        return success_rate, -latency
+
+    def plan(self, variants, tier=TIER_FULL):
+        """Order variants for a tier
+
+        Variants are (method, scale, config) tuples in their default order.
+        Returns [(method, [(scale, config), ...]), ...], best first.
+        """
+        grouped = {}
+        for method, scale, config in variants:
+            grouped.setdefault(method, []).append((scale, config))
+
+        plan = list(grouped.items())
+        if self.enabled:
+            for method, method_variants in plan:
+                method_variants.sort(key=lambda v: self.score(self.variant_key(method, *v)), reverse=True)
+            # Sorting is stable, so untried methods keep their default order
+            plan.sort(key=lambda item: self.score(self.variant_key(item[0], *item[1][0])), reverse=True)
+
+        if tier == TIER_BEST:
+            return [(method, method_variants[:1]) for method, method_variants in plan[:self.BEST_TIER_METHODS]]
+        return plan
+
+    def record(self, attempts, final_value):
+        """Record attempted variants - success means agreeing with the accepted value"""
+        if not self.enabled or not self.learning:
+            return
+
+        for key, value, seconds in attempts:
+            entry = self.stats.setdefault(key, [0, 0, 0.0])
+            entry[0] += 1
+            if value is not None and value == final_value:
+                entry[1] += 1
+            entry[2] += seconds
+
+    def get_ranking(self, limit=5):
+        """Get the best variants with their success rate and mean latency"""
+        ranked = sorted(self.stats, key=self.score, reverse=True)[:limit]
+        return [
+            {
+                'variant': key,
+                'success_rate': self.stats[key][1] / self.stats[key][0] if self.stats[key][0] else 0.0,
+                'mean_ms': self.stats[key][2] / self.stats[key][0] * 1000 if self.stats[key][0] else 0.0
+            }
+            for key in ranked
+        ]
+
+    def load(self):
+        """Load learned statistics from the stats file"""
+        if not self.enabled or not self.stats_file or not os.path.exists(self.stats_file):
+            return False
+
+        try:
+            with open(self.stats_file, 'r') as f:
+                data = json.load(f)
+            self.stats = {key: [int(v[0]), int(v[1]), float(v[2])] for key, v in data.items()}
+            self.debug_log("STRATEGY: Loaded statistics for %s OCR variants", len(self.stats), level='info')
+            return True
+        except Exception as e:
+            self.debug_log("STRATEGY: Could not load statistics: %s", e, level='warn')
+            return False
+
+    def save(self):
+        """Save learned statistics to the stats file"""
+        if not self.enabled or not self.stats_file or not self.stats:
+            return False
+
+        try:
+            directory = os.path.dirname(self.stats_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.stats_file, 'w') as f:
+                json.dump(self.stats, f, indent=2, sort_keys=True)
+            return True
+        except Exception as e:
+            self.debug_log("STRATEGY: Could not save statistics: %s", e, level='warn')
+            return False
@@ -4,16 +4,22 @@ import os
 
 
 class RegionManager:
-    def __init__(self, config, debug_logger=None, ocr_processor=None):
+    def __init__(self, config, debug_logger=None, ocr_processor=None, hp_bar_reader=None):
         self.config = config
         self.debug_logger = debug_logger
         self.ocr_processor = ocr_processor
+        self.hp_bar_reader = hp_bar_reader
         self.hp_region = None
+        self.hp_bar_region = None
+        self.hp_bar_color = None
         
-    def debug_log(self, message):
-        """Write debug message through the logger"""
+    def debug_log(self, message, *args, level=None):
+        """Write debug message through the logger (%-style args, default level unless given)"""
         if self.debug_logger:
-            self.debug_logger.log(message)
+            if level:
+                self.debug_logger.log(message, *args, level=level)
+            else:
+                self.debug_logger.log(message, *args)
     
     def wait_for_enter(self):
         """Wait for Enter key press"""
@@ -57,8 +63,15 @@ class RegionManager:
         print(f"   💊 {self.config.heal_key.upper()} (Moderate): HP below {thresholds['hp_moderate']} (but above {thresholds['hp_critical']})")
         print()
         
-        self.hp_region = self.select_region("HP")
-        self.debug_log(f"SETUP: HP region selected: {self.hp_region}")
+        if self.config.uses_digits():
+            self.hp_region = self.select_region("HP")
+            self.debug_log("SETUP: HP region selected: %s", self.hp_region, level='info')
+        
+        if self.config.uses_bar():
+            print("\nTIP: For the HP bar, select ONLY the coloured bar and make sure your HP is FULL.")
+            self.hp_bar_region = self.select_region("HP bar")
+            self.debug_log("SETUP: HP bar region selected: %s", self.hp_bar_region, level='info')
+            self.calibrate_hp_bar()
         
         print("\nRegion configured successfully!")
         self.test_regions()
@@ -72,16 +85,40 @@ class RegionManager:
             with open(filename, 'w') as f:
                 if self.hp_region:
                     f.write(f"HP: {self.hp_region}\n")
+                if self.hp_bar_region:
+                    f.write(f"HP_BAR: {self.hp_bar_region}\n")
+                if self.hp_bar_color:
+                    f.write(f"HP_BAR_COLOR: {self.hp_bar_color}\n")
             
             print(f"✅ Region saved to {filename}")
-            self.debug_log(f"SETUP: Region saved to {filename} - HP: {self.hp_region}")
+            self.debug_log("SETUP: Region saved to %s - HP: %s, HP bar: %s", filename, self.hp_region, self.hp_bar_region, level='info')
             
         except Exception as e:
             print(f"❌ Error saving regions: {e}")
-            self.debug_log(f"SETUP: Error saving regions: {e}")
+            self.debug_log("SETUP: Error saving regions: %s", e, level='warn')
+    
+    def calibrate_hp_bar(self):
+        """Sample the HP bar fill colour (HP must be full)"""
+        if not self.ocr_processor or not self.hp_bar_reader:
+            print("⚠️  Warning: Cannot calibrate HP bar without a capture and bar reader")
+            return
+        
+        try:
+            img = self.ocr_processor.capture_region(self.hp_bar_region)
+            self.hp_bar_color = self.hp_bar_reader.calibrate(img)
+            print(f"🎨 HP bar fill colour calibrated: {self.hp_bar_color}")
+        except Exception as e:
+            print(f"❌ Error calibrating HP bar: {e}")
+            self.debug_log("SETUP: Error calibrating HP bar: %s", e, level='warn')
     
     def test_regions(self):
         """Test the configured region"""
+        if self.hp_bar_region and self.hp_bar_reader:
+            self.test_hp_bar()
+        
+        if not self.hp_region:
+            return
+        
         if not self.ocr_processor:
             print("⚠️  Warning: No OCR processor available for testing")
             return
@@ -96,7 +133,7 @@ class RegionManager:
             
             if hp_detected:
                 last_valid_hp = hp_val
-                self.debug_log(f"SETUP: HP detected: {hp_val}")
+                self.debug_log("SETUP: HP detected: %s", hp_val)
             
             detection_status = f"HP: {'✓' if hp_detected else '✗'}"
             print(f"Test {i+1} - HP: {hp_val or 'Not detected'} - Detection: {detection_status}")
@@ -114,6 +151,21 @@ class RegionManager:
             print("2. Ensuring numbers are clearly visible and not blurry")
             print("3. Checking that no UI elements overlap the text")
     
+    def test_hp_bar(self):
+        """Test the configured HP bar region"""
+        print("Testing HP bar...")
+        try:
+            img = self.ocr_processor.capture_region(self.hp_bar_region)
+            percentage = self.hp_bar_reader.read_percentage(img)
+        except Exception as e:
+            print(f"❌ Error reading HP bar: {e}")
+            return
+        
+        if percentage:
+            print(f"✅ HP bar is working! Current fill: {percentage*100:.1f}%")
+        else:
+            print("⚠️  Warning: HP bar fill not detected - recalibrate with full HP")
+    
     def load_saved_regions(self, filename="regions.txt"):
         """Load regions from file"""
         if not os.path.exists(filename):
@@ -128,10 +180,19 @@ class RegionManager:
                         region = eval(region_str.strip())
                         saved_regions[name] = region
             
-            if 'HP' in saved_regions:
-                self.hp_region = saved_regions['HP']
+            self.hp_region = saved_regions.get('HP')
+            self.hp_bar_region = saved_regions.get('HP_BAR')
+            self.hp_bar_color = saved_regions.get('HP_BAR_COLOR')
+            
+            # An explicit colour in config.json wins over the calibrated one
+            if self.hp_bar_reader and self.hp_bar_color and not self.hp_bar_reader.is_calibrated():
+                self.hp_bar_reader.set_fill_color(self.hp_bar_color)
+            
+            has_digits = self.hp_region or not self.config.uses_digits()
+            has_bar = self.hp_bar_region or not self.config.uses_bar()
+            if has_digits and has_bar:
                 print("✅ Loaded saved region!")
-                print(f"📍 Using saved region: HP{self.hp_region}")
+                print(f"📍 Using saved region: HP{self.hp_region} HP bar{self.hp_bar_region}")
                 return True
         except Exception as e:
             print(f"❌ Error loading saved regions: {e}")
@@ -141,5 +202,6 @@ class RegionManager:
     def get_regions(self):
         """Get current region as dictionary"""
         return {
-            'hp': self.hp_region
+            'hp': self.hp_region,
+            'hp_bar': self.hp_bar_region
         } 
\ No newline at end of file
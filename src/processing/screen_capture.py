@@ -0,0 +1,417 @@
+"""
+Screen Capture - Pluggable low-overhead capture backends
+
+pyautogui builds a PIL image for every screenshot, which is then copied into
+NumPy and colour-converted. These backends keep a persistent connection (and,
+for MIT-SHM, a shared-memory segment) and return NumPy frames directly.
+
+Frames are BGR or BGRA uint8 arrays (OpenCV channel order). Backends that
+return views into a persistent buffer overwrite them on the next grab, so a
+frame must be used or copied before the next capture.
+
+Backends:
+- pyautogui: the original screenshot path (always available)
+- mss: persistent mss instance, frame is a view of the raw BGRA buffer
+- xshm: X11 MIT-SHM on Linux, frame is a view of the shared-memory segment
+- file: crops regions out of an image file (synthetic frames for tests)
+- replay: serves the frames of a recorded cycle (see frame_recorder.py)
+"""
+
+import ctypes
+import ctypes.util
+import sys
+import threading
+import time
+import cv2
+import numpy as np
+import pyautogui
+
+try:
+    import mss
+except ImportError:
+    mss = None
+
+
+def union_region(regions):
+    """Smallest (left, top, width, height) region covering all regions"""
+    left = min(r[0] for r in regions)
+    top = min(r[1] for r in regions)
+    right = max(r[0] + r[2] for r in regions)
+    bottom = max(r[1] + r[3] for r in regions)
+    return left, top, right - left, bottom - top
+
+
+def to_gray(img):
+    """Convert a BGR or BGRA frame to grayscale"""
+    if img.ndim == 2:
+        return img
+    if img.shape[2] == 4:
+        return cv2.cvtColor(img, cv2.COLOR_BGRA2GRAY)
+    return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+
+class ScreenCapture:
+    """Base class - times every grab so capture latency can be reported"""
+
+    name = 'base'
+
+    # Regions are grabbed separately when their union is mostly unused screen
+    MAX_UNION_AREA_RATIO = 8
+
+    def __init__(self, debug_logger=None):
+        self.debug_logger = debug_logger
+
+        # Statistics
+        self.grab_count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def debug_log(self, message, *args, level=None):
+        """Write debug message through the logger (%-style args, default level unless given)"""
+        if self.debug_logger:
+            if level:
+                self.debug_logger.log(message, *args, level=level)
+            else:
+                self.debug_logger.log(message, *args)
+
+    def grab(self, region):
+        """Capture a (left, top, width, height) region as a BGR(A) array"""
+        start = time.perf_counter()
+        frame = self._grab(region)
+        elapsed = time.perf_counter() - start
+
+        self.grab_count += 1
+        self.total_seconds += elapsed
+        if elapsed > self.max_seconds:
+            self.max_seconds = elapsed
+        return frame
+
+    def _grab(self, region):
+        raise NotImplementedError
+
+    def now(self):
+        """Capture time for frames grabbed now"""
+        return time.time()
+
+    def grab_regions(self, regions):
+        """Capture several named regions with one grab of their bounding box
+
+        Returns {name: frame}, every frame a zero-copy slice of the single
+        grab, so the capture cost does not grow with the number of regions.
+        """
+        regions = {name: region for name, region in regions.items() if region}
+        if not regions:
+            return {}
+
+        union = union_region(regions.values())
+        area = sum(r[2] * r[3] for r in regions.values())
+        if len(regions) == 1 or union[2] * union[3] > area * self.MAX_UNION_AREA_RATIO:
+            return {name: self.grab(region) for name, region in regions.items()}
+
+        screen = self.grab(union)
+        return {
+            name: screen[top - union[1]:top - union[1] + height, left - union[0]:left - union[0] + width]
+            for name, (left, top, width, height) in regions.items()
+        }
+
+    def get_stats(self):
+        """Get capture latency statistics"""
+        return {
+            'backend': self.name,
+            'grabs': self.grab_count,
+            'mean_ms': self.total_seconds / self.grab_count * 1000 if self.grab_count else 0.0,
+            'max_ms': self.max_seconds * 1000
+        }
+
+    def close(self):
+        """Release backend resources"""
+        pass
+
+
+class PyAutoGUICapture(ScreenCapture):
+    """Original pyautogui screenshot path"""
+
+    name = 'pyautogui'
+
+    def _grab(self, region):
+        screenshot = pyautogui.screenshot(region=region)
+        return cv2.cvtColor(np.asarray(screenshot), cv2.COLOR_RGB2BGR)
+
+
+class MSSCapture(ScreenCapture):
+    """Persistent mss instance returning views of its raw BGRA buffer"""
+
+    name = 'mss'
+
+    def __init__(self, debug_logger=None):
+        super().__init__(debug_logger)
+        if mss is None:
+            raise RuntimeError("mss is not installed")
+
+        # mss handles are bound to the thread that created them
+        self._local = threading.local()
+        self._instances = []
+        self._instance()
+
+    def _instance(self):
+        sct = getattr(self._local, 'sct', None)
+        if sct is None:
+            sct = mss.mss()
+            self._local.sct = sct
+            self._instances.append(sct)
+        return sct
+
+    def _grab(self, region):
+        left, top, width, height = region
+        shot = self._instance().grab({'left': left, 'top': top, 'width': width, 'height': height})
+        return np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+
+    def close(self):
+        for sct in self._instances:
+            sct.close()
+        self._instances = []
+
+
+class _XImage(ctypes.Structure):
+    _fields_ = [
+        ('width', ctypes.c_int),
+        ('height', ctypes.c_int),
+        ('xoffset', ctypes.c_int),
+        ('format', ctypes.c_int),
+        ('data', ctypes.c_void_p),
+        ('byte_order', ctypes.c_int),
+        ('bitmap_unit', ctypes.c_int),
+        ('bitmap_bit_order', ctypes.c_int),
+        ('bitmap_pad', ctypes.c_int),
+        ('depth', ctypes.c_int),
+        ('bytes_per_line', ctypes.c_int),
+        ('bits_per_pixel', ctypes.c_int),
+        ('red_mask', ctypes.c_ulong),
+        ('green_mask', ctypes.c_ulong),
+        ('blue_mask', ctypes.c_ulong),
+        ('obdata', ctypes.c_void_p),
+        ('f', ctypes.c_void_p * 6),
+    ]
+
+
+class _XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [
+        ('shmseg', ctypes.c_ulong),
+        ('shmid', ctypes.c_int),
+        ('shmaddr', ctypes.c_void_p),
+        ('readOnly', ctypes.c_int),
+    ]
+
+
+class XShmCapture(ScreenCapture):
+    """X11 MIT-SHM capture into a persistent shared-memory segment (Linux)"""
+
+    name = 'xshm'
+
+    ZPIXMAP = 2
+    ALL_PLANES = 0xFFFFFFFF
+    IPC_PRIVATE = 0
+    IPC_CREAT = 0o1000
+    IPC_RMID = 0
+
+    def __init__(self, debug_logger=None):
+        super().__init__(debug_logger)
+        if not sys.platform.startswith('linux'):
+            raise RuntimeError("MIT-SHM capture is only available on Linux")
+
+        self.xlib = self._load('X11')
+        self.xext = self._load('Xext')
+        self.libc = self._load('c')
+        self._declare_functions()
+
+        self.display = self.xlib.XOpenDisplay(None)
+        if not self.display:
+            raise RuntimeError("Cannot open X display")
+        if not self.xext.XShmQueryExtension(self.display):
+            self.xlib.XCloseDisplay(self.display)
+            raise RuntimeError("X server does not support MIT-SHM")
+
+        screen = self.xlib.XDefaultScreen(self.display)
+        self.root = self.xlib.XDefaultRootWindow(self.display)
+        self.visual = self.xlib.XDefaultVisual(self.display, screen)
+        self.depth = self.xlib.XDefaultDepth(self.display, screen)
+
+        # One shared-memory segment per region, reused for every grab of it - keyed by the
+        # whole region so two same-size regions grabbed in one cycle never share a buffer
+        self._segments = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _load(name):
+        path = ctypes.util.find_library(name)
+        if not path:
+            raise RuntimeError(f"lib{name} not found")
+        return ctypes.CDLL(path)
+
+    def _declare_functions(self):
+        xlib, xext, libc = self.xlib, self.xext, self.libc
+        xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        xlib.XOpenDisplay.restype = ctypes.c_void_p
+        xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        xlib.XDefaultScreen.argtypes = [ctypes.c_void_p]
+        xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+        xlib.XDefaultVisual.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XDefaultVisual.restype = ctypes.c_void_p
+        xlib.XDefaultDepth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XSync.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XDestroyImage = getattr(xlib, 'XDestroyImage', None)
+        xext.XShmQueryExtension.argtypes = [ctypes.c_void_p]
+        xext.XShmCreateImage.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int,
+                                         ctypes.c_void_p, ctypes.POINTER(_XShmSegmentInfo),
+                                         ctypes.c_uint, ctypes.c_uint]
+        xext.XShmCreateImage.restype = ctypes.POINTER(_XImage)
+        xext.XShmAttach.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XShmSegmentInfo)]
+        xext.XShmDetach.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XShmSegmentInfo)]
+        xext.XShmGetImage.argtypes = [ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(_XImage),
+                                      ctypes.c_int, ctypes.c_int, ctypes.c_ulong]
+        libc.shmget.argtypes = [ctypes.c_int, ctypes.c_size_t, ctypes.c_int]
+        libc.shmat.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int]
+        libc.shmat.restype = ctypes.c_void_p
+        libc.shmdt.argtypes = [ctypes.c_void_p]
+        libc.shmctl.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+
+    def _segment(self, region):
+        """Get (or create) the shared-memory image for a region"""
+        segment = self._segments.get(region)
+        if segment is not None:
+            return segment
+
+        width, height = region[2], region[3]
+        shminfo = _XShmSegmentInfo()
+        ximage = self.xext.XShmCreateImage(self.display, self.visual, self.depth, self.ZPIXMAP,
+                                           None, ctypes.byref(shminfo), width, height)
+        if not ximage:
+            raise RuntimeError("XShmCreateImage failed")
+
+        bytes_per_line = ximage.contents.bytes_per_line
+        size = bytes_per_line * height
+        shminfo.shmid = self.libc.shmget(self.IPC_PRIVATE, size, self.IPC_CREAT | 0o600)
+        if shminfo.shmid < 0:
+            raise RuntimeError("shmget failed")
+        shminfo.shmaddr = self.libc.shmat(shminfo.shmid, None, 0)
+        ximage.contents.data = shminfo.shmaddr
+        shminfo.readOnly = 0
+
+        self.xext.XShmAttach(self.display, ctypes.byref(shminfo))
+        self.xlib.XSync(self.display, 0)
+        # Segment is freed automatically once both sides detach
+        self.libc.shmctl(shminfo.shmid, self.IPC_RMID, None)
+
+        buffer = (ctypes.c_uint8 * size).from_address(shminfo.shmaddr)
+        rows = np.ctypeslib.as_array(buffer).reshape(height, bytes_per_line)
+        frame = rows[:, :width * 4].reshape(height, width, 4)
+
+        segment = (ximage, shminfo, frame)
+        self._segments[region] = segment
+        return segment
+
+    def _grab(self, region):
+        left, top = region[0], region[1]
+        with self._lock:
+            ximage, _, frame = self._segment(tuple(region))
+            if not self.xext.XShmGetImage(self.display, self.root, ximage, left, top, self.ALL_PLANES):
+                raise RuntimeError("XShmGetImage failed")
+        return frame
+
+    def close(self):
+        with self._lock:
+            for ximage, shminfo, _ in self._segments.values():
+                self.xext.XShmDetach(self.display, ctypes.byref(shminfo))
+                self.libc.shmdt(shminfo.shmaddr)
+            self._segments = {}
+            if self.display:
+                self.xlib.XCloseDisplay(self.display)
+                self.display = None
+
+
+class FileCapture(ScreenCapture):
+    """Crops regions out of an image file - a synthetic screen for tests"""
+
+    name = 'file'
+
+    def __init__(self, path, debug_logger=None):
+        super().__init__(debug_logger)
+        if path is None:
+            raise RuntimeError("File capture needs capture.file_path")
+
+        if path.endswith('.npy'):
+            self.screen = np.load(path)
+        else:
+            self.screen = cv2.imread(path, cv2.IMREAD_COLOR)
+        if self.screen is None:
+            raise RuntimeError(f"Cannot read capture file '{path}'")
+
+    def _grab(self, region):
+        left, top, width, height = region
+        return self.screen[top:top + height, left:left + width]
+
+
+class ReplayCapture(ScreenCapture):
+    """Stand-in screen that serves one recorded cycle at a time"""
+
+    name = 'replay'
+
+    def __init__(self, debug_logger=None):
+        super().__init__(debug_logger)
+        self.timestamp = 0.0
+        self.screen = {}
+
+    def load(self, timestamp, frames):
+        """Show a recorded cycle - {name: Frame} captured at timestamp"""
+        self.timestamp = timestamp
+        self.screen = {frame.region: frame.pixels for frame in frames.values() if frame.region}
+
+    def now(self):
+        """Recorded capture time of the current cycle"""
+        return self.timestamp
+
+    def _grab(self, region):
+        pixels = self.screen.get(tuple(region))
+        if pixels is None:
+            raise RuntimeError(f"Region {region} was not recorded in this cycle")
+        return pixels
+
+    def grab_regions(self, regions):
+        """Serve each recorded region as-is (there is no screen to crop a union from)"""
+        return {name: self.grab(region) for name, region in regions.items() if region}
+
+
+def create_screen_capture(config, debug_logger=None):
+    """Create the configured capture backend ('auto' picks the fastest available)"""
+    requested = config.capture_backend
+
+    if requested == 'auto':
+        names = ['xshm', 'mss', 'pyautogui'] if sys.platform.startswith('linux') else ['mss', 'pyautogui']
+    else:
+        names = [requested]
+
+    for name in names:
+        try:
+            if name == 'xshm':
+                capture = XShmCapture(debug_logger)
+            elif name == 'mss':
+                capture = MSSCapture(debug_logger)
+            elif name == 'file':
+                capture = FileCapture(config.capture_file, debug_logger)
+            elif name == 'pyautogui':
+                capture = PyAutoGUICapture(debug_logger)
+            else:
+                if debug_logger:
+                    debug_logger.log("CAPTURE: Unknown backend '%s'", name, level='warn')
+                continue
+        except Exception as e:
+            if debug_logger:
+                debug_logger.log("CAPTURE: Backend '%s' unavailable: %s", name, e, level='warn')
+            continue
+
+        if debug_logger:
+            debug_logger.log("CAPTURE: Using '%s' backend", capture.name, level='info')
+        return capture
+
+    return PyAutoGUICapture(debug_logger)
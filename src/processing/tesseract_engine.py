@@ -0,0 +1,376 @@
+"""
+Tesseract Engine - Persistent in-process Tesseract backend
+
+pytesseract starts the tesseract binary, writes a temp image and reloads the
+language model on every call. This engine keeps one initialized Tesseract
+handle alive for the whole session and hands it raw NumPy buffers directly.
+
+Backends, in the order tried by "auto":
+- tesserocr: Python bindings to libtesseract (optional dependency)
+- capi: the libtesseract C API loaded through ctypes
+- subprocess: pytesseract, one process per call (always available)
+"""
+
+import ctypes
+import ctypes.util
+import shlex
+import threading
+import numpy as np
+import pytesseract
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+
+def parse_tesseract_config(config):
+    """Split a pytesseract config string into (page_seg_mode, variables)"""
+    psm = None
+    variables = {}
+    tokens = shlex.split(config or '')
+
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token == '--psm' and i + 1 < len(tokens):
+            psm = int(tokens[i + 1])
+            i += 2
+        elif token == '-c' and i + 1 < len(tokens):
+            name, _, value = tokens[i + 1].partition('=')
+            variables[name] = value
+            i += 2
+        else:
+            i += 1
+
+    return psm, variables
+
+
+def parse_tsv(tsv):
+    """Parse Tesseract TSV output into word boxes
+
+    Returns a list of dicts with left, top, width, height, conf and text for
+    every recognized word.
+    """
+    words = []
+    for line in tsv.splitlines():
+        fields = line.split('\t')
+        if len(fields) < 12 or not fields[0].isdigit():
+            continue  # Header or malformed line
+        if int(fields[0]) != 5 or not fields[11].strip():
+            continue  # Only non-empty word-level boxes
+        words.append({
+            'left': int(fields[6]),
+            'top': int(fields[7]),
+            'width': int(fields[8]),
+            'height': int(fields[9]),
+            'conf': float(fields[10]),
+            'text': fields[11].strip()
+        })
+    return words
+
+
+class _PersistentBackend:
+    """Shared handling for backends that keep one Tesseract handle alive
+
+    Settings made on a persistent handle stick between calls, so each variable
+    is restored to its default when a later config no longer sets it, and a
+    config without --psm runs in the tesseract command line's default mode.
+    """
+
+    # Page segmentation mode tesseract (and so pytesseract) uses without --psm
+    DEFAULT_PSM = 3
+
+    def __init__(self):
+        self._defaults = {}
+        self._applied = {}
+        self._psm = None
+
+    def _apply_settings(self, psm, variables):
+        if psm is None:
+            psm = self.DEFAULT_PSM
+        if psm != self._psm:
+            self._set_page_seg_mode(psm)
+            self._psm = psm
+
+        for name in list(self._applied):
+            if name not in variables:
+                default = self._defaults.get(name)
+                if default is not None:
+                    self._set_variable(name, default)
+                del self._applied[name]
+
+        for name, value in variables.items():
+            if self._applied.get(name) == value:
+                continue
+            if name not in self._defaults:
+                self._defaults[name] = self._get_variable(name)
+            self._set_variable(name, value)
+            self._applied[name] = value
+
+    def recognize(self, image, psm, variables, config=''):
+        self._apply_settings(psm, variables)
+        return self._recognize_image(image)
+
+    def recognize_data(self, image, psm, variables, config=''):
+        self._apply_settings(psm, variables)
+        return parse_tsv(self._recognize_tsv(image))
+
+
+class _TesserocrBackend(_PersistentBackend):
+    """Persistent handle through the tesserocr bindings"""
+
+    name = 'tesserocr'
+
+    def __init__(self, language):
+        super().__init__()
+        if tesserocr is None:
+            raise RuntimeError("tesserocr is not installed")
+        self.api = tesserocr.PyTessBaseAPI(lang=language)
+
+    def _set_page_seg_mode(self, psm):
+        self.api.SetPageSegMode(psm)
+
+    def _get_variable(self, name):
+        return self.api.GetVariableAsString(name)
+
+    def _set_variable(self, name, value):
+        self.api.SetVariable(name, value)
+
+    def _recognize_image(self, image):
+        height, width = image.shape[:2]
+        bytes_per_pixel = 1 if image.ndim == 2 else image.shape[2]
+        self.api.SetImageBytes(image.tobytes(), width, height, bytes_per_pixel, image.strides[0])
+        return self.api.GetUTF8Text()
+
+    def _recognize_tsv(self, image):
+        height, width = image.shape[:2]
+        bytes_per_pixel = 1 if image.ndim == 2 else image.shape[2]
+        self.api.SetImageBytes(image.tobytes(), width, height, bytes_per_pixel, image.strides[0])
+        return self.api.GetTSVText(0)
+
+    def close(self):
+        self.api.End()
+
+
+class _CAPIBackend(_PersistentBackend):
+    """Persistent handle through the libtesseract C API"""
+
+    name = 'capi'
+
+    LIBRARY_NAMES = ['tesseract', 'libtesseract.so.5', 'libtesseract.so.4', 'libtesseract.5.dylib']
+
+    def __init__(self, language):
+        super().__init__()
+        self.lib = self._load_library()
+        self._declare_functions()
+
+        self.handle = self.lib.TessBaseAPICreate()
+        if not self.handle:
+            raise RuntimeError("TessBaseAPICreate failed")
+
+        if self.lib.TessBaseAPIInit3(self.handle, None, language.encode()) != 0:
+            self.lib.TessBaseAPIDelete(self.handle)
+            raise RuntimeError(f"TessBaseAPIInit3 failed for language '{language}'")
+
+    def _load_library(self):
+        for name in self.LIBRARY_NAMES:
+            path = ctypes.util.find_library(name) if '.' not in name else name
+            if not path:
+                continue
+            try:
+                return ctypes.CDLL(path)
+            except OSError:
+                continue
+        raise RuntimeError("libtesseract not found")
+
+    def _declare_functions(self):
+        lib = self.lib
+        lib.TessBaseAPICreate.restype = ctypes.c_void_p
+        lib.TessBaseAPIInit3.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p]
+        lib.TessBaseAPIInit3.restype = ctypes.c_int
+        lib.TessBaseAPISetPageSegMode.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        lib.TessBaseAPISetVariable.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p]
+        lib.TessBaseAPISetVariable.restype = ctypes.c_int
+        lib.TessBaseAPIGetStringVariable.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
+        lib.TessBaseAPIGetStringVariable.restype = ctypes.c_char_p
+        lib.TessBaseAPISetImage.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int,
+                                            ctypes.c_int, ctypes.c_int, ctypes.c_int]
+        lib.TessBaseAPIGetUTF8Text.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIGetUTF8Text.restype = ctypes.c_void_p
+        lib.TessBaseAPIGetTSVText.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        lib.TessBaseAPIGetTSVText.restype = ctypes.c_void_p
+        lib.TessDeleteText.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIClear.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIEnd.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIDelete.argtypes = [ctypes.c_void_p]
+
+    def _set_page_seg_mode(self, psm):
+        self.lib.TessBaseAPISetPageSegMode(self.handle, psm)
+
+    def _get_variable(self, name):
+        value = self.lib.TessBaseAPIGetStringVariable(self.handle, name.encode())
+        return value.decode() if value is not None else None
+
+    def _set_variable(self, name, value):
+        self.lib.TessBaseAPISetVariable(self.handle, name.encode(), value.encode())
+
+    def _recognize_image(self, image):
+        return self._get_text(image, self.lib.TessBaseAPIGetUTF8Text)
+
+    def _recognize_tsv(self, image):
+        return self._get_text(image, lambda handle: self.lib.TessBaseAPIGetTSVText(handle, 0))
+
+    def _get_text(self, image, getter):
+        lib = self.lib
+        height, width = image.shape[:2]
+        bytes_per_pixel = 1 if image.ndim == 2 else image.shape[2]
+        lib.TessBaseAPISetImage(self.handle, image.ctypes.data, width, height,
+                                bytes_per_pixel, image.strides[0])
+
+        text_ptr = getter(self.handle)
+        lib.TessBaseAPIClear(self.handle)
+        if not text_ptr:
+            return ''
+        try:
+            return ctypes.string_at(text_ptr).decode('utf-8', errors='replace')
+        finally:
+            lib.TessDeleteText(text_ptr)
+
+    def close(self):
+        self.lib.TessBaseAPIEnd(self.handle)
+        self.lib.TessBaseAPIDelete(self.handle)
+        self.handle = None
+
+
+class _SubprocessBackend:
+    """One tesseract process per call through pytesseract"""
+
+    name = 'subprocess'
+
+    def __init__(self, language):
+        self.language = language
+
+    def recognize(self, image, psm, variables, config=''):
+        return pytesseract.image_to_string(image, lang=self.language, config=config)
+
+    def recognize_data(self, image, psm, variables, config=''):
+        tsv = pytesseract.image_to_data(image, lang=self.language, config=config)
+        return parse_tsv(tsv)
+
+    def close(self):
+        pass
+
+
+class TesseractEngine:
+    """Session-wide Tesseract handles behind a pytesseract-style interface"""
+
+    BACKENDS = {
+        'tesserocr': _TesserocrBackend,
+        'capi': _CAPIBackend,
+        'subprocess': _SubprocessBackend,
+    }
+
+    AUTO_ORDER = ['tesserocr', 'capi', 'subprocess']
+
+    def __init__(self, config, debug_logger=None):
+        self.config = config
+        self.debug_logger = debug_logger
+        self.language = config.tesseract_language
+
+        self._lock = threading.Lock()
+        self._parsed_configs = {}
+
+        # Statistics
+        self.call_count = 0
+
+        self.backend = self._create_backend(config.tesseract_backend)
+        self.debug_log("TESSERACT: Using '%s' backend", self.backend.name, level='info')
+
+        # A handle must not be used by two threads at once, so every thread
+        # that runs OCR (e.g. parallel variant workers) gets its own on first
+        # use. The handle created above is kept for the first such thread
+        # rather than the constructing one, which usually never runs OCR.
+        self._local = threading.local()
+        self._unclaimed = self.backend
+        self._backends = [self.backend]
+
+    def debug_log(self, message, *args, level=None):
+        """Write debug message through the logger (%-style args, default level unless given)"""
+        if self.debug_logger:
+            if level:
+                self.debug_logger.log(message, *args, level=level)
+            else:
+                self.debug_logger.log(message, *args)
+
+    def _create_backend(self, requested):
+        """Create the requested backend, or the first one that works for 'auto'"""
+        names = self.AUTO_ORDER if requested == 'auto' else [requested]
+
+        for name in names:
+            backend_class = self.BACKENDS.get(name)
+            if backend_class is None:
+                self.debug_log("TESSERACT: Unknown backend '%s'", name, level='warn')
+                continue
+            try:
+                return backend_class(self.language)
+            except Exception as e:
+                self.debug_log("TESSERACT: Backend '%s' unavailable: %s", name, e)
+
+        # pytesseract is a hard requirement, so this always works
+        return _SubprocessBackend(self.language)
+
+    def _thread_backend(self):
+        """Get the calling thread's handle, creating it on first use"""
+        backend = getattr(self._local, 'backend', None)
+        if backend is None:
+            with self._lock:
+                backend, self._unclaimed = self._unclaimed, None
+            if backend is None:
+                backend = self._create_backend(self.backend.name)
+                with self._lock:
+                    self._backends.append(backend)
+            self._local.backend = backend
+        return backend
+
+    def _parse_config(self, config):
+        """Parse a config string once and reuse it for the rest of the session"""
+        parsed = self._parsed_configs.get(config)
+        if parsed is None:
+            parsed = parse_tesseract_config(config)
+            self._parsed_configs[config] = parsed
+        return parsed
+
+    def image_to_string(self, image, config=''):
+        """Recognize text in a NumPy image (drop-in for pytesseract.image_to_string)"""
+        psm, variables = self._parse_config(config)
+        image = np.ascontiguousarray(image, dtype=np.uint8)
+
+        backend = self._thread_backend()
+        with self._lock:
+            self.call_count += 1
+        return backend.recognize(image, psm, variables, config)
+
+    def image_to_data(self, image, config=''):
+        """Recognize word boxes in a NumPy image (like pytesseract.image_to_data)
+
+        Returns a list of dicts with left, top, width, height, conf and text.
+        """
+        psm, variables = self._parse_config(config)
+        image = np.ascontiguousarray(image, dtype=np.uint8)
+
+        backend = self._thread_backend()
+        with self._lock:
+            self.call_count += 1
+        return backend.recognize_data(image, psm, variables, config)
+
+    def close(self):
+        """Release every Tesseract handle"""
+        with self._lock:
+            backends, self._backends = self._backends, []
+
+        for backend in backends:
+            try:
+                backend.close()
+            except Exception as e:
+                self.debug_log("TESSERACT: Error closing backend: %s", e, level='warn')
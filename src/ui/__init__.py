@@ -5,5 +5,6 @@ Contains overlay and display components.
 """
 
 from .overlay import GameOverlay
+from .perf_hud import PerfHUD
 
-__all__ = ['GameOverlay']
+__all__ = ['GameOverlay', 'PerfHUD']
@@ -8,61 +8,91 @@ Uses tkinter to create a game-style overlay panel that shows:
 - HP thresholds
 - Heal counters (normal and critical)
 - Compact hotkey list
+- Optional performance HUD (loop rate, cycle latency, OCR rates)
 
-IMPORTANT: On macOS, tkinter MUST run on the main thread.
+The panel is retained-mode: everything is drawn once as items on a single
+canvas, and only the text items whose value changed are reconfigured.
+HealthMonitor, Skinner and AutoHaste publish state changes as events; the
+overlay queues them and applies them on its next tick, so a tick with
+nothing to apply costs one paused-flag check. The performance HUD changes
+continuously, so it is sampled on its own slower timer instead.
+
+IMPORTANT: On macOS, tkinter MUST run on the main thread. Sensing and
+healing run on their own thread (SensingLoop); events are only queued from
+other threads, and other threads never touch Tk.
 """
 
+import collections
 import tkinter as tk
 
 
+# Tibia color scheme
+BG_DARK = '#404040'
+BG_DARKER = '#353535'
+BG_TITLE = '#505050'
+BORDER = '#606060'
+TEXT_BEIGE = '#c0b090'
+TEXT_DIM = '#707070'
+GREEN = '#00c000'
+RED = '#c00000'
+ORANGE = '#ff8800'
+BLUE = '#4080ff'
+GOLD = '#d4a017'
+ERROR_RED = '#ff0000'
+
+# Panel geometry (pixels)
+WIDTH = 210
+TITLE_HEIGHT = 20
+ROW_HEIGHT = 18
+MARGIN = 14
+
+FONT = ('Arial', 9)
+FONT_BOLD = ('Arial', 9, 'bold')
+FONT_SMALL = ('Arial', 8)
+FONT_SMALL_BOLD = ('Arial', 8, 'bold')
+
+
 class GameOverlay:
-    def __init__(self, config, health_monitor, get_paused_callback, skinner=None, auto_haste=None):
+    # Interval between ticks applying queued events (ms)
+    EVENT_POLL_MS = 100
+    
+    # Interval between performance HUD refreshes (ms)
+    PERF_REFRESH_MS = 1000
+    
+    def __init__(self, config, health_monitor, get_paused_callback, skinner=None, auto_haste=None, perf_hud=None):
         self.config = config
         self.health_monitor = health_monitor
         self.get_paused = get_paused_callback
         self.skinner = skinner
         self.auto_haste = auto_haste
+        self.perf_hud = perf_hud
         
         self.root = None
+        self.canvas = None
         self._running = False
         self._stop_requested = False
         
-        # Monitoring callback
-        self._monitoring_callback = None
-        
         # Dragging state
         self._drag_start_x = 0
         self._drag_start_y = 0
         
-        # UI elements
-        self.status_indicator = None
-        self.skinner_btn = None
-        self.skinner_clicks_label = None
-        self.haste_btn = None
-        self.haste_casts_label = None
-        self.heal_btn = None
-        self.normal_heals_label = None
-        self.critical_btn = None
-        self.critical_heals_label = None
+        # (source, event, value) published on other threads, applied on the Tk thread
+        self.events = collections.deque()
+        self._subscriptions = []
+        
+        # Canvas text item ids by name, and the (text, color) last drawn into each
+        self.items = {}
+        self.drawn = {}
+        
+        # State the status line is derived from
+        self.paused = False
+        self.error_status = {'has_error': False, 'is_warning': False}
     
     def _create_window(self):
         """Create the overlay window - Tibia style"""
         self.root = tk.Tk()
         self.root.title("Healer")
         
-        # Tibia color scheme
-        BG_DARK = '#404040'
-        BG_DARKER = '#353535'
-        BG_TITLE = '#505050'
-        BORDER = '#606060'
-        TEXT_BEIGE = '#c0b090'
-        TEXT_DIM = '#707070'
-        GREEN = '#00c000'
-        RED = '#c00000'
-        ORANGE = '#ff8800'
-        BLUE = '#4080ff'
-        GOLD = '#d4a017'
-        
         # Window configuration
         self.root.overrideredirect(True)
         self.root.attributes('-topmost', True)
@@ -71,267 +101,255 @@ class GameOverlay:
         screen_width = self.root.winfo_screenwidth()
         self.root.geometry(f"+{screen_width - 230}+100")
         
-        # Outer border
-        outer_frame = tk.Frame(self.root, bg=BORDER, padx=1, pady=1)
-        outer_frame.pack(fill='both', expand=True)
-        
-        main_frame = tk.Frame(outer_frame, bg=BG_DARK)
-        main_frame.pack(fill='both', expand=True)
+        self.canvas = tk.Canvas(self.root, width=WIDTH, bg=BG_DARK,
+                                highlightthickness=1, highlightbackground=BORDER)
+        self.canvas.pack(fill='both', expand=True)
+        canvas = self.canvas
         
         # === Title Bar ===
-        title_frame = tk.Frame(main_frame, bg=BG_TITLE, height=20)
-        title_frame.pack(fill='x')
-        title_frame.pack_propagate(False)
-        
-        tk.Label(title_frame, text="🛡️", font=('Arial', 10),
-                 fg=GOLD, bg=BG_TITLE).pack(side='left', padx=(4, 2))
-        
-        title_label = tk.Label(title_frame, text="Healer Bot",
-                               font=('Arial', 9, 'bold'), fg=TEXT_BEIGE, bg=BG_TITLE)
-        title_label.pack(side='left')
-        
-        close_btn = tk.Label(title_frame, text="✕", font=('Arial', 10),
-                             fg=TEXT_DIM, bg=BG_TITLE, cursor='hand2')
-        close_btn.pack(side='right', padx=(0, 4))
-        close_btn.bind('<Button-1>', lambda e: self._on_close())
-        close_btn.bind('<Enter>', lambda e: close_btn.config(fg=RED))
-        close_btn.bind('<Leave>', lambda e: close_btn.config(fg=TEXT_DIM))
-        
-        title_frame.bind('<Button-1>', self._start_drag)
-        title_frame.bind('<B1-Motion>', self._on_drag)
-        title_label.bind('<Button-1>', self._start_drag)
-        title_label.bind('<B1-Motion>', self._on_drag)
+        canvas.create_rectangle(0, 0, WIDTH, TITLE_HEIGHT, fill=BG_TITLE, width=0, tags='title')
+        canvas.create_text(6, TITLE_HEIGHT // 2, text="🛡️", anchor='w', font=('Arial', 10), fill=GOLD, tags='title')
+        canvas.create_text(24, TITLE_HEIGHT // 2, text="Healer Bot", anchor='w', font=FONT_BOLD, fill=TEXT_BEIGE, tags='title')
+        close_btn = canvas.create_text(WIDTH - 6, TITLE_HEIGHT // 2, text="✕", anchor='e',
+                                       font=('Arial', 10), fill=TEXT_DIM, tags='close')
+        canvas.tag_bind('close', '<Button-1>', lambda e: self._on_close())
+        canvas.tag_bind('close', '<Enter>', lambda e: canvas.itemconfigure(close_btn, fill=RED))
+        canvas.tag_bind('close', '<Leave>', lambda e: canvas.itemconfigure(close_btn, fill=TEXT_DIM))
+        canvas.tag_bind('title', '<Button-1>', self._start_drag)
+        canvas.tag_bind('title', '<B1-Motion>', self._on_drag)
         
         # === Content ===
-        content = tk.Frame(main_frame, bg=BG_DARK, padx=24, pady=6)
-        content.pack(fill='both', expand=True)
-        
-        # --- Status Row ---
-        status_row = tk.Frame(content, bg=BG_DARK)
-        status_row.pack(fill='x', pady=2)
-        
-        tk.Label(status_row, text="⚡ Status:", font=('Arial', 9),
-                 fg=TEXT_BEIGE, bg=BG_DARK).pack(side='left')
-        
-        self.status_indicator = tk.Label(status_row, text="ACTIVE",
-                                         font=('Arial', 9, 'bold'), fg=GREEN, bg=BG_DARK)
-        self.status_indicator.pack(side='right')
-        
-        # --- Separator ---
-        tk.Frame(content, height=1, bg=BORDER).pack(fill='x', pady=4)
+        y = TITLE_HEIGHT + 6
+        y = self._add_row(y, "⚡ Status:", 'status', "ACTIVE", GREEN)
+        y = self._add_separator(y)
         
         # ========== FEATURES SECTION ==========
-        feat_title = tk.Frame(content, bg=BG_DARKER, padx=4, pady=2)
-        feat_title.pack(fill='x', pady=(0, 3))
-        tk.Label(feat_title, text="⚙️ Features", font=('Arial', 8, 'bold'),
-                 fg=GOLD, bg=BG_DARKER).pack(side='left')
-        
-        # Heal toggle with %
-        heal_row = tk.Frame(content, bg=BG_DARK)
-        heal_row.pack(fill='x', pady=1)
-        
-        tk.Label(heal_row, text=f"  💊 Heal (<{int(self.config.hp_threshold*100)}%):",
-                 font=('Arial', 9), fg=TEXT_BEIGE, bg=BG_DARK).pack(side='left')
-        
-        self.heal_btn = tk.Label(heal_row, text="[ON]", font=('Arial', 9, 'bold'),
-                                 fg=GREEN, bg=BG_DARK, cursor='hand2')
-        self.heal_btn.pack(side='right')
-        self.heal_btn.bind('<Button-1>', lambda e: self._toggle_heal())
-        
-        # Critical toggle with %
-        crit_row = tk.Frame(content, bg=BG_DARK)
-        crit_row.pack(fill='x', pady=1)
-        
-        tk.Label(crit_row, text=f"  🚨 Critical (<{int(self.config.hp_critical_threshold*100)}%):",
-                 font=('Arial', 9), fg=TEXT_BEIGE, bg=BG_DARK).pack(side='left')
-        
-        self.critical_btn = tk.Label(crit_row, text="[ON]", font=('Arial', 9, 'bold'),
-                                     fg=GREEN, bg=BG_DARK, cursor='hand2')
-        self.critical_btn.pack(side='right')
-        self.critical_btn.bind('<Button-1>', lambda e: self._toggle_critical())
-        
-        # Skinner toggle (only button, no counter)
+        y = self._add_section(y, "⚙️ Features")
+        y = self._add_row(y, f"  💊 Heal (<{int(self.config.hp_threshold*100)}%):", 'heal_btn', "[ON]", GREEN,
+                          on_click=self._toggle_heal)
+        y = self._add_row(y, f"  🚨 Critical (<{int(self.config.hp_critical_threshold*100)}%):", 'critical_btn', "[ON]", GREEN,
+                          on_click=self._toggle_critical)
         if self.skinner:
-            skin_row = tk.Frame(content, bg=BG_DARK)
-            skin_row.pack(fill='x', pady=1)
-            
-            tk.Label(skin_row, text="  🔪 Skinner:", font=('Arial', 9),
-                     fg=TEXT_BEIGE, bg=BG_DARK).pack(side='left')
-            
-            self.skinner_btn = tk.Label(skin_row, text="[OFF]", font=('Arial', 9, 'bold'),
-                                        fg=RED, bg=BG_DARK, cursor='hand2')
-            self.skinner_btn.pack(side='right')
-            self.skinner_btn.bind('<Button-1>', lambda e: self._toggle_skinner())
-        
-        # Haste toggle (only button, no counter)
+            y = self._add_row(y, "  🔪 Skinner:", 'skinner_btn', "[OFF]", RED, on_click=self._toggle_skinner)
         if self.auto_haste:
-            haste_row = tk.Frame(content, bg=BG_DARK)
-            haste_row.pack(fill='x', pady=1)
-            
-            tk.Label(haste_row, text="  💨 Haste:", font=('Arial', 9),
-                     fg=TEXT_BEIGE, bg=BG_DARK).pack(side='left')
-            
-            self.haste_btn = tk.Label(haste_row, text="[OFF]", font=('Arial', 9, 'bold'),
-                                      fg=RED, bg=BG_DARK, cursor='hand2')
-            self.haste_btn.pack(side='right')
-            self.haste_btn.bind('<Button-1>', lambda e: self._toggle_haste())
-        
-        # --- Separator ---
-        tk.Frame(content, height=1, bg=BORDER).pack(fill='x', pady=4)
+            y = self._add_row(y, "  💨 Haste:", 'haste_btn', "[OFF]", RED, on_click=self._toggle_haste)
+        y = self._add_separator(y)
         
         # ========== STATISTICS SECTION ==========
-        stats_title = tk.Frame(content, bg=BG_DARKER, padx=4, pady=2)
-        stats_title.pack(fill='x', pady=(0, 3))
-        tk.Label(stats_title, text="📊 Statistics", font=('Arial', 8, 'bold'),
-                 fg=GOLD, bg=BG_DARKER).pack(side='left')
-        
-        # Heals count
-        heals_row = tk.Frame(content, bg=BG_DARK)
-        heals_row.pack(fill='x', pady=1)
-        
-        tk.Label(heals_row, text="  💊 Heals:", font=('Arial', 9),
-                 fg=TEXT_BEIGE, bg=BG_DARK).pack(side='left')
-        
-        self.normal_heals_label = tk.Label(heals_row, text="0",
-                                           font=('Arial', 9, 'bold'), fg=GREEN, bg=BG_DARK)
-        self.normal_heals_label.pack(side='right')
-        
-        # Critical count
-        crit_count_row = tk.Frame(content, bg=BG_DARK)
-        crit_count_row.pack(fill='x', pady=1)
-        
-        tk.Label(crit_count_row, text="  🚨 Critical:", font=('Arial', 9),
-                 fg=TEXT_BEIGE, bg=BG_DARK).pack(side='left')
-        
-        self.critical_heals_label = tk.Label(crit_count_row, text="0",
-                                             font=('Arial', 9, 'bold'), fg=RED, bg=BG_DARK)
-        self.critical_heals_label.pack(side='right')
-        
-        # Skinner count
+        y = self._add_section(y, "📊 Statistics")
+        y = self._add_row(y, "  💊 Heals:", 'normal_heals', "0", GREEN)
+        y = self._add_row(y, "  🚨 Critical:", 'critical_heals', "0", RED)
         if self.skinner:
-            skin_stats_row = tk.Frame(content, bg=BG_DARK)
-            skin_stats_row.pack(fill='x', pady=1)
-            
-            tk.Label(skin_stats_row, text="  🔪 Skins:", font=('Arial', 9),
-                     fg=TEXT_BEIGE, bg=BG_DARK).pack(side='left')
-            
-            self.skinner_clicks_label = tk.Label(skin_stats_row, text="0",
-                                                 font=('Arial', 9, 'bold'), fg=ORANGE, bg=BG_DARK)
-            self.skinner_clicks_label.pack(side='right')
-        
-        # Haste count
+            y = self._add_row(y, "  🔪 Skins:", 'skinner_clicks', "0", ORANGE)
         if self.auto_haste:
-            haste_stats_row = tk.Frame(content, bg=BG_DARK)
-            haste_stats_row.pack(fill='x', pady=1)
-            
-            tk.Label(haste_stats_row, text="  💨 Hastes:", font=('Arial', 9),
-                     fg=TEXT_BEIGE, bg=BG_DARK).pack(side='left')
-            
-            self.haste_casts_label = tk.Label(haste_stats_row, text="0",
-                                              font=('Arial', 9, 'bold'), fg=BLUE, bg=BG_DARK)
-            self.haste_casts_label.pack(side='right')
-        
-        # --- Separator ---
-        tk.Frame(content, height=1, bg=BORDER).pack(fill='x', pady=4)
+            y = self._add_row(y, "  💨 Hastes:", 'haste_casts', "0", BLUE)
+        y = self._add_separator(y)
+        
+        # ========== PERFORMANCE SECTION ==========
+        if self.perf_hud:
+            y = self._add_section(y, "📈 Performance")
+            y = self._add_row(y, "  🔁 Loop:", 'perf_rate', "-", TEXT_DIM)
+            y = self._add_row(y, "  ⏱️ p50/p99:", 'perf_latency', "-", TEXT_DIM)
+            y = self._add_row(y, "  🔍 OCR ok:", 'perf_ocr', "-", TEXT_DIM)
+            y = self._add_row(y, "  🧩 Fallback:", 'perf_fallback', "-", TEXT_DIM)
+            y = self._add_row(y, "  🕒 Last valid:", 'perf_valid', "-", TEXT_DIM)
+            y = self._add_separator(y)
         
         # ========== HOTKEYS SECTION ==========
-        hk_title = tk.Frame(content, bg=BG_DARKER, padx=4, pady=2)
-        hk_title.pack(fill='x', pady=(0, 3))
-        tk.Label(hk_title, text="⌨️ Hotkeys", font=('Arial', 8, 'bold'),
-                 fg=GOLD, bg=BG_DARKER).pack(side='left')
-        
-        # Row 1: F9 Bot | Heal key
-        hk1 = tk.Frame(content, bg=BG_DARK)
-        hk1.pack(fill='x', pady=1)
-        
-        left1 = tk.Frame(hk1, bg=BG_DARK)
-        left1.pack(side='left')
-        tk.Label(left1, text="  F9", font=('Arial', 8, 'bold'),
-                 fg=ORANGE, bg=BG_DARK).pack(side='left')
-        tk.Label(left1, text=" Bot", font=('Arial', 8),
-                 fg=TEXT_DIM, bg=BG_DARK).pack(side='left')
-        
-        right1 = tk.Frame(hk1, bg=BG_DARK)
-        right1.pack(side='right')
-        tk.Label(right1, text=f"{self.config.heal_key.upper()}", font=('Arial', 8, 'bold'),
-                 fg=GREEN, bg=BG_DARK).pack(side='left')
-        tk.Label(right1, text=" Heal", font=('Arial', 8),
-                 fg=TEXT_DIM, bg=BG_DARK).pack(side='left')
-        
-        # Row 2: Crit key | Haste key
-        hk2 = tk.Frame(content, bg=BG_DARK)
-        hk2.pack(fill='x', pady=1)
-        
-        left2 = tk.Frame(hk2, bg=BG_DARK)
-        left2.pack(side='left')
-        tk.Label(left2, text=f"  {self.config.critical_heal_key.upper()}", font=('Arial', 8, 'bold'),
-                 fg=RED, bg=BG_DARK).pack(side='left')
-        tk.Label(left2, text=" Crit", font=('Arial', 8),
-                 fg=TEXT_DIM, bg=BG_DARK).pack(side='left')
+        y = self._add_section(y, "⌨️ Hotkeys")
+        y = self._add_hotkeys(y, ("F9", " Bot", ORANGE), (self.config.heal_key.upper(), " Heal", GREEN))
+        y = self._add_hotkeys(y, (self.config.critical_heal_key.upper(), " Crit", RED),
+                              (self.config.haste_hotkey.upper(), " Haste", BLUE))
         
-        right2 = tk.Frame(hk2, bg=BG_DARK)
-        right2.pack(side='right')
-        tk.Label(right2, text=f"{self.config.haste_hotkey.upper()}", font=('Arial', 8, 'bold'),
-                 fg=BLUE, bg=BG_DARK).pack(side='left')
-        tk.Label(right2, text=" Haste", font=('Arial', 8),
-                 fg=TEXT_DIM, bg=BG_DARK).pack(side='left')
+        canvas.config(height=y + 4)
         
         # Handle window close
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
     
+    def _add_row(self, y, label, name, value, fg, on_click=None):
+        """Draw a label with a named value item at the right edge, return the next row's y"""
+        middle = y + ROW_HEIGHT // 2
+        self.canvas.create_text(MARGIN, middle, text=label, anchor='w', font=FONT, fill=TEXT_BEIGE)
+        self.items[name] = self.canvas.create_text(WIDTH - MARGIN, middle, text=value, anchor='e',
+                                                   font=FONT_BOLD, fill=fg)
+        self.drawn[name] = (value, fg)
+        if on_click:
+            self.canvas.tag_bind(self.items[name], '<Button-1>', lambda e: on_click())
+            self.canvas.tag_bind(self.items[name], '<Enter>', lambda e: self.canvas.config(cursor='hand2'))
+            self.canvas.tag_bind(self.items[name], '<Leave>', lambda e: self.canvas.config(cursor=''))
+        return y + ROW_HEIGHT
+    
+    def _add_section(self, y, title):
+        """Draw a section title bar, return the next row's y"""
+        self.canvas.create_rectangle(MARGIN, y, WIDTH - MARGIN, y + ROW_HEIGHT, fill=BG_DARKER, width=0)
+        self.canvas.create_text(MARGIN + 4, y + ROW_HEIGHT // 2, text=title, anchor='w', font=FONT_SMALL_BOLD, fill=GOLD)
+        return y + ROW_HEIGHT + 3
+    
+    def _add_separator(self, y):
+        """Draw a separator line, return the next row's y"""
+        self.canvas.create_line(MARGIN, y + 4, WIDTH - MARGIN, y + 4, fill=BORDER)
+        return y + 9
+    
+    def _add_hotkeys(self, y, left, right):
+        """Draw two (key, action, color) hotkeys on one row, return the next row's y"""
+        middle = y + ROW_HEIGHT // 2
+        key, action, fg = left
+        item = self.canvas.create_text(MARGIN, middle, text=f"  {key}", anchor='w', font=FONT_SMALL_BOLD, fill=fg)
+        self.canvas.create_text(self.canvas.bbox(item)[2], middle, text=action, anchor='w', font=FONT_SMALL, fill=TEXT_DIM)
+        
+        key, action, fg = right
+        item = self.canvas.create_text(WIDTH - MARGIN, middle, text=action, anchor='e', font=FONT_SMALL, fill=TEXT_DIM)
+        self.canvas.create_text(self.canvas.bbox(item)[0], middle, text=key, anchor='e', font=FONT_SMALL_BOLD, fill=fg)
+        return y + ROW_HEIGHT
+    
+    def _subscribe(self):
+        """Queue events from every monitor shown on the panel"""
+        sources = [('health', self.health_monitor), ('skinner', self.skinner), ('haste', self.auto_haste)]
+        for source, observable in sources:
+            if observable is None:
+                continue
+            callback = lambda event, value, source=source: self.events.append((source, event, value))
+            observable.subscribe(callback)
+            self._subscriptions.append((observable, callback))
+    
+    def _unsubscribe(self):
+        for observable, callback in self._subscriptions:
+            observable.unsubscribe(callback)
+        self._subscriptions = []
+    
+    def _show_current_state(self):
+        """Draw the state at startup (later changes arrive as events)"""
+        snapshot = self.health_monitor.get_snapshot()
+        for field in self.health_monitor.EVENT_FIELDS:
+            self._apply_event('health', field, snapshot[field])
+        if self.skinner:
+            self._apply_event('skinner', 'enabled', self.skinner.is_enabled())
+            self._apply_event('skinner', 'click_count', self.skinner.get_stats()['click_count'])
+        if self.auto_haste:
+            self._apply_event('haste', 'enabled', self.auto_haste.is_enabled())
+            self._apply_event('haste', 'cast_count', self.auto_haste.get_stats()['cast_count'])
+        self.paused = self.get_paused()
+        self._update_status()
+    
+    def _set_text(self, name, text, fg):
+        """Reconfigure a canvas text item, only if its text or color changed"""
+        item = self.items.get(name)
+        if item is None or self.drawn.get(name) == (text, fg):
+            return
+        self.canvas.itemconfigure(item, text=text, fill=fg)
+        self.drawn[name] = (text, fg)
+    
+    def _set_toggle(self, name, enabled):
+        if enabled:
+            self._set_text(name, "[ON]", GREEN)
+        else:
+            self._set_text(name, "[OFF]", RED)
+    
+    def _update_status(self):
+        """Redraw the status line from the error status and paused flag"""
+        if self.error_status['is_warning']:
+            self._set_text('status', "ERROR", ERROR_RED)
+        elif self.error_status['has_error']:
+            self._set_text('status', "DETECT...", ORANGE)
+        elif self.paused:
+            self._set_text('status', "PAUSED", RED)
+        else:
+            self._set_text('status', "ACTIVE", GREEN)
+    
+    def _apply_event(self, source, event, value):
+        """Redraw the items showing one published value"""
+        if source == 'health':
+            if event == 'heal_enabled':
+                self._set_toggle('heal_btn', value)
+            elif event == 'critical_enabled':
+                self._set_toggle('critical_btn', value)
+            elif event == 'moderate_heals':
+                self._set_text('normal_heals', str(value), GREEN)
+            elif event == 'critical_heals':
+                self._set_text('critical_heals', str(value), RED)
+            elif event == 'error_status':
+                self.error_status = value
+                self._update_status()
+        elif source == 'skinner':
+            if event == 'enabled':
+                self._set_toggle('skinner_btn', value)
+            elif event == 'click_count':
+                self._set_text('skinner_clicks', str(value), ORANGE)
+        elif source == 'haste':
+            if event == 'enabled':
+                self._set_toggle('haste_btn', value)
+            elif event == 'cast_count':
+                self._set_text('haste_casts', str(value), BLUE)
+    
+    def _apply_events(self):
+        """Apply every queued event (Tk thread)"""
+        try:
+            while True:
+                self._apply_event(*self.events.popleft())
+        except IndexError:
+            pass
+    
+    def _show_perf(self, figures):
+        """Draw one performance HUD sample"""
+        rate, target = figures['rate'], figures['target_rate']
+        if rate is None or target is None:
+            self._set_text('perf_rate', "-", TEXT_DIM)
+        else:
+            self._set_text('perf_rate', f"{rate:.1f}/{target:.1f} Hz", GREEN if rate >= 0.9 * target else ORANGE)
+        
+        if figures['p99_ms'] is None:
+            self._set_text('perf_latency', "-", TEXT_DIM)
+        else:
+            self._set_text('perf_latency', f"{figures['p50_ms']:.0f}/{figures['p99_ms']:.0f} ms",
+                           GREEN if figures['p99_ms'] <= self.config.monitor_frequency * 1000 else ORANGE)
+        
+        if figures['ocr_success'] is None:
+            self._set_text('perf_ocr', "-", TEXT_DIM)
+            self._set_text('perf_fallback', "-", TEXT_DIM)
+        else:
+            self._set_text('perf_ocr', f"{figures['ocr_success']:.0%}", GREEN if figures['ocr_success'] >= 0.9 else ORANGE)
+            self._set_text('perf_fallback', f"{figures['fallback_rate']:.0%}", TEXT_BEIGE)
+        
+        # Nothing is checked while paused, so the age only counts up - not a sensing problem
+        since_valid = figures['since_valid']
+        if since_valid is None:
+            self._set_text('perf_valid', "never", TEXT_DIM if self.paused else RED)
+        elif self.paused:
+            self._set_text('perf_valid', f"{since_valid:.1f}s ago", TEXT_DIM)
+        else:
+            self._set_text('perf_valid', f"{since_valid:.1f}s ago", GREEN if since_valid < 1.0 else RED)
+    
+    def _refresh_perf(self):
+        """Sample the performance HUD, then reschedule"""
+        if not self.root or not self._running or self._stop_requested:
+            return
+        try:
+            self._show_perf(self.perf_hud.sample())
+            self.root.after(self.PERF_REFRESH_MS, self._refresh_perf)
+        except tk.TclError:
+            pass
+    
     def _toggle_skinner(self):
         """Toggle skinner on/off"""
         if self.skinner:
             self.skinner.toggle()
-            self._update_skinner_btn()
+            self._apply_events()
     
     def _toggle_haste(self):
         """Toggle auto-haste on/off"""
         if self.auto_haste:
             self.auto_haste.toggle()
-            self._update_haste_btn()
+            self._apply_events()
     
     def _toggle_heal(self):
         """Toggle normal heal on/off"""
         self.health_monitor.toggle_heal()
-        self._update_heal_btn()
+        self._apply_events()
     
     def _toggle_critical(self):
         """Toggle critical heal on/off"""
         self.health_monitor.toggle_critical()
-        self._update_critical_btn()
-    
-    def _update_skinner_btn(self):
-        """Update skinner button appearance"""
-        if self.skinner and self.skinner_btn:
-            if self.skinner.is_enabled():
-                self.skinner_btn.config(text="[ON]", fg='#00c000')
-            else:
-                self.skinner_btn.config(text="[OFF]", fg='#c00000')
-    
-    def _update_haste_btn(self):
-        """Update haste button appearance"""
-        if self.auto_haste and self.haste_btn:
-            if self.auto_haste.is_enabled():
-                self.haste_btn.config(text="[ON]", fg='#00c000')
-            else:
-                self.haste_btn.config(text="[OFF]", fg='#c00000')
-    
-    def _update_heal_btn(self):
-        """Update heal button appearance"""
-        if self.heal_btn:
-            if self.health_monitor.heal_enabled:
-                self.heal_btn.config(text="[ON]", fg='#00c000')
-            else:
-                self.heal_btn.config(text="[OFF]", fg='#c00000')
-    
-    def _update_critical_btn(self):
-        """Update critical button appearance"""
-        if self.critical_btn:
-            if self.health_monitor.critical_enabled:
-                self.critical_btn.config(text="[ON]", fg='#00c000')
-            else:
-                self.critical_btn.config(text="[OFF]", fg='#c00000')
+        self._apply_events()
     
     def _start_drag(self, event):
         self._drag_start_x = event.x
@@ -344,73 +362,45 @@ class GameOverlay:
     
     def _on_close(self):
         self._stop_requested = True
-        self.stop()
+        self._running = False
+        self._do_quit()
     
-    def _update_display(self):
-        """Update the overlay display"""
-        if not self._running or not self.root or self._stop_requested:
+    def _tick(self):
+        """Apply queued events and the paused flag, then reschedule"""
+        if not self.root:
             return
         
-        try:
-            # Update bot status with error checking
-            is_paused = self.get_paused()
-            error_status = self.health_monitor.get_error_status()
-            
-            if error_status['is_warning']:
-                self.status_indicator.config(text="ERROR", fg='#ff0000')
-            elif error_status['has_error']:
-                self.status_indicator.config(text="DETECT...", fg='#ff8800')
-            elif is_paused:
-                self.status_indicator.config(text="PAUSED", fg='#c00000')
-            else:
-                self.status_indicator.config(text="ACTIVE", fg='#00c000')
-            
-            # Update skinner
-            if self.skinner:
-                self._update_skinner_btn()
-                stats = self.skinner.get_stats()
-                self.skinner_clicks_label.config(text=str(stats['click_count']))
-            
-            # Update auto-haste
-            if self.auto_haste:
-                self._update_haste_btn()
-                stats = self.auto_haste.get_stats()
-                self.haste_casts_label.config(text=str(stats['cast_count']))
-            
-            # Update heal counters
-            summary = self.health_monitor.get_healing_summary()
-            self.normal_heals_label.config(text=str(summary['moderate_heals']))
-            self.critical_heals_label.config(text=str(summary['critical_heals']))
-            
-            self.root.after(100, self._update_display)
-        except tk.TclError:
-            pass
-    
-    def _run_monitoring_cycle(self):
-        """Run one monitoring cycle"""
+        # A stop requested from another thread is carried out here, on the Tk thread
         if not self._running or self._stop_requested:
+            self._do_quit()
             return
         
         try:
-            if self._monitoring_callback:
-                self._monitoring_callback()
+            # Pausing is a plain flag on GameHelper, not an event
+            paused = self.get_paused()
+            if paused != self.paused:
+                self.paused = paused
+                self._update_status()
             
-            monitor_ms = int(self.config.monitor_frequency * 1000)
-            self.root.after(monitor_ms, self._run_monitoring_cycle)
+            self._apply_events()
+            self.root.after(self.EVENT_POLL_MS, self._tick)
         except tk.TclError:
             pass
     
-    def run_with_monitoring(self, monitoring_callback):
-        """Run overlay on main thread with integrated monitoring"""
-        self._monitoring_callback = monitoring_callback
+    def run(self):
+        """Run the overlay on the main thread (blocks until closed)"""
         self._running = True
         self._stop_requested = False
         
         self._create_window()
         print("🖥️  Overlay panel started")
         
-        self._update_display()
-        self._run_monitoring_cycle()
+        # Subscribe before drawing the current state so no change in between is lost
+        self._subscribe()
+        self._show_current_state()
+        self._tick()
+        if self.perf_hud:
+            self._refresh_perf()
         
         try:
             self.root.mainloop()
@@ -418,26 +408,24 @@ class GameOverlay:
             pass
         finally:
             self._running = False
+            self._unsubscribe()
             print("🖥️  Overlay panel stopped")
     
     def stop(self):
-        """Stop the overlay"""
+        """Stop the overlay - safe from any thread, the Tk thread quits on its next tick"""
         self._stop_requested = True
         self._running = False
-        if self.root:
-            try:
-                self.root.after(0, self._do_quit)
-            except:
-                pass
     
     def _do_quit(self):
+        if not self.root:
+            return
         try:
             self.root.quit()
             self.root.destroy()
         except:
             pass
         self.root = None
+        self.canvas = None
     
     def is_running(self):
         return self._running and not self._stop_requested
-
@@ -0,0 +1,64 @@
+"""
+Performance HUD - Rolling loop performance figures for the overlay
+
+The monitoring loop only bumps plain counters it already keeps (cycle count,
+OCR reads, successes and fallback runs, the cycle latency histogram). The
+HUD samples those cumulative counters from the Tk thread about once a second
+and differences the newest sample against one about a window old, so the
+figures cover the last few seconds and the loop does no extra work for them.
+"""
+
+import collections
+import time
+
+
+class PerfHUD:
+    """Rolling cycle rate, cycle latency and OCR rates over the last window"""
+
+    def __init__(self, config, sensing_loop, latency, ocr_processor, health_monitor):
+        self.config = config
+        self.sensing_loop = sensing_loop
+        self.latency = latency
+        self.ocr_processor = ocr_processor
+        self.health_monitor = health_monitor
+        self.window = config.overlay_perf_window
+
+        # (time, cycles, reads, successes, fallbacks, cycle bucket counts), oldest first
+        self.samples = collections.deque()
+
+    def _take_sample(self, now):
+        stats = self.ocr_processor.get_read_stats()
+        return (now, self.sensing_loop.cycle_count, stats['reads'], stats['successes'],
+                stats['fallbacks'], self.latency.bucket_counts('cycle'))
+
+    def sample(self, now=None):
+        """Sample the counters and get the figures over the last window
+
+        Rates and percentiles are None until there is data for them.
+        """
+        now = time.time() if now is None else now
+        current = self._take_sample(now)
+        self.samples.append(current)
+
+        # Keep the newest sample that is at least a window old as the baseline
+        while len(self.samples) > 2 and now - self.samples[1][0] >= self.window:
+            self.samples.popleft()
+        oldest = self.samples[0]
+
+        elapsed = now - oldest[0]
+        cycles = current[1] - oldest[1]
+        reads = current[2] - oldest[2]
+
+        p50 = self.latency.percentile_between(oldest[5], current[5], 0.50)
+        p99 = self.latency.percentile_between(oldest[5], current[5], 0.99)
+
+        last_valid = self.health_monitor.get_snapshot()['last_valid_time']
+        return {
+            'rate': cycles / elapsed if elapsed > 0 else None,
+            'target_rate': 1.0 / self.sensing_loop.period if self.sensing_loop.period > 0 else None,
+            'p50_ms': p50 * 1000 if p50 is not None else None,
+            'p99_ms': p99 * 1000 if p99 is not None else None,
+            'ocr_success': (current[3] - oldest[3]) / reads if reads else None,
+            'fallback_rate': (current[4] - oldest[4]) / reads if reads else None,
+            'since_valid': now - last_valid if last_valid is not None else None
+        }
@@ -95,6 +95,15 @@ class TestAutoHaste(unittest.TestCase):
         
         self.assertEqual(self.auto_haste.cast_count, initial_count + 1)
     
+    def test_toggle_and_cast_publish_events(self):
+        """Toggling on should publish the new state and the immediate cast"""
+        listener = Mock()
+        self.auto_haste.subscribe(listener)
+        
+        self.auto_haste.toggle()
+        
+        self.assertEqual([c[0] for c in listener.call_args_list], [('enabled', True), ('cast_count', 1)])
+    
     def test_cast_should_update_last_cast_time(self):
         """Cast should update the last_cast_time"""
         self.assertEqual(self.auto_haste.last_cast_time, 0)
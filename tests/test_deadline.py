@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Tests for deadline-bounded OCR
+
+Verifies that extraction stops when the budget runs out, flags the result,
+and never caches a truncated reading.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+import time
+
+import numpy as np
+
+# Mock pyautogui before any imports
+sys.modules['pyautogui'] = Mock()
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from processing.deadline import Deadline
+from processing.ocr_processor import OCRProcessor
+from processing.frame import Frame
+
+
+class DeadlineTestConfig:
+    """Test configuration for OCRProcessor with the frame cache enabled"""
+    def __init__(self, execution='sequential'):
+        self.max_hp = 1211
+        self.use_digit_recognizer = False
+        self.use_frame_cache = True
+        self.tesseract_backend = 'subprocess'
+        self.tesseract_language = 'eng'
+        self.adaptive_ocr = False
+        self.ocr_stats_file = None
+        self.ocr_execution = execution
+        self.ocr_workers = 2
+
+
+class TestDeadline(unittest.TestCase):
+    """Tests for the Deadline helper"""
+
+    def test_unbounded_deadline_never_expires(self):
+        """Without a budget nothing is truncated"""
+        deadline = Deadline(None)
+        self.assertFalse(deadline.expired())
+        self.assertIsNone(deadline.remaining())
+        self.assertFalse(deadline.truncated)
+
+    def test_expired_check_marks_truncation(self):
+        """An expired check flags the extraction as truncated"""
+        deadline = Deadline(0.0)
+        self.assertEqual(deadline.remaining(), 0.0)
+        self.assertTrue(deadline.expired())
+        self.assertTrue(deadline.truncated)
+
+
+class TestBudgetedOCR(unittest.TestCase):
+    """Tests for extract_number_with_budget"""
+
+    def setUp(self):
+        self.frame = Frame(np.full((12, 34, 3), 40, dtype=np.uint8))
+
+    def test_should_stop_and_return_best_guess(self):
+        """The first vote is returned, flagged, once the budget is spent"""
+        ocr = OCRProcessor(DeadlineTestConfig(), Mock())
+
+        def slow_variant(thresh, scale, config, value_type):
+            time.sleep(0.02)
+            return 1100
+
+        with patch.object(ocr, '_run_variant', side_effect=slow_variant) as mock_variant:
+            value, truncated = ocr.extract_number_with_budget((0, 0, 34, 12), 'hp', 0.01, 5, self.frame)
+
+        self.assertEqual(value, 1100)
+        self.assertTrue(truncated)
+        self.assertEqual(mock_variant.call_count, 1)
+        self.assertEqual(ocr.get_budget_stats(), {'calls': 1, 'truncated': 1, 'overruns': 1})
+
+    def test_should_not_cache_truncated_result(self):
+        """A truncated reading is re-run on the next cycle"""
+        ocr = OCRProcessor(DeadlineTestConfig(), Mock())
+
+        with patch.object(ocr, '_run_variant', return_value=None) as mock_variant:
+            value, truncated = ocr.extract_number_with_budget((0, 0, 34, 12), 'hp', 0.0, 5, self.frame)
+            self.assertIsNone(value)
+            self.assertTrue(truncated)
+            self.assertEqual(mock_variant.call_count, 0)
+
+            ocr.extract_number_with_budget((0, 0, 34, 12), 'hp', None, 5, self.frame)
+
+        self.assertGreater(mock_variant.call_count, 0)
+        self.assertEqual(ocr.get_cache_stats()['hits'], 0)
+
+    def test_should_finish_within_generous_budget(self):
+        """A run that completes in time is not flagged"""
+        ocr = OCRProcessor(DeadlineTestConfig(), Mock())
+
+        with patch.object(ocr, '_run_variant', return_value=1100):
+            value, truncated = ocr.extract_number_with_budget((0, 0, 34, 12), 'hp', 5.0, 0, self.frame)
+
+        self.assertEqual(value, 1100)
+        self.assertFalse(truncated)
+        self.assertEqual(ocr.get_budget_stats()['overruns'], 0)
+
+    def test_parallel_runner_should_respect_deadline(self):
+        """Pending variants are abandoned when the deadline passes"""
+        ocr = OCRProcessor(DeadlineTestConfig('parallel'), Mock())
+
+        def slow_variant(thresh, scale, config, value_type):
+            time.sleep(0.05)
+            return None
+
+        try:
+            with patch.object(ocr, '_run_variant', side_effect=slow_variant):
+                start = time.perf_counter()
+                value, truncated = ocr.extract_number_with_budget((0, 0, 34, 12), 'hp', 0.02, 5, self.frame)
+                elapsed = time.perf_counter() - start
+        finally:
+            ocr.executor.shutdown(wait=True, cancel_futures=True)
+
+        self.assertIsNone(value)
+        self.assertTrue(truncated)
+        self.assertLess(elapsed, 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
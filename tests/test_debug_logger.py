@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Tests for DebugLogger class
+
+Verifies level filtering, deferred %-formatting, collapsing of repeated
+per-cycle messages by template, batched writes from the writer thread,
+size-based rotation and the flushes on close, monitoring stop and crash.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import importlib.util
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# core/__init__ pulls in GameHelper with its input and GUI dependencies,
+# so the logger module is loaded on its own
+_spec = importlib.util.spec_from_file_location(
+    'debug_logger', os.path.join(os.path.dirname(__file__), '..', 'src', 'core', 'debug_logger.py'))
+debug_logger = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(debug_logger)
+DebugLogger = debug_logger.DebugLogger
+
+
+class LoggerTestConfig:
+    """Test configuration for DebugLogger"""
+    def __init__(self, directory):
+        self.debug_log_file = os.path.join(directory, 'debug.log')
+        self.enable_debug = True
+        self.debug_max_bytes = 0
+        self.debug_backup_count = 2
+        self.debug_flush_interval = 60.0  # Tests flush explicitly
+        self.debug_level = 'debug'
+        self.debug_collapse_window = 5.0
+        self.max_hp = 1000
+        self.cooldown = 0.1
+
+    def get_threshold_info(self):
+        return {'hp_critical': 550, 'hp_moderate': 750}
+
+
+class FakeTime:
+    """Manually advanced wall clock for the logger's timestamps"""
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+class CountingArg:
+    """Log argument that counts how often it is formatted"""
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "arg"
+
+
+class DebugLoggerTestCase(unittest.TestCase):
+    """Creates loggers in a temp dir and restores the hooks they install"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = LoggerTestConfig(self.tmp.name)
+        self.hooks = (sys.excepthook, threading.excepthook)
+        self.loggers = []
+
+    def tearDown(self):
+        for logger in self.loggers:
+            logger.close()
+        sys.excepthook, threading.excepthook = self.hooks
+        self.tmp.cleanup()
+
+    def make_logger(self):
+        logger = DebugLogger(self.config)
+        self.loggers.append(logger)
+        return logger
+
+    def read_lines(self, path=None):
+        """Log lines after the header, without their timestamps"""
+        with open(path or self.config.debug_log_file, encoding='utf-8') as f:
+            text = f.read()
+        if text.startswith("==="):
+            text = text.split("\n\n", 1)[1]
+        return [line.split("] ", 1)[1] for line in text.splitlines() if line]
+
+
+class TestLevelsAndFormatting(DebugLoggerTestCase):
+    """Tests for level filtering and deferred formatting"""
+
+    def test_records_below_level_are_dropped(self):
+        """Only records at or above the configured level are queued"""
+        self.config.debug_level = 'info'
+        logger = self.make_logger()
+        logger.log("trace %s", 1, level='trace')
+        logger.log("debug %s", 2)
+        logger.log("info %s", 3, level='info')
+        logger.log("warn %s", 4, level='warn')
+
+        self.assertEqual(len(logger.queue), 2)
+        self.assertFalse(logger.is_enabled('debug'))
+        self.assertTrue(logger.is_enabled('warn'))
+        logger.flush(final=True)
+        self.assertEqual(self.read_lines(), ["info 3", "warn 4"])
+
+    def test_unknown_level_treated_as_debug(self):
+        """A misspelled level logs at debug instead of raising"""
+        logger = self.make_logger()
+        logger.log("typo", level='dbug')
+        logger.flush(final=True)
+        self.assertEqual(self.read_lines(), ["typo"])
+
+    def test_args_formatted_on_flush_only(self):
+        """log() stores args; filtered records are never formatted"""
+        self.config.debug_level = 'info'
+        logger = self.make_logger()
+        arg = CountingArg()
+        logger.log("dropped %s", arg)
+        logger.log("kept %s", arg, level='info')
+        self.assertEqual(arg.formatted, 0)
+
+        logger.flush(final=True)
+        self.assertEqual(arg.formatted, 1)
+        self.assertEqual(self.read_lines(), ["kept arg"])
+
+    def test_mismatched_args_keep_raw_message(self):
+        """Args that do not fit the format string are appended instead of raising"""
+        logger = self.make_logger()
+        logger.log("no placeholder", 5)
+        logger.flush(final=True)
+        self.assertEqual(self.read_lines(), ["no placeholder (5,)"])
+
+
+class TestCollapsing(DebugLoggerTestCase):
+    """Tests for collapsing repeated messages by template"""
+
+    def setUp(self):
+        super().setUp()
+        self.clock = FakeTime()
+        patcher = patch.object(debug_logger, 'time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_cycles(self, logger, count, step=0.25):
+        """Log the alternating per-cycle lines of a healthy monitoring loop"""
+        for i in range(count):
+            logger.log("CACHE %s: Frame unchanged - reusing %s", 'HP', 900 + i % 3)
+            logger.log("DECISION: HP %.1f%% is healthy - no healing needed", 90.0 + i % 3 / 10)
+            self.clock.now += step
+
+    def test_alternating_templates_collapse(self):
+        """Interleaved per-cycle lines are each written once per window"""
+        logger = self.make_logger()
+        self.run_cycles(logger, 16)
+        logger.flush(final=True)
+
+        self.assertEqual(self.read_lines(), [
+            "CACHE HP: Frame unchanged - reusing 900",
+            "DECISION: HP 90.0% is healthy - no healing needed",
+            "CACHE HP: Frame unchanged - reusing 900 (+15 similar in 3.8s)",
+            "DECISION: HP 90.0% is healthy - no healing needed (+15 similar in 3.8s)",
+        ])
+
+    def test_counted_records_are_not_formatted(self):
+        """Records folded into a summary never have their args applied"""
+        logger = self.make_logger()
+        arg = CountingArg()
+        for _ in range(10):
+            logger.log("value %s", arg)
+        logger.flush(final=True)
+        self.assertEqual(arg.formatted, 2)  # The first record and the summary
+
+    def test_new_window_after_collapse_window(self):
+        """A template is written again once its window has ended, after its summary"""
+        logger = self.make_logger()
+        self.run_cycles(logger, 24)  # 6 seconds
+        logger.flush(final=True)
+        lines = self.read_lines()
+
+        self.assertEqual(len(lines), 8)
+        self.assertIn("(+19 similar in 4.8s)", lines[2])
+        self.assertEqual(lines[3], "CACHE HP: Frame unchanged - reusing 902")
+
+    def test_info_and_warn_always_written(self):
+        """Key presses and warnings are never folded"""
+        logger = self.make_logger()
+        for _ in range(3):
+            logger.log("KEY_PRESS: %s pressed", 'F1', level='info')
+            logger.log("ERROR: %s", 'boom', level='warn')
+        logger.flush(final=True)
+        self.assertEqual(len(self.read_lines()), 6)
+
+    def test_open_windows_reported_when_they_end(self):
+        """A periodic flush reports a summary only after its window has ended"""
+        logger = self.make_logger()
+        for _ in range(3):
+            logger.log("tick")
+        logger.flush()
+        self.assertEqual(self.read_lines(), ["tick"])
+
+        self.clock.now += 10
+        logger.flush()
+        self.assertEqual(self.read_lines(), ["tick", "tick (+2 similar in 0.0s)"])
+
+
+class TestWriterAndRotation(DebugLoggerTestCase):
+    """Tests for the background writer, rotation and guaranteed flushes"""
+
+    def wait_for_lines(self, count, timeout=2.0):
+        """Poll the file until the writer thread has written count lines"""
+        end = time.monotonic() + timeout
+        while time.monotonic() < end:
+            lines = self.read_lines()
+            if len(lines) >= count:
+                return lines
+            time.sleep(0.01)
+        return self.read_lines()
+
+    def test_writer_thread_writes_batches(self):
+        """Queued records reach the file from the writer thread, in order"""
+        self.config.debug_flush_interval = 0.01
+        logger = self.make_logger()
+        for i in range(20):
+            logger.log("record %s", i, level='info')
+
+        self.assertEqual(self.wait_for_lines(20), [f"record {i}" for i in range(20)])
+        self.assertEqual(logger._writer.name, 'debug-log')
+        self.assertEqual(len(logger.queue), 0)
+
+    def test_rotation_caps_file_size_and_keeps_backups(self):
+        """Files never pass max_bytes; backups shift up to backup_count"""
+        self.config.debug_max_bytes = 300
+        logger = self.make_logger()
+        for i in range(60):
+            logger.log("record %02d", i, level='info')
+            if i % 7 == 0:
+                logger.flush()
+        logger.log("one large batch %s", "x" * 50, level='info')
+        for i in range(60, 90):
+            logger.log("record %02d", i, level='info')
+        logger.flush(final=True)
+
+        path = self.config.debug_log_file
+        files = [path + '.2', path + '.1', path]
+        for name in files:
+            self.assertLessEqual(os.path.getsize(name), 300, name)
+        self.assertFalse(os.path.exists(path + '.3'))
+
+        # Oldest backup first, the lines run on without a gap across files
+        records = [int(line.split()[1]) for name in files for line in self.read_lines(name)
+                   if line.startswith("record")]
+        self.assertEqual(records, list(range(records[0], 90)))
+
+    def test_close_flushes_queue(self):
+        """Records still queued are written when the logger closes"""
+        logger = self.make_logger()
+        logger.log("last words", level='info')
+        logger.close()
+        self.assertEqual(self.read_lines(), ["last words"])
+        self.assertFalse(logger._writer.is_alive())
+
+    def test_monitoring_stop_flushes(self):
+        """Stopping monitoring writes everything queued, summaries included"""
+        logger = self.make_logger()
+        for _ in range(3):
+            logger.log("healthy")
+        logger.log_monitoring_stop("USER")
+
+        lines = self.read_lines()
+        self.assertEqual(lines[0], "healthy")
+        self.assertIn("healthy (+2 similar in 0.0s)", lines)
+        self.assertIn("=== MONITORING STOPPED BY USER ===", lines)
+
+    def test_thread_crash_flushes_queue(self):
+        """An exception ending a worker thread is logged with the queued records"""
+        threading.excepthook = previous = Mock()
+        logger = self.make_logger()
+        logger.log("before the crash", level='info')
+
+        def crash():
+            raise RuntimeError("boom")
+        worker = threading.Thread(target=crash, name='sensing')
+        worker.start()
+        worker.join()
+
+        self.assertEqual(self.read_lines(), ["before the crash",
+                                             "CRASH: Unhandled RuntimeError in thread sensing: boom"])
+        previous.assert_called_once()
+
+    def test_main_thread_crash_flushes_queue(self):
+        """An unhandled exception on the main thread is logged and chained"""
+        sys.excepthook = previous = Mock()
+        logger = self.make_logger()
+        logger.log("before the crash", level='info')
+        error = ValueError("bad")
+        sys.excepthook(ValueError, error, None)
+
+        self.assertEqual(self.read_lines(), ["before the crash", "CRASH: Unhandled ValueError: bad"])
+        previous.assert_called_once_with(ValueError, error, None)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
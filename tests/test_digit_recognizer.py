@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Tests for DigitRecognizer class
+
+Verifies template-matching recognition of the HP number without Tesseract,
+and that OCRProcessor accepts template readings in the same range as
+Tesseract readings.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+import tempfile
+
+import cv2
+import numpy as np
+
+# Mock pyautogui before any imports
+sys.modules['pyautogui'] = Mock()
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from processing.digit_recognizer import DigitRecognizer
+from processing.ocr_processor import OCRProcessor
+
+
+class RecognizerTestConfig:
+    """Test configuration for DigitRecognizer"""
+    def __init__(self, atlas_file=None):
+        self.digit_atlas_file = atlas_file
+        self.template_min_confidence = 0.9
+
+
+class TemplatePathTestConfig(RecognizerTestConfig):
+    """Test configuration for OCRProcessor with template matching first"""
+    def __init__(self):
+        super().__init__()
+        self.max_hp = 1211
+        self.use_digit_recognizer = True
+        self.use_frame_cache = False
+        self.tesseract_backend = 'subprocess'
+        self.tesseract_language = 'eng'
+        self.ocr_execution = 'sequential'
+        self.ocr_workers = 1
+        self.adaptive_ocr = False
+        self.ocr_stats_file = None
+
+
+def render_number(text):
+    """Render digits in a fixed-advance font, light text on a dark background"""
+    image = np.full((20, 12 * len(text) + 6), 30, dtype=np.uint8)
+    for i, char in enumerate(text):
+        cv2.putText(image, char, (3 + 12 * i, 15), cv2.FONT_HERSHEY_PLAIN, 1.0, 220, 1)
+    return image
+
+
+class TestDigitRecognizer(unittest.TestCase):
+    """Tests for DigitRecognizer functionality"""
+
+    def setUp(self):
+        """Set up a recognizer trained on all ten digits"""
+        self.debug_logger = Mock()
+        self.recognizer = DigitRecognizer(RecognizerTestConfig(), self.debug_logger)
+        self.recognizer.learn_text(render_number('0123456789'), '0123456789')
+
+    def test_should_start_without_atlas(self):
+        """A fresh recognizer has no templates and reads nothing"""
+        recognizer = DigitRecognizer(RecognizerTestConfig())
+        self.assertFalse(recognizer.has_atlas())
+        self.assertEqual(recognizer.recognize(render_number('1211')), (None, 0.0))
+
+    def test_should_learn_all_digits(self):
+        """Learning a full digit strip covers every digit"""
+        self.assertEqual(self.recognizer.known_digits(), set(range(10)))
+
+    def test_should_recognize_numbers(self):
+        """Numbers drawn in the learned font are read exactly"""
+        for text in ['1211', '907', '58', '1034', '4444']:
+            with self.subTest(text=text):
+                value, confidence = self.recognizer.recognize(render_number(text))
+                self.assertEqual(value, int(text))
+                self.assertGreater(confidence, 0.9)
+
+    def test_should_reject_low_confidence_match(self):
+        """A glyph that matches no template is not returned as confident"""
+        image = render_number('123')
+        image[:, 27:] = 30  # Replace the last digit with a cross, which is not a digit
+        cv2.line(image, (28, 3), (36, 15), 220, 1)
+        cv2.line(image, (36, 3), (28, 15), 220, 1)
+        self.assertIsNone(self.recognizer.recognize_confident(image))
+
+    def test_should_not_learn_when_glyph_count_mismatches(self):
+        """Readings whose digit count disagrees with the glyphs are ignored"""
+        self.assertFalse(self.recognizer.learn(render_number('12'), 123))
+
+    def test_should_not_duplicate_known_templates(self):
+        """Relearning the same glyphs does not grow the atlas"""
+        self.assertFalse(self.recognizer.learn(render_number('1211'), 1211))
+
+    def test_should_not_learn_when_frozen(self):
+        """A frozen recognizer keeps its atlas as loaded"""
+        recognizer = DigitRecognizer(RecognizerTestConfig())
+        recognizer.learning = False
+        self.assertFalse(recognizer.learn_text(render_number('0123456789'), '0123456789'))
+        self.assertFalse(recognizer.has_atlas())
+
+    def test_should_persist_atlas(self):
+        """Templates saved to disk are loaded by a new recognizer"""
+        with tempfile.TemporaryDirectory() as tmp:
+            atlas_file = os.path.join(tmp, 'atlas.npz')
+            recognizer = DigitRecognizer(RecognizerTestConfig(atlas_file))
+            recognizer.learn_text(render_number('0123456789'), '0123456789')
+
+            reloaded = DigitRecognizer(RecognizerTestConfig(atlas_file))
+            value, _ = reloaded.recognize(render_number('865'))
+            self.assertEqual(value, 865)
+
+
+class TestTemplatePath(unittest.TestCase):
+    """Tests that template readings are validated like Tesseract readings"""
+
+    def setUp(self):
+        self.ocr = OCRProcessor(TemplatePathTestConfig(), Mock())
+        self.pixels = np.full((20, 42, 3), 30, dtype=np.uint8)
+
+    def tearDown(self):
+        self.ocr.close()
+
+    def read(self, template_value, tesseract_text=''):
+        with patch.object(self.ocr, 'capture_region', return_value=self.pixels), \
+             patch.object(self.ocr.digit_recognizer, 'recognize_confident', return_value=template_value), \
+             patch.object(self.ocr.tesseract, 'image_to_string', return_value=tesseract_text) as tesseract:
+            return self.ocr.extract_number_from_region((0, 0, 42, 20), 'hp'), tesseract.call_count
+
+    def test_valid_template_reading_skips_tesseract(self):
+        """An in-range template match is returned without OCR"""
+        self.assertEqual(self.read(864), (864, 0))
+
+    def test_template_reading_below_minimum_falls_back(self):
+        """A template match Tesseract's parse would reject is not returned"""
+        value, calls = self.read(42)
+        self.assertIsNone(value)
+        self.assertGreater(calls, 0)
+
+    def test_same_bounds_for_both_paths(self):
+        """Values at and outside the bounds are judged the same on either path"""
+        for value in [99, 100, 1211, 1212]:
+            with self.subTest(value=value):
+                template_value, _ = self.read(value)
+                tesseract_value, _ = self.read(None, str(value))
+                self.assertEqual(template_value, tesseract_value)
+                self.assertEqual(template_value is not None, self.ocr.is_valid_reading(value))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
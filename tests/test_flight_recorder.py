@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Tests for the flight recorder
+
+Verifies the ring keeps the most recent cycles, survives being reopened from
+disk, skips torn slots and dumps a readable timeline.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+import tempfile
+
+import cv2
+import numpy as np
+
+# Mock pyautogui before any imports
+sys.modules['pyautogui'] = Mock()
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from processing.flight_recorder import FlightRecorder, read_slots, dump_cycles
+from processing.frame import Frame
+from monitors.health_monitor import HealthMonitor
+
+
+class FlightTestConfig:
+    """Test configuration for FlightRecorder and HealthMonitor"""
+    def __init__(self, directory):
+        self.monitor_frequency = 0.05
+        self.adaptive_sampling = False
+        self.sampling_max_rate = 20.0
+        self.flight_recorder_file = os.path.join(directory, 'flight.bin')
+        self.flight_recorder_seconds = 0.2
+        self.flight_recorder_region_bytes = 34 * 12 * 3
+        self.flight_dump_dir = os.path.join(directory, 'flights')
+        self.max_hp = 1000
+        self.hp_critical_threshold = 0.55
+        self.hp_threshold = 0.75
+        self.cooldown = 0.1
+        self.critical_heal_key = 'f6'
+        self.heal_key = 'f1'
+        self.max_failures_warning = 5
+
+
+class TestFlightRecorder(unittest.TestCase):
+    """Tests for the memory-mapped ring"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = FlightTestConfig(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def frames(self, shade):
+        return {'hp': Frame(np.full((12, 34, 3), shade, dtype=np.uint8), (5, 6, 34, 12))}
+
+    def test_ring_keeps_last_cycles(self):
+        """Only the last seconds (4 slots at 20 Hz) are kept, oldest first"""
+        recorder = FlightRecorder(self.config)
+        for i in range(6):
+            recorder.record(100.0 + i, self.frames(i), 900 - i, 'healthy')
+        cycles = recorder.read()
+        recorder.close()
+
+        self.assertEqual([c['sequence'] for c in cycles], [3, 4, 5, 6])
+        self.assertEqual([c['hp'] for c in cycles], [898, 897, 896, 895])
+        self.assertEqual(cycles[-1]['frames']['hp']['region'], (5, 6, 34, 12))
+        self.assertTrue((cycles[-1]['frames']['hp']['pixels'] == 5).all())
+
+    def test_ring_sized_for_fastest_adaptive_rate(self):
+        """With adaptive sampling the ring covers the seconds at the maximum rate"""
+        self.config.monitor_frequency = 0.2
+        self.config.adaptive_sampling = True
+        self.config.sampling_max_rate = 40.0
+        recorder = FlightRecorder(self.config)
+        recorder.close()
+
+        self.assertEqual(recorder.slots, 8)
+
+    def test_recording_readable_from_disk(self):
+        """The ring is on disk without a close, and kept as .prev on restart"""
+        recorder = FlightRecorder(self.config)
+        recorder.record(100.0, self.frames(1), 400, 'critical', 'f6', 100.01)
+        recorder.record(100.05, {}, None, 'invalid')
+
+        with open(self.config.flight_recorder_file, 'rb') as f:
+            cycles = read_slots(f.read())
+        self.assertEqual((cycles[0]['decision'], cycles[0]['key'], cycles[0]['key_time']), ('critical', 'f6', 100.01))
+        self.assertEqual((cycles[1]['hp'], cycles[1]['frames']), (None, {}))
+
+        recorder.close()
+        FlightRecorder(self.config).close()
+        with open(self.config.flight_recorder_file + '.prev', 'rb') as f:
+            self.assertEqual(len(read_slots(f.read())), 2)
+
+    def test_large_region_is_cropped(self):
+        """A region over the byte limit keeps its top rows"""
+        recorder = FlightRecorder(self.config)
+        recorder.record(100.0, {'hp_bar': Frame(np.zeros((40, 34, 3), dtype=np.uint8), (0, 0, 34, 40))}, 900, 'healthy')
+        frame = recorder.read()[0]['frames']['hp_bar']
+        recorder.close()
+
+        self.assertEqual(frame['pixels'].shape, (12, 34, 3))
+        self.assertEqual(frame['height'], 40)
+
+    def test_dump_writes_timeline_and_frames(self):
+        """The dump lists every cycle and saves its frames as PNGs"""
+        recorder = FlightRecorder(self.config)
+        recorder.record(100.0, self.frames(1), 900, 'healthy')
+        recorder.record(100.05, self.frames(2), 400, 'critical', 'f6', 100.06)
+        output_dir = recorder.dump(os.path.join(self.tmp.name, 'dump'))
+        recorder.close()
+
+        with open(os.path.join(output_dir, 'timeline.txt')) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertIn('critical', lines[2])
+        self.assertIn('F6', lines[2])
+        self.assertTrue(os.path.exists(os.path.join(output_dir, 'frames', '00000002_hp.png')))
+
+    def test_dump_cycles_after_wrap(self):
+        """A wrapped recording read from disk dumps oldest first with each cycle's fields"""
+        recorder = FlightRecorder(self.config)
+        for i in range(6):
+            if i == 4:
+                recorder.record(100.0 + i, self.frames(10 * i), 900 - i, 'critical', 'f6', 104.01)
+            else:
+                recorder.record(100.0 + i, self.frames(10 * i), 900 - i, 'healthy')
+        recorder.close()
+
+        with open(self.config.flight_recorder_file, 'rb') as f:
+            cycles = read_slots(f.read())
+        output_dir = os.path.join(self.tmp.name, 'post-mortem')
+        timeline = dump_cycles(cycles, output_dir)
+
+        with open(timeline) as f:
+            rows = [line.split() for line in f.read().splitlines()[1:]]
+        self.assertEqual([row[1:5] for row in rows], [
+            ['3', '898', 'healthy', '-'],
+            ['4', '897', 'healthy', '-'],
+            ['5', '896', 'critical', 'F6'],
+            ['6', '895', 'healthy', '-'],
+        ])
+        self.assertEqual([row[5] for row in rows], [f"{seq:08d}_hp.png" for seq in range(3, 7)])
+
+        # Overwritten slots leave no frames behind, kept ones hold their own pixels
+        frames_dir = os.path.join(output_dir, 'frames')
+        self.assertEqual(sorted(os.listdir(frames_dir)), [f"{seq:08d}_hp.png" for seq in range(3, 7)])
+        pixels = cv2.imread(os.path.join(frames_dir, '00000005_hp.png'))
+        self.assertEqual(pixels.shape, (12, 34, 3))
+        self.assertTrue((pixels == 40).all())
+
+    def test_automatic_dumps_are_rate_limited(self):
+        """Repeated critical heals produce one dump per interval"""
+        recorder = FlightRecorder(self.config)
+        recorder.record(100.0, self.frames(1), 400, 'critical', 'f6', 100.0)
+        with patch('processing.flight_recorder.threading.Thread'):
+            self.assertTrue(recorder.dump_in_background())
+            self.assertFalse(recorder.dump_in_background())
+        recorder.close()
+
+    def test_health_monitor_reports_decision(self):
+        """HealthMonitor exposes the decision and key of its last check"""
+        monitor = HealthMonitor(self.config, Mock())
+        with patch('monitors.health_monitor.pyautogui.press'):
+            monitor.check_hp_and_heal(400)
+            self.assertEqual((monitor.last_decision, monitor.last_key), ('critical', 'f6'))
+            monitor.check_hp_and_heal(400)
+            self.assertEqual((monitor.last_decision, monitor.last_key), ('critical', None))
+            monitor.check_hp_and_heal(950)
+            self.assertEqual(monitor.last_decision, 'healthy')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for the Frame class
+
+Verifies that derived images are computed once and that the primary and
+fallback OCR passes share a single capture.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+import numpy as np
+
+# Mock pyautogui before any imports
+sys.modules['pyautogui'] = Mock()
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from processing.frame import Frame
+from processing.ocr_processor import OCRProcessor
+
+
+class FrameTestConfig:
+    """Test configuration for OCRProcessor without the cache or templates"""
+    def __init__(self):
+        self.max_hp = 1211
+        self.use_digit_recognizer = False
+        self.use_frame_cache = False
+        self.tesseract_backend = 'subprocess'
+        self.tesseract_language = 'eng'
+        self.ocr_execution = 'sequential'
+        self.ocr_workers = 1
+        self.adaptive_ocr = False
+        self.ocr_stats_file = None
+
+
+class TestFrame(unittest.TestCase):
+    """Tests for Frame memoization"""
+
+    def setUp(self):
+        pixels = np.zeros((12, 34, 3), dtype=np.uint8)
+        pixels[:, 10:20] = 220
+        self.frame = Frame(pixels, (0, 0, 34, 12), timestamp=100.0)
+
+    def test_should_memoize_gray(self):
+        """Grayscale is converted once"""
+        self.assertIs(self.frame.gray(), self.frame.gray())
+        self.assertEqual(self.frame.gray().shape, (12, 34))
+
+    def test_should_memoize_threshold_variants(self):
+        """Each threshold method runs once per frame"""
+        threshold = Mock(side_effect=lambda gray, method: gray > 100)
+        first = self.frame.threshold('OTSU', threshold)
+        second = self.frame.threshold('OTSU', threshold)
+        self.frame.threshold('InvOTSU', threshold)
+
+        self.assertIs(first, second)
+        self.assertEqual(threshold.call_count, 2)
+
+    def test_should_keep_timestamp_and_digest(self):
+        """Timestamp is kept and the digest matches identical pixels"""
+        other = Frame(self.frame.pixels.copy())
+        self.assertEqual(self.frame.timestamp, 100.0)
+        self.assertEqual(self.frame.digest(), other.digest())
+        self.assertIn('34x12', self.frame.describe())
+
+
+class TestSingleCapture(unittest.TestCase):
+    """Tests that one cycle captures the region exactly once"""
+
+    def setUp(self):
+        self.ocr = OCRProcessor(FrameTestConfig(), Mock())
+
+    def test_fallback_should_reuse_primary_frame(self):
+        """Primary and fallback passes share one capture and one gray conversion"""
+        pixels = np.full((12, 34, 3), 40, dtype=np.uint8)
+        with patch.object(self.ocr, 'capture_region', return_value=pixels) as mock_capture, \
+             patch('processing.ocr_processor.cv2.cvtColor') as mock_convert, \
+             patch('processing.frame.to_gray', return_value=pixels[:, :, 0]) as mock_gray, \
+             patch.object(self.ocr.tesseract, 'image_to_string', return_value=''):
+            result = self.ocr.extract_number_with_fallback((0, 0, 34, 12), 'hp', consecutive_failures=5)
+
+        self.assertIsNone(result)
+        self.assertEqual(mock_capture.call_count, 1)
+        self.assertEqual(mock_gray.call_count, 1)
+        mock_convert.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
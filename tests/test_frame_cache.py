@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for FrameCache and its use in OCRProcessor
+
+Verifies that identical region pixels skip OCR and that hits and misses
+are counted.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+import numpy as np
+
+# Mock pyautogui before any imports
+sys.modules['pyautogui'] = Mock()
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from processing.frame_cache import FrameCache
+from processing.ocr_processor import OCRProcessor
+
+
+class CacheTestConfig:
+    """Test configuration for OCRProcessor with only the frame cache enabled"""
+    def __init__(self):
+        self.max_hp = 1211
+        self.use_digit_recognizer = False
+        self.use_frame_cache = True
+        self.tesseract_backend = 'subprocess'
+        self.tesseract_language = 'eng'
+        self.ocr_execution = 'sequential'
+        self.ocr_workers = 1
+        self.adaptive_ocr = False
+        self.ocr_stats_file = None
+
+
+class TestFrameCache(unittest.TestCase):
+    """Tests for FrameCache functionality"""
+
+    def setUp(self):
+        self.cache = FrameCache()
+        self.frame = np.full((12, 34, 3), 40, dtype=np.uint8)
+
+    def test_should_miss_on_first_frame(self):
+        """The first lookup for a region is always a miss"""
+        hit, value = self.cache.get('hp', self.cache.checksum(self.frame))
+        self.assertFalse(hit)
+        self.assertIsNone(value)
+        self.assertEqual(self.cache.get_stats()['misses'], 1)
+
+    def test_should_hit_on_identical_pixels(self):
+        """Identical pixels return the stored value"""
+        self.cache.put('hp', self.cache.checksum(self.frame), 1100)
+        hit, value = self.cache.get('hp', self.cache.checksum(self.frame.copy()))
+        self.assertTrue(hit)
+        self.assertEqual(value, 1100)
+
+    def test_should_miss_on_changed_pixels(self):
+        """A single changed pixel invalidates the cached value"""
+        self.cache.put('hp', self.cache.checksum(self.frame), 1100)
+        changed = self.frame.copy()
+        changed[5, 5, 0] = 41
+        hit, _ = self.cache.get('hp', self.cache.checksum(changed))
+        self.assertFalse(hit)
+
+    def test_should_report_hit_rate(self):
+        """Hit rate is hits over all lookups"""
+        checksum = self.cache.checksum(self.frame)
+        self.cache.get('hp', checksum)
+        self.cache.put('hp', checksum, 900)
+        self.cache.get('hp', checksum)
+        self.cache.get('hp', checksum)
+        stats = self.cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (2, 1))
+        self.assertAlmostEqual(stats['hit_rate'], 2 / 3)
+
+
+class TestOCRProcessorFrameCache(unittest.TestCase):
+    """Tests for the cache in front of the OCR cascade"""
+
+    def setUp(self):
+        self.ocr = OCRProcessor(CacheTestConfig(), Mock())
+        self.frame = np.full((12, 34, 3), 40, dtype=np.uint8)
+
+    def test_should_skip_ocr_for_unchanged_frame(self):
+        """OCR runs once when the same frame is seen twice"""
+        with patch.object(self.ocr, 'capture_region', return_value=self.frame), \
+             patch.object(self.ocr, '_extract_with_fallback', return_value=1000) as mock_extract:
+            first = self.ocr.extract_number_with_fallback((0, 0, 34, 12), 'hp')
+            second = self.ocr.extract_number_with_fallback((0, 0, 34, 12), 'hp')
+
+        self.assertEqual((first, second), (1000, 1000))
+        self.assertEqual(mock_extract.call_count, 1)
+        self.assertEqual(self.ocr.get_cache_stats()['hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
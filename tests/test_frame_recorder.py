@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for frame recording and replay
+
+Verifies that recorded cycles round-trip through the store and that the
+replay stand-ins serve recorded frames and capture key presses.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Mock pyautogui before any imports
+sys.modules['pyautogui'] = Mock()
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from processing.frame import Frame
+from processing.frame_recorder import FrameRecorder, FrameReader
+from processing.screen_capture import ReplayCapture
+from monitors.health_monitor import HealthMonitor
+from monitors.replay_keyboard import ReplayKeyboard
+
+
+class ReplayTestConfig:
+    """Test configuration for HealthMonitor"""
+    def __init__(self):
+        self.max_hp = 1000
+        self.hp_critical_threshold = 0.55
+        self.hp_threshold = 0.75
+        self.cooldown = 1.0
+        self.critical_heal_key = 'f6'
+        self.heal_key = 'f1'
+        self.max_failures_warning = 5
+
+
+class TestFrameRecorder(unittest.TestCase):
+    """Tests for FrameRecorder and FrameReader"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'session.frames')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_cycles_round_trip(self):
+        """Pixels, regions, timestamps and empty cycles survive the store"""
+        hp = np.random.randint(0, 255, (12, 34, 3), dtype=np.uint8)
+        bar = np.random.randint(0, 255, (4, 100, 4), dtype=np.uint8)
+        changed = hp.copy()
+        changed[0, 0] ^= 1
+
+        recorder = FrameRecorder(self.path)
+        recorder.record({'hp': Frame(hp, (10, 20, 34, 12), 100.0), 'hp_bar': Frame(bar, (0, 40, 100, 4), 100.0)})
+        recorder.record({'hp': Frame(hp.copy(), (10, 20, 34, 12), 100.05)})
+        recorder.record({}, 100.1)
+        recorder.record({'hp': Frame(changed, (10, 20, 34, 12), 100.15)})
+        recorder.close()
+
+        cycles = list(FrameReader(self.path))
+        self.assertEqual([timestamp for timestamp, _ in cycles], [100.0, 100.05, 100.1, 100.15])
+        self.assertEqual(cycles[0][1]['hp'].region, (10, 20, 34, 12))
+        np.testing.assert_array_equal(cycles[0][1]['hp_bar'].pixels, bar)
+        np.testing.assert_array_equal(cycles[1][1]['hp'].pixels, hp)
+        self.assertEqual(cycles[2][1], {})
+        np.testing.assert_array_equal(cycles[3][1]['hp'].pixels, changed)
+        self.assertEqual(cycles[3][1]['hp'].timestamp, 100.15)
+
+        # The unchanged second frame is stored without pixels
+        stats = recorder.get_stats()
+        self.assertEqual((stats['cycles'], stats['frames'], stats['repeats']), (4, 4, 1))
+
+    def test_truncated_store_drops_partial_cycle(self):
+        """A recording cut off mid-cycle replays up to the last complete cycle"""
+        recorder = FrameRecorder(self.path)
+        for i in range(3):
+            recorder.record({'hp': Frame(np.full((12, 34, 3), i, dtype=np.uint8), (0, 0, 34, 12), float(i))})
+        recorder.close()
+
+        with open(self.path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.path) - 5)
+
+        self.assertEqual(len(list(FrameReader(self.path))), 2)
+
+    def test_rejects_foreign_file(self):
+        """A file that is not a recording is refused"""
+        with open(self.path, 'wb') as f:
+            f.write(b'not a recording')
+        with self.assertRaises(RuntimeError):
+            list(FrameReader(self.path))
+
+
+class TestReplayStandIns(unittest.TestCase):
+    """Tests for ReplayCapture and ReplayKeyboard"""
+
+    def test_replay_capture_serves_recorded_cycle(self):
+        """Regions come from the loaded cycle, stamped with its recorded time"""
+        pixels = np.zeros((12, 34, 3), dtype=np.uint8)
+        capture = ReplayCapture()
+        capture.load(123.0, {'hp': Frame(pixels, (10, 20, 34, 12), 123.0)})
+
+        frames = capture.grab_regions({'hp': (10, 20, 34, 12), 'hp_bar': None})
+        self.assertIs(frames['hp'], pixels)
+        self.assertEqual(capture.now(), 123.0)
+        with self.assertRaises(RuntimeError):
+            capture.grab((0, 0, 5, 5))
+
+    def test_health_monitor_uses_stand_ins(self):
+        """Presses go to the stand-in keyboard and cooldowns follow the replay clock"""
+        capture = ReplayCapture()
+        keyboard = ReplayKeyboard(capture.now)
+        monitor = HealthMonitor(ReplayTestConfig(), Mock(), None, keyboard, capture.now)
+
+        with patch('monitors.health_monitor.pyautogui.press') as mock_press:
+            for timestamp in [100.0, 100.5, 101.0]:
+                capture.load(timestamp, {})
+                monitor.check_hp_and_heal(400)
+
+        mock_press.assert_not_called()
+        self.assertEqual(keyboard.presses, [(100.0, 'f6'), (101.0, 'f6')])
+        self.assertEqual(keyboard.get_summary(), {'f6': 2})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -9,6 +9,7 @@ import unittest
 from unittest.mock import Mock, patch
 import sys
 import os
+import threading
 
 # Mock pyautogui before any imports
 sys.modules['pyautogui'] = Mock()
@@ -385,7 +386,20 @@ class TestHealthMonitorDebugLogger(unittest.TestCase):
         
         health_monitor.debug_log("test message")
         debug_logger.log.assert_called_with("test message")
-    
+
+    def test_key_press_logged_lazily_at_info(self):
+        """Key presses pass unformatted args at info level"""
+        debug_logger = Mock()
+        health_monitor = HealthMonitor(self.config, debug_logger)
+
+        with patch('monitors.health_monitor.pyautogui.press'):
+            health_monitor.check_hp_and_heal(400)
+
+        key_calls = [c for c in debug_logger.log.call_args_list if c[0][0].startswith("KEY_PRESS")]
+        self.assertEqual(len(key_calls), 1)
+        self.assertEqual(key_calls[0][0][1], 'F6')
+        self.assertEqual(key_calls[0][1], {'level': 'info'})
+
     def test_debug_log_handles_no_logger(self):
         """debug_log should handle missing logger gracefully"""
         health_monitor = HealthMonitor(self.config, None)
@@ -394,6 +408,69 @@ class TestHealthMonitorDebugLogger(unittest.TestCase):
         health_monitor.debug_log("test message")
 
 
+
+class TestHealthMonitorSnapshot(unittest.TestCase):
+    """Tests for the snapshot published to the overlay thread"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.config = TestConfig()
+        self.health_monitor = HealthMonitor(self.config, Mock())
+    
+    def test_snapshot_available_before_first_reading(self):
+        """A snapshot exists as soon as the monitor is created"""
+        snapshot = self.health_monitor.get_snapshot()
+        self.assertIsNone(snapshot['hp_value'])
+        self.assertEqual(snapshot['critical_heals'], 0)
+    
+    def test_snapshot_replaced_after_decision(self):
+        """Each decision publishes a new snapshot with the updated counters"""
+        before = self.health_monitor.get_snapshot()
+        with patch('monitors.health_monitor.pyautogui.press'):
+            self.health_monitor.check_hp_and_heal(400)
+        after = self.health_monitor.get_snapshot()
+        
+        self.assertIsNot(before, after)
+        self.assertEqual(after['hp_value'], 400)
+        self.assertEqual(after['critical_heals'], 1)
+        self.assertEqual(before['critical_heals'], 0)
+    
+    def test_snapshot_tracks_failures_and_toggles(self):
+        """Failures and toggles are reflected in the snapshot"""
+        for _ in range(3):
+            self.health_monitor.check_hp_and_heal(None)
+        self.health_monitor.toggle_heal()
+        snapshot = self.health_monitor.get_snapshot()
+        
+        self.assertTrue(snapshot['error_status']['has_error'])
+        self.assertFalse(snapshot['heal_enabled'])
+        self.assertTrue(snapshot['critical_enabled'])
+    
+    def test_last_valid_time_follows_injected_clock(self):
+        """Replays stamp the last valid reading with the recording's clock"""
+        monitor = HealthMonitor(self.config, Mock(), clock=lambda: 42.0)
+        monitor.check_hp_and_heal(900)
+        self.assertEqual(monitor.get_snapshot()['last_valid_time'], 42.0)
+    
+    def test_toggle_keeps_hp_value(self):
+        """A toggle republishes the snapshot with the last HP value"""
+        self.health_monitor.check_hp_and_heal(900)
+        self.health_monitor.toggle_critical()
+        self.assertEqual(self.health_monitor.get_snapshot()['hp_value'], 900)
+    
+    def test_concurrent_publishers_report_every_toggle(self):
+        """Toggles from another thread during decisions each publish exactly one event"""
+        events = []
+        self.health_monitor.subscribe(lambda event, value: events.append(event))
+        toggler = threading.Thread(target=lambda: [self.health_monitor.toggle_heal() for _ in range(200)])
+        toggler.start()
+        for _ in range(200):
+            self.health_monitor.check_hp_and_heal(900)
+        toggler.join()
+        
+        self.assertEqual(events.count('heal_enabled'), 200)
+        self.assertTrue(self.health_monitor.get_snapshot()['heal_enabled'])
+
 if __name__ == '__main__':
     print("💊 HEALTH MONITOR EXTENDED TESTS")
     print("=" * 60)
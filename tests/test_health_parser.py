@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for HealthParser class
+
+Verifies candidate scoring for clean and corrupted OCR readings.
+"""
+
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+# Mock pyautogui before any imports
+sys.modules['pyautogui'] = Mock()
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from processing.health_parser import HealthParser
+
+
+class ParserTestConfig:
+    """Test configuration for HealthParser"""
+    def __init__(self, max_hp=1211):
+        self.max_hp = max_hp
+
+
+class TestHealthParser(unittest.TestCase):
+    """Tests for HealthParser functionality"""
+
+    def setUp(self):
+        self.parser = HealthParser(ParserTestConfig(), Mock())
+
+    def test_should_parse_clean_numbers(self):
+        """Plain digit readings parse unchanged"""
+        for text, expected in [('864', 864), ('1211', 1211), (' 1100\n', 1100), ('HP: 950', 950)]:
+            with self.subTest(text=text):
+                self.assertEqual(self.parser.parse(text), expected)
+
+    def test_should_fix_confused_characters(self):
+        """Letters commonly confused with digits are substituted"""
+        cases = [('S64', 864), ('B72', 872), ('1O5O', 1050), ('G64', 664), ('l64', 164), ('I64', 164)]
+        for text, expected in cases:
+            with self.subTest(text=text):
+                self.assertEqual(self.parser.parse(text), expected)
+
+    def test_should_join_split_digits(self):
+        """A single space inside a number is joined"""
+        self.assertEqual(self.parser.parse('86 4'), 864)
+
+    def test_should_drop_trailing_confusion(self):
+        """A trailing l/I that would exceed max HP is dropped"""
+        self.assertEqual(self.parser.parse('864l'), 864)
+
+    def test_should_reject_out_of_range_and_empty(self):
+        """Values above max HP and text without digits give no reading"""
+        for text in ['', 'HP', '9999', '--']:
+            with self.subTest(text=text):
+                self.assertIsNone(self.parser.parse(text))
+
+    def test_should_prefer_clean_candidate(self):
+        """A reading without substitutions beats a substituted one"""
+        candidates = self.parser.candidates('S64 1100')
+        scores = {value: score for value, score, _ in candidates}
+        self.assertGreater(scores[1100], scores[864])
+        self.assertEqual(self.parser.parse('S64 1100'), 1100)
+
+    def test_should_use_previous_value_to_break_ties(self):
+        """Equally likely candidates resolve to the one nearest the last value"""
+        self.assertEqual(self.parser.parse('1100/400'), 1100)
+        self.assertEqual(self.parser.parse('1100/400', previous=420), 400)
+
+    def test_should_not_let_previous_value_outweigh_reading(self):
+        """Two plausible readings keep the first; the prior never rescores a candidate"""
+        self.assertEqual(self.parser.parse('864 1067', previous=1000), 864)
+        self.assertEqual(self.parser.parse('S64 1100', previous=870), 1100)
+
+    def test_should_not_join_across_two_gaps(self):
+        """Separately read digits are not joined into a partial number"""
+        self.assertEqual(self.parser.candidates('1 2 3 4'), [])
+        self.assertIsNone(self.parser.parse('1 2 3 4'))
+        self.assertIsNone(self.parser.parse('1 2 3 4', previous=200))
+
+    def test_should_allow_larger_hp_pools(self):
+        """Five-digit values are accepted when max HP has five digits"""
+        parser = HealthParser(ParserTestConfig(max_hp=15000))
+        self.assertEqual(parser.parse('12345'), 12345)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for HPBarReader class
+
+Verifies that the HP percentage is read from the filled width of the bar.
+"""
+
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+import numpy as np
+
+# Mock pyautogui before any imports
+sys.modules['pyautogui'] = Mock()
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from processing.hp_bar_reader import HPBarReader
+
+
+FILL = (30, 30, 200)     # Red bar (BGR)
+EMPTY = (40, 40, 40)     # Dark background
+
+
+class BarTestConfig:
+    """Test configuration for HPBarReader"""
+    def __init__(self, fill_color=None):
+        self.max_hp = 1000
+        self.bar_fill_color = fill_color
+        self.bar_color_tolerance = 40
+
+
+def make_bar(fill_fraction, width=100, height=6):
+    """Create a bar image filled from the left"""
+    img = np.empty((height, width, 3), dtype=np.uint8)
+    img[:] = EMPTY
+    img[:, :int(round(width * fill_fraction))] = FILL
+    return img
+
+
+class TestHPBarReader(unittest.TestCase):
+    """Tests for HPBarReader functionality"""
+
+    def setUp(self):
+        self.reader = HPBarReader(BarTestConfig(FILL), Mock())
+
+    def test_should_not_read_without_calibration(self):
+        """An uncalibrated reader returns no reading"""
+        reader = HPBarReader(BarTestConfig())
+        self.assertFalse(reader.is_calibrated())
+        self.assertIsNone(reader.read_hp(make_bar(0.5)))
+
+    def test_should_read_fill_percentage(self):
+        """The filled share of columns is the HP percentage"""
+        for fraction in [1.0, 0.75, 0.55, 0.3, 0.0]:
+            with self.subTest(fraction=fraction):
+                self.assertAlmostEqual(self.reader.read_percentage(make_bar(fraction)), fraction, places=2)
+
+    def test_should_convert_to_absolute_hp(self):
+        """Percentage is scaled by max HP"""
+        self.assertEqual(self.reader.read_hp(make_bar(0.42)), 420)
+
+    def test_should_tolerate_colour_noise(self):
+        """Small colour variations still count as filled"""
+        img = make_bar(0.6)
+        noise = np.random.RandomState(0).randint(-15, 16, img.shape)
+        noisy = np.clip(img.astype(int) + noise, 0, 255).astype(np.uint8)
+        self.assertAlmostEqual(self.reader.read_percentage(noisy), 0.6, places=2)
+
+    def test_should_calibrate_from_full_bar(self):
+        """Calibration samples the fill colour from a full bar"""
+        reader = HPBarReader(BarTestConfig())
+        color = reader.calibrate(make_bar(1.0))
+        self.assertEqual(color, FILL)
+        self.assertAlmostEqual(reader.read_percentage(make_bar(0.8)), 0.8, places=2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
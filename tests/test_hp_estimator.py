@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for HPEstimator class
+
+Verifies outlier rejection, jump confirmation and the OCR early stop.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+import numpy as np
+
+# Mock pyautogui before any imports
+sys.modules['pyautogui'] = Mock()
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from processing.hp_estimator import HPEstimator
+from processing.ocr_processor import OCRProcessor
+from processing.frame import Frame
+from processing.ocr_strategy import TIER_FULL
+
+
+class EstimatorTestConfig:
+    """Test configuration for HPEstimator and OCRProcessor"""
+    def __init__(self):
+        self.max_hp = 1211
+        self.dramatic_drop_threshold = 0.4
+        self.critical_confirmation_time = 0.5
+        self.use_estimator = True
+        self.estimator_window = 5
+        self.estimator_tolerance = 0.02
+        self.use_digit_recognizer = False
+        self.use_frame_cache = False
+        self.tesseract_backend = 'subprocess'
+        self.tesseract_language = 'eng'
+        self.adaptive_ocr = False
+        self.ocr_stats_file = None
+        self.ocr_execution = 'sequential'
+        self.ocr_workers = 1
+
+
+class TestHPEstimator(unittest.TestCase):
+    """Tests for HPEstimator functionality"""
+
+    def setUp(self):
+        self.estimator = HPEstimator(EstimatorTestConfig(), Mock())
+
+    def feed(self, values, start=0.0, step=0.05):
+        """Feed readings one cycle apart and return the values to act on"""
+        return [self.estimator.update(v, start + i * step) for i, v in enumerate(values)]
+
+    def test_should_pass_plausible_readings_through(self):
+        """Normal readings are returned unchanged"""
+        self.assertEqual(self.feed([1211, 1200, 1150, 1000]), [1211, 1200, 1150, 1000])
+        estimate, uncertainty = self.estimator.estimate(0.15)
+        self.assertEqual(estimate, 1175)
+        self.assertGreater(uncertainty, 0)
+
+    def test_should_reject_single_misread(self):
+        """A one-frame misread returns the estimate instead"""
+        values = self.feed([1211, 1211, 1211, 121, 1211])
+        self.assertEqual(values, [1211, 1211, 1211, 1211, 1211])
+        self.assertEqual(self.estimator.get_stats()['rejected'], 1)
+        self.assertEqual(self.estimator.plausibility(121, 0.25), 0.0)
+
+    def test_should_accept_confirmed_jump(self):
+        """A real drop is acted on once the next reading repeats it"""
+        values = self.feed([1211, 1211, 1211, 300, 310])
+        self.assertEqual(values[3], 1211)
+        self.assertEqual(values[4], 310)
+        self.assertEqual(self.estimator.get_stats()['confirmed_jumps'], 1)
+
+    def test_should_not_confirm_after_timeout(self):
+        """A confirmation arriving too late counts as a new outlier"""
+        self.feed([1211, 1211, 1211])
+        self.estimator.update(300, 0.2)
+        self.assertEqual(self.estimator.update(300, 0.9), 1211)
+
+    def test_should_pass_failures_through(self):
+        """A failed read stays a failure so the monitor can count it"""
+        self.feed([1211])
+        self.assertIsNone(self.estimator.update(None, 0.05))
+
+    def test_should_report_consistency_only_when_confident(self):
+        """Early stop needs enough readings and a matching value"""
+        with patch('processing.hp_estimator.time.time', return_value=0.1):
+            self.feed([1000, 1000])
+            self.assertFalse(self.estimator.is_consistent(1000))
+            self.estimator.update(1000, 0.1)
+            self.assertTrue(self.estimator.is_consistent(1005))
+            self.assertFalse(self.estimator.is_consistent(900))
+
+
+class TestEstimatorEarlyStop(unittest.TestCase):
+    """Tests that a consistent first vote ends the cascade"""
+
+    def test_should_stop_after_consistent_vote(self):
+        """One method agreeing with the estimate is enough"""
+        config = EstimatorTestConfig()
+        ocr = OCRProcessor(config, Mock())
+        estimator = Mock()
+        estimator.is_consistent.return_value = True
+        ocr.register_estimator('hp', estimator)
+        frame = Frame(np.full((12, 34, 3), 40, dtype=np.uint8))
+
+        with patch.object(ocr, '_run_variant', return_value=1100) as mock_variant:
+            result = ocr.extract_number_from_region((0, 0, 34, 12), 'hp', frame, TIER_FULL)
+
+        self.assertEqual(result, 1100)
+        self.assertEqual(mock_variant.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
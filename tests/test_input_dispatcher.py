@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tests for InputDispatcher class
+
+Verifies that key presses are sent from one thread in priority order with
+pre-resolved keys and a recorded decision-to-send time.
+"""
+
+import unittest
+from unittest.mock import Mock, MagicMock, patch
+import sys
+import os
+import threading
+
+# Mock pyautogui before any imports
+sys.modules['pyautogui'] = Mock()
+
+# Create mock pynput modules
+mock_keyboard = MagicMock()
+sys.modules['pynput'] = MagicMock()
+sys.modules['pynput.keyboard'] = mock_keyboard
+sys.modules['pynput.mouse'] = MagicMock()
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from monitors.input_dispatcher import InputDispatcher, resolve_key
+from monitors.skinner import keyboard
+
+
+class DispatcherTestConfig:
+    """Test configuration for InputDispatcher"""
+    def __init__(self):
+        self.critical_heal_key = 'f6'
+        self.heal_key = 'f1'
+        self.haste_hotkey = 'x'
+        self.skinner_hotkey = 'f3'
+        self.gui_pause = 0
+
+
+class RecordingController:
+    """Controller stand-in recording pressed keys"""
+    def __init__(self, expected):
+        self.pressed = []
+        self.threads = set()
+        self.expected = expected
+        self.done = threading.Event()
+
+    def press(self, key):
+        self.pressed.append(key)
+        self.threads.add(threading.current_thread().name)
+
+    def release(self, key):
+        if len(self.pressed) >= self.expected:
+            self.done.set()
+
+
+class FailSafe(Exception):
+    """Stand-in for pyautogui.FailSafeException"""
+
+
+class TestInputDispatcher(unittest.TestCase):
+    """Tests for InputDispatcher functionality"""
+
+    def setUp(self):
+        self.latency = Mock()
+        patcher = patch('monitors.input_dispatcher.pyautogui', Mock(FailSafeException=FailSafe))
+        self.pyautogui = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_dispatcher(self, expected):
+        self.controller = RecordingController(expected)
+        return InputDispatcher(DispatcherTestConfig(), Mock(), self.latency, self.controller)
+
+    def test_keys_resolved_once(self):
+        """Configured keys are resolved to key objects up front"""
+        dispatcher = self.make_dispatcher(0)
+        self.assertIs(dispatcher.keys['f6'], keyboard.Key.f6)
+        self.assertEqual(dispatcher.keys['x'], 'x')
+
+    def test_pyautogui_key_names_resolved(self):
+        """pyautogui names map to the matching pynput keys"""
+        self.assertIs(resolve_key('pageup'), keyboard.Key.page_up)
+        self.assertIs(resolve_key('PgDn'), keyboard.Key.page_down)
+        self.assertIs(resolve_key('home'), keyboard.Key.home)
+        self.assertIs(resolve_key('f13'), keyboard.Key.f13)
+
+    def test_unknown_key_rejected_when_built(self):
+        """A key name with no pynput key raises instead of pressing another key"""
+        config = DispatcherTestConfig()
+        config.heal_key = 'num1'
+        with self.assertRaises(ValueError):
+            InputDispatcher(config, Mock(), self.latency, RecordingController(0))
+        with self.assertRaises(ValueError):
+            resolve_key('f25')
+
+    def test_critical_heal_sent_before_waiting_presses(self):
+        """Queued presses go out by priority, FIFO within a priority"""
+        dispatcher = self.make_dispatcher(5)
+        for key in ['f3', 'x', 'f1', 'f6', 'f3']:
+            dispatcher.press(key)
+        dispatcher.start()
+        self.assertTrue(self.controller.done.wait(1))
+        dispatcher.stop()
+
+        self.assertEqual(self.controller.pressed,
+                         [keyboard.Key.f6, keyboard.Key.f1, 'x', keyboard.Key.f3, keyboard.Key.f3])
+        self.assertEqual(self.controller.threads, {'input'})
+        self.assertFalse(dispatcher.is_running())
+
+    def test_decision_to_send_time_recorded_per_action(self):
+        """Every sent key records its wait under the action's stage"""
+        dispatcher = self.make_dispatcher(2)
+        dispatcher.start()
+        dispatcher.press('F6')
+        dispatcher.press('x')
+        self.assertTrue(self.controller.done.wait(1))
+        dispatcher.stop()
+
+        stages = [call[0][0] for call in self.latency.record.call_args_list]
+        self.assertEqual(stages, ['press', 'key_critical', 'press', 'key_haste'])
+        self.assertEqual(dispatcher.get_stats()['sent'], {'critical': 1, 'haste': 1})
+
+    def test_send_failure_does_not_stop_dispatcher(self):
+        """A controller error is logged and later presses still go out"""
+        dispatcher = self.make_dispatcher(1)
+        self.controller.press = Mock(side_effect=[RuntimeError("no display"), None])
+        self.controller.release = Mock(side_effect=lambda key: self.controller.done.set())
+        dispatcher.start()
+        dispatcher.press('f1')
+        dispatcher.press('f1')
+        self.assertTrue(self.controller.done.wait(1))
+        dispatcher.stop()
+
+        self.assertEqual(self.controller.press.call_count, 2)
+
+    def test_failsafe_drops_queue_and_stops(self):
+        """A triggered fail-safe sends nothing, drops waiting presses and reports it"""
+        on_failsafe = Mock()
+        self.controller = RecordingController(1)
+        dispatcher = InputDispatcher(DispatcherTestConfig(), Mock(), self.latency, self.controller, on_failsafe)
+        self.pyautogui.failSafeCheck.side_effect = FailSafe()
+        for key in ['f6', 'f1', 'x']:
+            dispatcher.press(key)
+        dispatcher.start()
+        dispatcher._thread.join(1)
+
+        on_failsafe.assert_called_once_with()
+        self.assertEqual(self.controller.pressed, [])
+        self.assertEqual(dispatcher.get_stats()['queued'], 0)
+        self.assertFalse(dispatcher.is_running())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for the latency histograms
+
+Verifies percentile estimates and that pipeline stages record timings.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+import numpy as np
+
+# Mock pyautogui before any imports
+sys.modules['pyautogui'] = Mock()
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from processing.latency import LatencyHistogram, LatencyRecorder, BUCKET_RATIO
+from processing.ocr_processor import OCRProcessor
+from processing.frame import Frame
+from processing.ocr_strategy import TIER_FULL
+from monitors.health_monitor import HealthMonitor
+
+
+class LatencyTestConfig:
+    """Test configuration for OCRProcessor and HealthMonitor"""
+    def __init__(self):
+        self.max_hp = 1000
+        self.use_digit_recognizer = False
+        self.use_frame_cache = False
+        self.tesseract_backend = 'subprocess'
+        self.tesseract_language = 'eng'
+        self.adaptive_ocr = False
+        self.ocr_stats_file = None
+        self.ocr_execution = 'sequential'
+        self.ocr_workers = 1
+        self.hp_critical_threshold = 0.55
+        self.hp_threshold = 0.75
+        self.cooldown = 0.1
+        self.critical_heal_key = 'f6'
+        self.heal_key = 'f1'
+        self.max_failures_warning = 5
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """Tests for LatencyHistogram percentiles"""
+
+    def test_empty_histogram(self):
+        """An empty histogram reports zeros"""
+        snapshot = LatencyHistogram().snapshot()
+        self.assertEqual(snapshot['count'], 0)
+        self.assertEqual(snapshot['p99_ms'], 0.0)
+
+    def test_percentiles_within_bucket_resolution(self):
+        """Percentiles land within one bucket of the true value"""
+        histogram = LatencyHistogram()
+        for ms in range(1, 101):
+            histogram.record(ms / 1000)
+
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot['count'], 100)
+        self.assertAlmostEqual(snapshot['max_ms'], 100.0)
+        self.assertAlmostEqual(snapshot['mean_ms'], 50.5)
+        for key, expected in [('p50_ms', 50), ('p95_ms', 95), ('p99_ms', 99)]:
+            with self.subTest(percentile=key):
+                self.assertGreaterEqual(snapshot[key], expected)
+                self.assertLessEqual(snapshot[key], expected * BUCKET_RATIO)
+
+    def test_percentile_clamped_to_max(self):
+        """A single sample reports exactly itself"""
+        histogram = LatencyHistogram()
+        histogram.record(0.0123)
+        self.assertAlmostEqual(histogram.snapshot()['p50_ms'], 12.3)
+
+
+class TestLatencyRecorder(unittest.TestCase):
+    """Tests for stage recording across the pipeline"""
+
+    def test_time_context_records_stage(self):
+        """The time() block records one sample"""
+        recorder = LatencyRecorder()
+        with recorder.time('capture'):
+            pass
+        self.assertEqual(recorder.snapshot()['capture']['count'], 1)
+        self.assertEqual(len(recorder.format_summary()), 1)
+
+    def test_ocr_stages_recorded(self):
+        """Threshold, scale, tesseract and parse are timed per variant"""
+        recorder = LatencyRecorder()
+        ocr = OCRProcessor(LatencyTestConfig(), Mock(), latency=recorder)
+        frame = Frame(np.full((12, 34, 3), 40, dtype=np.uint8))
+
+        with patch.object(ocr.tesseract, 'image_to_string', return_value='864'):
+            ocr.extract_number_from_region((0, 0, 34, 12), 'hp', frame, TIER_FULL)
+
+        stages = recorder.snapshot()
+        for stage in ['grayscale', 'threshold', 'scale', 'tesseract', 'parse']:
+            with self.subTest(stage=stage):
+                self.assertIn(stage, stages)
+        self.assertEqual(stages['tesseract']['count'], 2)
+
+    def test_key_press_recorded(self):
+        """HealthMonitor times the key press when a recorder is injected"""
+        recorder = LatencyRecorder()
+        monitor = HealthMonitor(LatencyTestConfig(), Mock(), recorder)
+
+        with patch('monitors.health_monitor.pyautogui.press'):
+            monitor.check_hp_and_heal(400)
+
+        self.assertEqual(recorder.snapshot()['press']['count'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for montage batching of OCR variants
+
+Verifies that variants are stacked with known row offsets, that word boxes
+are mapped back to their rows and that batch mode needs one OCR call.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+import numpy as np
+
+# Mock pyautogui before any imports
+sys.modules['pyautogui'] = Mock()
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from processing.montage import build_montage, split_words_by_row
+from processing.tesseract_engine import parse_tsv
+from processing.ocr_processor import OCRProcessor
+from processing.frame import Frame
+from processing.ocr_strategy import TIER_FULL
+
+
+class BatchTestConfig:
+    """Test configuration for OCRProcessor in batch mode"""
+    def __init__(self):
+        self.max_hp = 1211
+        self.use_digit_recognizer = False
+        self.use_frame_cache = False
+        self.tesseract_backend = 'subprocess'
+        self.tesseract_language = 'eng'
+        self.adaptive_ocr = False
+        self.ocr_stats_file = None
+        self.ocr_execution = 'batch'
+        self.ocr_workers = 1
+
+
+def word(text, top, height=20, left=10):
+    return {'left': left, 'top': top, 'width': 30, 'height': height, 'conf': 90.0, 'text': text}
+
+
+class TestMontage(unittest.TestCase):
+    """Tests for build_montage and split_words_by_row"""
+
+    def test_rows_are_separated_by_gaps(self):
+        """Each image gets its own row range with a blank band in between"""
+        images = [np.zeros((10, 20), np.uint8), np.zeros((30, 40), np.uint8)]
+        montage, rows = build_montage(images, gap=5)
+
+        self.assertEqual(rows, [(5, 15), (20, 50)])
+        self.assertEqual(montage.shape, (55, 50))
+        self.assertTrue((montage[15:20] == 255).all())
+
+    def test_words_map_to_their_rows(self):
+        """Words are joined left to right within the row of their centre"""
+        rows = [(5, 35), (50, 80), (95, 125)]
+        words = [word('4', 52, left=40), word('86', 55, left=10), word('1211', 100)]
+
+        self.assertEqual(split_words_by_row(words, rows), ['', '86 4', '1211'])
+
+    def test_words_in_separator_band_are_dropped(self):
+        """Noise between rows belongs to no variant"""
+        self.assertEqual(split_words_by_row([word('7', 36, height=4)], [(5, 35), (50, 80)]), ['', ''])
+
+    def test_parse_tsv_keeps_word_boxes(self):
+        """Only non-empty word-level TSV lines become word boxes"""
+        tsv = (
+            "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext\n"
+            "4\t1\t1\t1\t1\t0\t0\t10\t50\t20\t-1\t\n"
+            "5\t1\t1\t1\t1\t1\t16\t12\t48\t18\t91.5\t1211\n"
+            "5\t1\t1\t1\t2\t1\t16\t40\t48\t18\t-1\t \n"
+        )
+        self.assertEqual(parse_tsv(tsv), [word('1211', 12, height=18, left=16) | {'width': 48, 'conf': 91.5}])
+
+
+class TestBatchOCR(unittest.TestCase):
+    """Tests for batch mode in OCRProcessor"""
+
+    def setUp(self):
+        self.ocr = OCRProcessor(BatchTestConfig(), Mock())
+        self.frame = Frame(np.full((12, 34, 3), 40, dtype=np.uint8))
+
+    def test_whole_cascade_is_one_ocr_call(self):
+        """Every variant row is recognized by a single image_to_data call"""
+        def fake_data(montage, config=''):
+            # Same reading on every row of the montage
+            _, rows = build_montage(self._rows, self.ocr.MONTAGE_GAP)
+            return [word('1100', top + 2, height=bottom - top - 4) for top, bottom in rows]
+
+        self._rows = [np.zeros((12 * s, 34 * s), np.uint8) for _ in self.ocr.THRESHOLD_METHODS for s in self.ocr.FAST_SCALES]
+
+        with patch.object(self.ocr.tesseract, 'image_to_data', side_effect=fake_data) as mock_data:
+            result = self.ocr.extract_number_from_region((0, 0, 34, 12), 'hp', self.frame, TIER_FULL)
+
+        self.assertEqual(result, 1100)
+        self.assertEqual(mock_data.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
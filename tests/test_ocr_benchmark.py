@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for the offline OCR benchmark
+
+Verifies corpus labeling and the accuracy, confusion and call-count report
+using a stubbed Tesseract backend.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+import json
+import tempfile
+
+import numpy as np
+
+# Mock pyautogui before any imports
+sys.modules['pyautogui'] = Mock()
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from processing.ocr_benchmark import load_corpus, run_benchmark, format_report
+import processing.frame as frame_module
+
+
+class BenchmarkTestConfig:
+    """Test configuration for the benchmarked OCRProcessors"""
+    def __init__(self):
+        self.max_hp = 1211
+        self.use_digit_recognizer = False
+        self.template_min_confidence = 0.9
+        self.digit_atlas_file = None
+        self.use_frame_cache = True
+        self.tesseract_backend = 'subprocess'
+        self.tesseract_language = 'eng'
+        self.adaptive_ocr = True
+        self.ocr_stats_file = 'should_not_be_written.json'
+        self.ocr_execution = 'sequential'
+        self.ocr_workers = 2
+
+
+class TestOCRBenchmark(unittest.TestCase):
+    """Tests for load_corpus and run_benchmark"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = self.tmp.name
+        for filename in ['1100_a.npy', '0864_b.npy', 'unlabeled.npy', 'renamed.npy']:
+            np.save(os.path.join(self.directory, filename), np.full((12, 34, 3), 40, dtype=np.uint8))
+        with open(os.path.join(self.directory, 'labels.json'), 'w') as f:
+            json.dump({'renamed.npy': 999}, f)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_load_corpus_labels(self):
+        """Labels come from labels.json, then the filename prefix"""
+        corpus = load_corpus(self.directory)
+        labels = {filename: value for filename, _, value in corpus}
+        self.assertEqual(labels, {'0864_b.npy': 864, '1100_a.npy': 1100, 'renamed.npy': 999})
+        self.assertEqual(corpus[0][1].region, (0, 0, 34, 12))
+
+    def test_report_accuracy_confusions_and_calls(self):
+        """Every strategy reports accuracy, confusion pairs and Tesseract calls"""
+        corpus = load_corpus(self.directory)
+        # Every frame reads as 1100, so 864 and 999 are confused with it
+        with patch('processing.tesseract_engine._SubprocessBackend.recognize', return_value='1100'):
+            report = run_benchmark(BenchmarkTestConfig(), corpus, ['template', 'fast', 'cascade', 'fallback'])
+
+        self.assertEqual(report['frames'], 3)
+        self.assertEqual(report['strategies']['template'], {'skipped': 'no digit atlas'})
+
+        for name in ['fast', 'cascade', 'fallback']:
+            with self.subTest(strategy=name):
+                result = report['strategies'][name]
+                self.assertEqual(result['correct'], 1)
+                self.assertAlmostEqual(result['accuracy'], 1 / 3)
+                self.assertEqual(result['misses'], 0)
+                self.assertIn({'expected': 864, 'read': 1100, 'count': 1}, result['confusions'])
+                self.assertGreater(result['calls_per_frame'], 0)
+                self.assertGreater(result['fps'], 0)
+
+        # The cheapest tier runs one variant of each of the two best methods
+        self.assertEqual(report['strategies']['fast']['calls_per_frame'], 2)
+        self.assertFalse(os.path.exists('should_not_be_written.json'))
+        self.assertEqual(len(format_report(report)), 4)
+        json.dumps(report)
+
+    def test_strategies_convert_their_own_frames(self):
+        """Corpus frames are copied per strategy, so no strategy reuses another's conversions"""
+        corpus = load_corpus(self.directory)
+        with patch('processing.tesseract_engine._SubprocessBackend.recognize', return_value='1100'), \
+                patch('processing.frame.to_gray', wraps=frame_module.to_gray) as to_gray:
+            run_benchmark(BenchmarkTestConfig(), corpus, ['fast', 'cascade'])
+
+        self.assertEqual(to_gray.call_count, 2 * len(corpus))
+        for _, frame, _ in corpus:
+            self.assertIsNone(frame._gray)
+            self.assertEqual(frame._thresholds, {})
+
+    def test_unknown_strategy_rejected(self):
+        """A misspelled strategy fails before any OCR runs"""
+        with self.assertRaises(ValueError):
+            run_benchmark(BenchmarkTestConfig(), [], ['casade'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
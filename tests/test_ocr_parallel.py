@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for parallel OCR variant execution
+
+Verifies that variants run on the worker pool, that the first consensus of two
+methods is returned and that the remaining variants are cancelled.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+import threading
+import time
+
+import numpy as np
+
+# Mock pyautogui before any imports
+sys.modules['pyautogui'] = Mock()
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from processing.ocr_processor import OCRProcessor
+from processing.frame import Frame
+from processing.ocr_strategy import TIER_FULL
+
+
+class ParallelTestConfig:
+    """Test configuration for OCRProcessor in parallel mode"""
+    def __init__(self):
+        self.max_hp = 1211
+        self.use_digit_recognizer = False
+        self.use_frame_cache = False
+        self.tesseract_backend = 'subprocess'
+        self.tesseract_language = 'eng'
+        self.adaptive_ocr = False
+        self.ocr_stats_file = None
+        self.ocr_execution = 'parallel'
+        self.ocr_workers = 4
+
+
+class TestParallelOCR(unittest.TestCase):
+    """Tests for parallel OCR execution"""
+
+    def setUp(self):
+        self.ocr = OCRProcessor(ParallelTestConfig(), Mock())
+        self.frame = Frame(np.full((12, 34, 3), 40, dtype=np.uint8))
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        self.ocr.executor.shutdown(wait=True, cancel_futures=True)
+
+    def test_returns_first_consensus(self):
+        """Two methods agreeing end the frame without waiting for the rest"""
+        def fake_variant(thresh, scale, config, value_type):
+            with self.lock:
+                self.calls.append(scale)
+            time.sleep(0.01)
+            return 1100
+
+        with patch.object(self.ocr, '_run_variant', side_effect=fake_variant):
+            result = self.ocr.extract_number_from_region((0, 0, 34, 12), 'hp', self.frame, TIER_FULL)
+
+        self.assertEqual(result, 1100)
+        self.assertLess(len(self.calls), len(self.ocr.variants))
+
+    def test_uses_multiple_threads(self):
+        """Variants run concurrently on the worker pool"""
+        threads = set()
+
+        def fake_variant(thresh, scale, config, value_type):
+            threads.add(threading.current_thread().name)
+            time.sleep(0.005)
+            return None
+
+        with patch.object(self.ocr, '_run_variant', side_effect=fake_variant):
+            result = self.ocr.extract_number_from_region((0, 0, 34, 12), 'hp', self.frame, TIER_FULL)
+
+        self.assertIsNone(result)
+        self.assertGreater(len(threads), 1)
+
+    def test_single_method_result_without_consensus(self):
+        """Without agreement the vote falls back to the single valid result"""
+        def fake_variant(thresh, scale, config, value_type):
+            return 900 if thresh is marker else None
+
+        marker = np.zeros((12, 34), dtype=np.uint8)
+        with patch.object(self.ocr, '_threshold', side_effect=lambda gray, name: marker if name == 'Adaptive' else gray), \
+             patch.object(self.ocr, '_run_variant', side_effect=fake_variant):
+            result = self.ocr.extract_number_from_region((0, 0, 34, 12), 'hp', self.frame, TIER_FULL)
+
+        self.assertEqual(result, 900)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for OCRStrategy and the effort ladder in OCRProcessor
+
+Verifies that the best variants are tried first, that effort escalates with
+consecutive failures and that learned statistics persist.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Mock pyautogui before any imports
+sys.modules['pyautogui'] = Mock()
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from processing.ocr_strategy import OCRStrategy, TIER_BEST, TIER_FULL, TIER_FALLBACK
+from processing.ocr_processor import OCRProcessor
+from processing.frame import Frame
+
+
+PSM8 = '--psm 8 -c tesseract_char_whitelist=0123456789'
+PSM7 = '--psm 7 -c tesseract_char_whitelist=0123456789'
+
+VARIANTS = [
+    ('OTSU', 3, PSM8), ('OTSU', 3, PSM7),
+    ('InvOTSU', 3, PSM8), ('InvOTSU', 3, PSM7),
+    ('Adaptive', 3, PSM8), ('Adaptive', 3, PSM7),
+]
+
+
+class StrategyTestConfig:
+    """Test configuration for OCRStrategy and OCRProcessor"""
+    def __init__(self, stats_file=None, adaptive=True):
+        self.max_hp = 1211
+        self.adaptive_ocr = adaptive
+        self.ocr_stats_file = stats_file
+        self.use_digit_recognizer = False
+        self.use_frame_cache = False
+        self.tesseract_backend = 'subprocess'
+        self.tesseract_language = 'eng'
+        self.ocr_execution = 'sequential'
+        self.ocr_workers = 1
+
+
+class TestOCRStrategy(unittest.TestCase):
+    """Tests for OCRStrategy functionality"""
+
+    def setUp(self):
+        self.strategy = OCRStrategy(StrategyTestConfig())
+
+    def test_tier_follows_consecutive_failures(self):
+        """Effort escalates with failures and drops back after a success"""
+        self.assertEqual(self.strategy.tier_for(0), TIER_BEST)
+        self.assertEqual(self.strategy.tier_for(1), TIER_FULL)
+        self.assertEqual(self.strategy.tier_for(2), TIER_FALLBACK)
+        self.assertEqual(self.strategy.tier_for(10), TIER_FALLBACK)
+
+    def test_disabled_strategy_always_uses_full_effort(self):
+        """Without adaptation every cycle runs the whole cascade"""
+        strategy = OCRStrategy(StrategyTestConfig(adaptive=False))
+        self.assertEqual(strategy.tier_for(0), TIER_FALLBACK)
+
+    def test_default_order_without_statistics(self):
+        """Untried variants keep the original cascade order"""
+        plan = self.strategy.plan(VARIANTS, TIER_FULL)
+        self.assertEqual([method for method, _ in plan], ['OTSU', 'InvOTSU', 'Adaptive'])
+        self.assertEqual(plan[0][1], [(3, PSM8), (3, PSM7)])
+
+    def test_best_variant_goes_first(self):
+        """The historically best method and PSM are tried first"""
+        key = OCRStrategy.variant_key('Adaptive', 3, PSM7)
+        self.strategy.record([(key, 900, 0.01)] * 5, 900)
+        self.strategy.record([(OCRStrategy.variant_key('OTSU', 3, PSM8), None, 0.01)] * 5, 900)
+
+        plan = self.strategy.plan(VARIANTS, TIER_FULL)
+        self.assertEqual(plan[0], ('Adaptive', [(3, PSM7), (3, PSM8)]))
+
+    def test_best_tier_tries_one_variant_of_two_methods(self):
+        """The cheapest tier is limited to two OCR calls"""
+        plan = self.strategy.plan(VARIANTS, TIER_BEST)
+        self.assertEqual(plan, [('OTSU', [(3, PSM8)]), ('InvOTSU', [(3, PSM8)])])
+
+    def test_disagreeing_variant_is_not_a_success(self):
+        """Only readings matching the accepted value count as successes"""
+        key = OCRStrategy.variant_key('OTSU', 3, PSM8)
+        self.strategy.record([(key, 121, 0.01)], 1211)
+        self.assertEqual(self.strategy.stats[key][:2], [1, 0])
+
+    def test_frozen_strategy_keeps_its_order(self):
+        """With learning off, recorded attempts leave the statistics unchanged"""
+        self.strategy.learning = False
+        self.strategy.record([(OCRStrategy.variant_key('Adaptive', 3, PSM7), 900, 0.01)], 900)
+        self.assertEqual(self.strategy.stats, {})
+
+    def test_statistics_persist(self):
+        """Saved statistics are loaded by the next session"""
+        with tempfile.TemporaryDirectory() as tmp:
+            stats_file = os.path.join(tmp, 'stats.json')
+            strategy = OCRStrategy(StrategyTestConfig(stats_file))
+            key = OCRStrategy.variant_key('InvOTSU', 3, PSM8)
+            strategy.record([(key, 800, 0.02)], 800)
+            strategy.save()
+
+            reloaded = OCRStrategy(StrategyTestConfig(stats_file))
+            self.assertEqual(reloaded.stats[key], [1, 1, 0.02])
+
+
+class TestOCRProcessorEffortLadder(unittest.TestCase):
+    """Tests for the effort tiers in OCRProcessor"""
+
+    def setUp(self):
+        self.ocr = OCRProcessor(StrategyTestConfig(), Mock())
+        self.frame = Frame(np.full((12, 34, 3), 40, dtype=np.uint8))
+
+    def test_best_tier_stops_after_two_calls(self):
+        """A failing cheap tier costs two OCR calls and skips the fallback"""
+        with patch.object(self.ocr, '_run_variant', return_value=None) as mock_variant, \
+             patch.object(self.ocr.tesseract, 'image_to_string', return_value='') as mock_fallback:
+            result = self.ocr._extract_with_fallback((0, 0, 34, 12), 'hp', self.frame, TIER_BEST)
+
+        self.assertIsNone(result)
+        self.assertEqual(mock_variant.call_count, 2)
+        mock_fallback.assert_not_called()
+
+    def test_two_agreeing_methods_return_early(self):
+        """Voting stops as soon as two methods produced a value"""
+        with patch.object(self.ocr, '_run_variant', return_value=1100) as mock_variant:
+            result = self.ocr.extract_number_from_region((0, 0, 34, 12), 'hp', self.frame, TIER_FULL)
+
+        self.assertEqual(result, 1100)
+        self.assertEqual(mock_variant.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tests for the event-driven overlay
+
+Verifies that monitors publish only changed state and that the overlay
+redraws only the canvas items whose text or color changed.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+# Mock pyautogui before any imports
+sys.modules['pyautogui'] = Mock()
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from monitors.health_monitor import HealthMonitor
+from monitors.observable import Observable
+from ui.overlay import GameOverlay
+
+
+class OverlayTestConfig:
+    """Test configuration for HealthMonitor and GameOverlay"""
+    def __init__(self):
+        self.max_hp = 1000
+        self.hp_critical_threshold = 0.55
+        self.hp_threshold = 0.75
+        self.cooldown = 0.0
+        self.critical_heal_key = 'f6'
+        self.heal_key = 'f1'
+        self.haste_hotkey = 'x'
+        self.max_failures_warning = 5
+
+
+class TestObservable(unittest.TestCase):
+    """Tests for the Observable mixin"""
+
+    def test_subscribers_receive_events_until_unsubscribed(self):
+        """Every subscriber gets each event until it unsubscribes"""
+        observable = Observable()
+        first, second = Mock(), Mock()
+        observable.subscribe(first)
+        observable.subscribe(second)
+
+        observable.publish('enabled', True)
+        observable.unsubscribe(first)
+        observable.publish('enabled', False)
+
+        first.assert_called_once_with('enabled', True)
+        self.assertEqual(second.call_count, 2)
+
+
+class TestHealthMonitorEvents(unittest.TestCase):
+    """Tests for the events HealthMonitor publishes"""
+
+    def setUp(self):
+        self.health_monitor = HealthMonitor(OverlayTestConfig(), Mock())
+        self.listener = Mock()
+        self.health_monitor.subscribe(self.listener)
+
+    def test_unchanged_state_publishes_nothing(self):
+        """Healthy readings change no displayed state"""
+        self.health_monitor.check_hp_and_heal(950)
+        self.health_monitor.check_hp_and_heal(900)
+        self.listener.assert_not_called()
+
+    def test_heal_and_toggle_publish_changed_fields(self):
+        """A heal publishes its counter, a toggle its flag"""
+        with patch('monitors.health_monitor.pyautogui.press'):
+            self.health_monitor.check_hp_and_heal(400)
+        self.health_monitor.toggle_heal()
+
+        self.assertEqual(self.listener.call_args_list[0][0], ('critical_heals', 1))
+        self.assertEqual(self.listener.call_args_list[1][0], ('heal_enabled', False))
+        self.assertEqual(self.listener.call_count, 2)
+
+    def test_failures_publish_error_status_changes(self):
+        """Each failure changes the failure count in the error status"""
+        for _ in range(3):
+            self.health_monitor.check_hp_and_heal(None)
+        event, value = self.listener.call_args[0]
+        self.assertEqual(event, 'error_status')
+        self.assertTrue(value['has_error'])
+
+
+class TestOverlayRedraw(unittest.TestCase):
+    """Tests for applying events to the canvas without a display"""
+
+    def setUp(self):
+        self.health_monitor = HealthMonitor(OverlayTestConfig(), Mock())
+        self.paused = False
+        self.overlay = GameOverlay(OverlayTestConfig(), self.health_monitor, lambda: self.paused)
+        self.overlay.canvas = Mock()
+        for index, name in enumerate(['status', 'heal_btn', 'critical_btn', 'normal_heals', 'critical_heals']):
+            self.overlay.items[name] = index
+        self.overlay.drawn = {'status': ("ACTIVE", '#00c000'), 'heal_btn': ("[ON]", '#00c000'),
+                              'critical_btn': ("[ON]", '#00c000'), 'normal_heals': ("0", '#00c000'),
+                              'critical_heals': ("0", '#c00000')}
+        self.overlay._subscribe()
+
+    def test_initial_state_redraws_nothing_unchanged(self):
+        """Drawing the startup state only touches items that differ from the layout"""
+        self.overlay._show_current_state()
+        self.overlay.canvas.itemconfigure.assert_not_called()
+
+    def test_queued_events_redraw_only_changed_items(self):
+        """A heal reconfigures its counter item and nothing else"""
+        with patch('monitors.health_monitor.pyautogui.press'):
+            self.health_monitor.check_hp_and_heal(400)
+            self.health_monitor.check_hp_and_heal(950)
+        self.assertEqual(len(self.overlay.events), 1)
+
+        self.overlay._apply_events()
+        self.overlay.canvas.itemconfigure.assert_called_once_with(4, text="1", fill='#c00000')
+        self.assertEqual(len(self.overlay.events), 0)
+
+    def test_status_follows_errors_and_pause(self):
+        """The status line combines the error status and paused flag"""
+        self.overlay._apply_event('health', 'error_status', {'has_error': True, 'is_warning': False})
+        self.assertEqual(self.overlay.drawn['status'][0], "DETECT...")
+
+        self.overlay._apply_event('health', 'error_status', {'has_error': False, 'is_warning': False})
+        self.overlay.paused = True
+        self.overlay._update_status()
+        self.assertEqual(self.overlay.drawn['status'][0], "PAUSED")
+
+    def test_unsubscribe_stops_queueing(self):
+        """Closing the overlay stops it receiving events"""
+        self.overlay._unsubscribe()
+        self.health_monitor.toggle_critical()
+        self.assertEqual(len(self.overlay.events), 0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
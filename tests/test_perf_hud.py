@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Tests for the overlay performance HUD
+
+Verifies that the HUD figures cover only the last window of the cumulative
+counters and how they are drawn.
+"""
+
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+# Mock pyautogui before any imports
+sys.modules['pyautogui'] = Mock()
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from processing.latency import LatencyRecorder
+from ui.perf_hud import PerfHUD
+from ui.overlay import GameOverlay
+
+
+class PerfTestConfig:
+    """Test configuration for PerfHUD"""
+    def __init__(self):
+        self.monitor_frequency = 0.05
+        self.overlay_perf_window = 5.0
+        self.hp_critical_threshold = 0.55
+        self.hp_threshold = 0.75
+
+
+class FakeSources:
+    """Counters the HUD samples, advanced by the tests"""
+    def __init__(self):
+        self.sensing_loop = Mock(cycle_count=0, period=0.05)
+        self.latency = LatencyRecorder()
+        self.ocr_processor = Mock()
+        self.stats = {'reads': 0, 'successes': 0, 'fallbacks': 0}
+        self.ocr_processor.get_read_stats.side_effect = lambda: dict(self.stats)
+        self.health_monitor = Mock()
+        self.health_monitor.get_snapshot.return_value = {'last_valid_time': None}
+
+    def run(self, cycles, seconds, successes, fallbacks=0):
+        for _ in range(cycles):
+            self.latency.record('cycle', seconds)
+        self.sensing_loop.cycle_count += cycles
+        self.stats['reads'] += cycles
+        self.stats['successes'] += successes
+        self.stats['fallbacks'] += fallbacks
+
+
+class TestPerfHUD(unittest.TestCase):
+    """Tests for the rolling figures"""
+
+    def setUp(self):
+        self.sources = FakeSources()
+        self.hud = PerfHUD(PerfTestConfig(), self.sources.sensing_loop, self.sources.latency,
+                           self.sources.ocr_processor, self.sources.health_monitor)
+
+    def test_no_data_before_second_sample(self):
+        """The first sample has nothing to difference against"""
+        figures = self.hud.sample(now=100.0)
+        self.assertIsNone(figures['rate'])
+        self.assertIsNone(figures['p99_ms'])
+        self.assertIsNone(figures['ocr_success'])
+        self.assertEqual(figures['target_rate'], 20.0)
+
+    def test_figures_cover_only_recent_window(self):
+        """A slow, failing start drops out of the figures once it is a window old"""
+        self.hud.sample(now=100.0)
+        self.sources.run(10, 0.200, successes=0, fallbacks=10)
+        self.hud.sample(now=101.0)
+        for second in range(102, 108):
+            self.sources.run(20, 0.010, successes=19, fallbacks=1)
+            figures = self.hud.sample(now=float(second))
+
+        self.assertAlmostEqual(figures['rate'], 20.0)
+        self.assertLess(figures['p99_ms'], 15.0)
+        self.assertAlmostEqual(figures['ocr_success'], 0.95)
+        self.assertAlmostEqual(figures['fallback_rate'], 0.05)
+
+    def test_time_since_last_valid_reading(self):
+        """The age of the last valid reading comes from the monitor snapshot"""
+        self.sources.health_monitor.get_snapshot.return_value = {'last_valid_time': 98.5}
+        self.assertAlmostEqual(self.hud.sample(now=100.0)['since_valid'], 1.5)
+
+
+class TestLatencyWindow(unittest.TestCase):
+    """Tests for percentiles between two bucket count copies"""
+
+    def test_percentile_between_ignores_earlier_samples(self):
+        """Only the samples recorded between the copies count"""
+        latency = LatencyRecorder()
+        self.assertIsNone(latency.bucket_counts('cycle'))
+        for _ in range(100):
+            latency.record('cycle', 0.5)
+        before = latency.bucket_counts('cycle')
+        for _ in range(10):
+            latency.record('cycle', 0.002)
+
+        p99 = LatencyRecorder.percentile_between(before, latency.bucket_counts('cycle'), 0.99)
+        self.assertGreaterEqual(p99, 0.002)
+        self.assertLess(p99, 0.003)
+        self.assertIsNone(LatencyRecorder.percentile_between(before, before, 0.99))
+
+
+class TestPerfHUDDrawing(unittest.TestCase):
+    """Tests for drawing HUD figures into the overlay canvas"""
+
+    def make_overlay(self):
+        overlay = GameOverlay(PerfTestConfig(), Mock(), lambda: False, perf_hud=Mock())
+        overlay.canvas = Mock()
+        for index, name in enumerate(['perf_rate', 'perf_latency', 'perf_ocr', 'perf_fallback', 'perf_valid']):
+            overlay.items[name] = index
+        return overlay
+
+    def test_figures_drawn_with_status_colors(self):
+        """A loop behind its target rate is drawn in orange"""
+        overlay = self.make_overlay()
+        overlay._show_perf({'rate': 12.0, 'target_rate': 20.0, 'p50_ms': 20.0, 'p99_ms': 40.0,
+                            'ocr_success': 0.98, 'fallback_rate': 0.02, 'since_valid': 0.2})
+
+        self.assertEqual(overlay.drawn['perf_rate'], ("12.0/20.0 Hz", '#ff8800'))
+        self.assertEqual(overlay.drawn['perf_latency'], ("20/40 ms", '#00c000'))
+        self.assertEqual(overlay.drawn['perf_ocr'][0], "98%")
+        self.assertEqual(overlay.drawn['perf_valid'][0], "0.2s ago")
+
+    def test_stale_reading_not_red_while_paused(self):
+        """No reading is checked while paused, so its age is drawn dimmed, not red"""
+        overlay = self.make_overlay()
+        overlay.paused = True
+        overlay._show_perf({'rate': 5.0, 'target_rate': 5.0, 'p50_ms': 20.0, 'p99_ms': 40.0,
+                            'ocr_success': 0.98, 'fallback_rate': 0.02, 'since_valid': 12.0})
+
+        self.assertEqual(overlay.drawn['perf_valid'], ("12.0s ago", '#707070'))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for RateController class
+
+Verifies that the sensing rate drops only while HP is stable and high and
+returns to the maximum rate at once on any sign of danger.
+"""
+
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+# Mock pyautogui before any imports
+sys.modules['pyautogui'] = Mock()
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from monitors.rate_controller import RateController
+
+
+class RateTestConfig:
+    """Test configuration for RateController"""
+    def __init__(self):
+        self.max_hp = 1000
+        self.hp_threshold = 0.75
+        self.sampling_min_rate = 5.0
+        self.sampling_max_rate = 20.0
+        self.sampling_stable_seconds = 3.0
+        self.sampling_threshold_margin = 0.1
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRateController(unittest.TestCase):
+    """Tests for RateController functionality"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.logger = Mock()
+        self.controller = RateController(RateTestConfig(), self.logger, self.clock)
+
+    def run_for(self, seconds, hp_value, step=0.25, **kwargs):
+        """Feed the same reading every step seconds, return the last period"""
+        period = None
+        for _ in range(int(round(seconds / step))):
+            period = self.controller.update(hp_value, **kwargs)
+            self.clock.now += step
+        return period
+
+    def test_slows_down_after_stable_high_hp(self):
+        """Full, stable HP drops to the minimum rate only after the stable time"""
+        self.assertEqual(self.run_for(2.0, 1000), 0.05)
+        self.assertEqual(self.run_for(1.5, 1000), 0.2)
+        self.assertTrue(any('RATE' in str(call) for call in self.logger.log.call_args_list))
+
+    def test_danger_returns_to_max_rate_immediately(self):
+        """A drop, a heal, a failed reading or HP near the threshold each restore the max rate"""
+        for reading, kwargs in [(900, {}), (1000, {'healed': True}), (None, {}), (840, {})]:
+            self.run_for(4.0, 1000)
+            self.assertEqual(self.controller.update(reading, **kwargs), 0.05, (reading, kwargs))
+
+    def test_held_back_drop_is_urgent(self):
+        """A drop the estimator holds back restores the max rate though the estimate is unchanged"""
+        self.run_for(4.0, 1000)
+        self.assertEqual(self.controller.update(1000, held_back=300), 0.05)
+
+    def test_held_back_rise_is_not_urgent(self):
+        """A held-back jump upwards is no danger"""
+        self.run_for(4.0, 900)
+        self.assertEqual(self.controller.update(900, held_back=1000), 0.2)
+
+    def test_small_noise_is_not_a_drop(self):
+        """A drop under the tolerance does not reset the calm period"""
+        self.run_for(4.0, 1000)
+        self.assertEqual(self.controller.update(995), 0.2)
+
+    def test_paused_samples_at_min_rate(self):
+        """Nothing is healed while paused, so sampling is slow even at low HP"""
+        self.assertEqual(self.controller.update(300, paused=True), 0.2)
+
+    def test_time_at_each_rate(self):
+        """Each period is accounted to the rate that was in effect"""
+        self.run_for(3.0, 1000)
+        self.run_for(2.0, 1000)
+        stats = self.controller.get_stats()
+
+        self.assertAlmostEqual(stats['time_at_rate'][20.0], 3.0)
+        self.assertAlmostEqual(stats['time_at_rate'][5.0], 1.75)
+        self.assertEqual(stats['changes'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for the screen capture backends
+
+Uses the file-backed backend as a synthetic screen.
+"""
+
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Mock pyautogui before any imports
+sys.modules['pyautogui'] = Mock()
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from processing.screen_capture import FileCapture, PyAutoGUICapture, create_screen_capture, to_gray, union_region
+
+
+class CaptureTestConfig:
+    """Test configuration for the capture factory"""
+    def __init__(self, backend, path=None):
+        self.capture_backend = backend
+        self.capture_file = path
+
+
+class TestScreenCapture(unittest.TestCase):
+    """Tests for screen capture backends"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'screen.npy')
+        self.screen = np.random.RandomState(0).randint(0, 256, (120, 200, 3), dtype=np.uint8)
+        np.save(self.path, self.screen)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_should_crop_region_from_file(self):
+        """A grab returns exactly the requested region"""
+        capture = FileCapture(self.path)
+        frame = capture.grab((10, 20, 50, 30))
+        self.assertEqual(frame.shape, (30, 50, 3))
+        np.testing.assert_array_equal(frame, self.screen[20:50, 10:60])
+
+    def test_should_return_view_without_copy(self):
+        """File frames share memory with the loaded screen"""
+        capture = FileCapture(self.path)
+        frame = capture.grab((0, 0, 20, 10))
+        self.assertTrue(np.shares_memory(frame, capture.screen))
+
+    def test_should_record_latency_stats(self):
+        """Every grab is counted and timed"""
+        capture = FileCapture(self.path)
+        for _ in range(3):
+            capture.grab((0, 0, 10, 10))
+        stats = capture.get_stats()
+        self.assertEqual(stats['backend'], 'file')
+        self.assertEqual(stats['grabs'], 3)
+        self.assertGreaterEqual(stats['max_ms'], stats['mean_ms'])
+
+    def test_factory_should_select_file_backend(self):
+        """The configured backend is created"""
+        capture = create_screen_capture(CaptureTestConfig('file', self.path), Mock())
+        self.assertIsInstance(capture, FileCapture)
+
+    def test_factory_should_fall_back_to_pyautogui(self):
+        """An unavailable backend falls back to pyautogui"""
+        logger = Mock()
+        capture = create_screen_capture(CaptureTestConfig('file', None), logger)
+        self.assertIsInstance(capture, PyAutoGUICapture)
+        self.assertTrue(any('unavailable' in str(call) for call in logger.log.call_args_list))
+
+    def test_should_compute_union_region(self):
+        """The union covers every region"""
+        self.assertEqual(union_region([(10, 20, 30, 10), (25, 5, 10, 10)]), (10, 5, 30, 25))
+
+    def test_should_grab_regions_once(self):
+        """Nearby regions come from one grab as zero-copy slices"""
+        capture = FileCapture(self.path)
+        regions = {'hp': (10, 20, 40, 12), 'hp_bar': (10, 34, 60, 6), 'mana': None}
+        frames = capture.grab_regions(regions)
+
+        self.assertEqual(capture.get_stats()['grabs'], 1)
+        self.assertEqual(set(frames), {'hp', 'hp_bar'})
+        np.testing.assert_array_equal(frames['hp'], self.screen[20:32, 10:50])
+        np.testing.assert_array_equal(frames['hp_bar'], self.screen[34:40, 10:70])
+        self.assertIs(frames['hp'].base, frames['hp_bar'].base)
+
+    def test_should_grab_distant_regions_separately(self):
+        """Regions far apart are not merged into a mostly empty grab"""
+        capture = FileCapture(self.path)
+        frames = capture.grab_regions({'hp': (0, 0, 5, 5), 'hp_bar': (190, 110, 5, 5)})
+
+        self.assertEqual(capture.get_stats()['grabs'], 2)
+        np.testing.assert_array_equal(frames['hp_bar'], self.screen[110:115, 190:195])
+
+    def test_should_convert_bgra_to_gray(self):
+        """Four-channel frames from mss/xshm convert to grayscale"""
+        bgra = np.zeros((4, 6, 4), dtype=np.uint8)
+        bgra[:, :, :3] = 200
+        gray = to_gray(bgra)
+        self.assertEqual(gray.shape, (4, 6))
+        self.assertTrue((gray == 200).all())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for SensingLoop class
+
+Verifies that monitoring cycles run on a dedicated thread.
+"""
+
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+import threading
+import time
+
+# Mock pyautogui before any imports
+sys.modules['pyautogui'] = Mock()
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from monitors.sensing_loop import SensingLoop
+
+
+class LoopTestConfig:
+    """Test configuration for SensingLoop"""
+    def __init__(self):
+        self.monitor_frequency = 0.01
+
+
+class TestSensingLoop(unittest.TestCase):
+    """Tests for SensingLoop functionality"""
+
+    def setUp(self):
+        self.threads = []
+        self.cycled = threading.Event()
+
+    def cycle(self):
+        self.threads.append(threading.current_thread())
+        if len(self.threads) >= 3:
+            self.cycled.set()
+
+    def test_should_run_cycles_off_main_thread(self):
+        """Cycles repeat on the sensing thread, not the caller's"""
+        loop = SensingLoop(LoopTestConfig(), self.cycle, Mock())
+        loop.start()
+        self.assertTrue(self.cycled.wait(1))
+        loop.stop()
+
+        self.assertNotIn(threading.main_thread(), self.threads)
+        self.assertEqual({t.name for t in self.threads}, {'sensing'})
+        self.assertFalse(loop.is_running())
+
+    def test_should_survive_cycle_exceptions(self):
+        """An exception in one cycle does not kill the thread"""
+        calls = []
+
+        def failing_cycle():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("capture failed")
+            self.cycled.set()
+
+        logger = Mock()
+        loop = SensingLoop(LoopTestConfig(), failing_cycle, logger)
+        loop.start()
+        self.assertTrue(self.cycled.wait(1))
+        loop.stop()
+
+        self.assertGreaterEqual(len(calls), 2)
+        self.assertTrue(any('capture failed' in str(call) for call in logger.log.call_args_list))
+
+    def test_stop_should_not_wait_out_the_period(self):
+        """stop() wakes the thread instead of waiting a full period"""
+        config = LoopTestConfig()
+        config.monitor_frequency = 5
+        loop = SensingLoop(config, self.cycle)
+        loop.start()
+        time.sleep(0.05)
+
+        start = time.perf_counter()
+        loop.stop()
+        self.assertLess(time.perf_counter() - start, 1)
+
+
+class TestFixedRateSchedule(unittest.TestCase):
+    """Tests for the drift-compensated deadline grid"""
+
+    def test_deadlines_stay_on_grid(self):
+        """Work time inside the period does not shift the next deadline"""
+        loop = SensingLoop(LoopTestConfig(), Mock())
+        self.assertAlmostEqual(loop._next_deadline(1.00, 1.004), 1.01)
+        self.assertAlmostEqual(loop._next_deadline(1.01, 1.019), 1.02)
+        self.assertEqual(loop.overruns, 0)
+
+    def test_overrun_skips_missed_ticks(self):
+        """A cycle running past several ticks resumes on the next tick, once"""
+        loop = SensingLoop(LoopTestConfig(), Mock())
+        self.assertAlmostEqual(loop._next_deadline(1.00, 1.035), 1.04)
+        self.assertEqual(loop.overruns, 1)
+        self.assertEqual(loop.skipped_ticks, 3)
+
+    def test_rate_holds_despite_cycle_work(self):
+        """Cycle starts stay a period apart while each cycle takes half of it"""
+        config = LoopTestConfig()
+        config.monitor_frequency = 0.02
+        starts = []
+
+        def working_cycle():
+            starts.append(time.monotonic())
+            time.sleep(0.01)
+            if len(starts) >= 11:
+                self.cycled.set()
+
+        self.cycled = threading.Event()
+        latency = Mock()
+        loop = SensingLoop(config, working_cycle, Mock(), latency)
+        loop.start()
+        self.assertTrue(self.cycled.wait(2))
+        loop.stop()
+
+        # A sleep-after-work loop would take ~0.3s for 10 periods
+        self.assertLess(starts[10] - starts[0], 0.26)
+        self.assertEqual(latency.record.call_args[0][0], 'jitter')
+        self.assertEqual(loop.get_stats()['period_ms'], 20)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
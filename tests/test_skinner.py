@@ -119,9 +119,9 @@ class TestSkinner(unittest.TestCase):
         self.skinner.toggle()
         
         self.debug_logger.log.assert_called()
-        call_args = self.debug_logger.log.call_args[0][0]
-        self.assertIn('SKINNER', call_args)
-        self.assertIn('ENABLED', call_args)
+        message, state = self.debug_logger.log.call_args[0]
+        self.assertIn('SKINNER', message)
+        self.assertEqual(state, 'ENABLED')
     
     def test_should_not_respond_when_disabled(self):
         """Should not press key when disabled"""
@@ -187,6 +187,28 @@ class TestSkinner(unittest.TestCase):
         stats = self.skinner.get_stats()
         self.assertEqual(stats['enabled'], True)
     
+    def test_click_goes_through_dispatcher_when_given(self):
+        """With an input dispatcher the key is queued, not sent directly"""
+        dispatcher = Mock()
+        skinner = Skinner(self.config, self.debug_logger, dispatcher)
+        skinner.keyboard_controller.reset_mock()
+        skinner.enabled = True
+        
+        skinner._on_click(100, 200, mouse.Button.right, True)
+        
+        dispatcher.press.assert_called_once_with('f3')
+        skinner.keyboard_controller.press.assert_not_called()
+    
+    def test_toggle_and_click_publish_events(self):
+        """Toggling and clicking should publish the changed state"""
+        listener = Mock()
+        self.skinner.subscribe(listener)
+        
+        self.skinner.toggle()
+        self.skinner._on_click(100, 200, mouse.Button.right, True)
+        
+        self.assertEqual([c[0] for c in listener.call_args_list], [('enabled', True), ('click_count', 1)])
+    
     def test_is_enabled_returns_correct_state(self):
         """is_enabled should return current enabled state"""
         self.assertFalse(self.skinner.is_enabled())
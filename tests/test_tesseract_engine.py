@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Tests for TesseractEngine class
+
+Verifies config parsing, backend selection and that settings on a
+persistent Tesseract handle do not leak between calls.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+import threading
+
+import numpy as np
+
+# Mock pyautogui before any imports
+sys.modules['pyautogui'] = Mock()
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from processing.tesseract_engine import TesseractEngine, parse_tesseract_config, _PersistentBackend
+
+
+class EngineTestConfig:
+    """Test configuration for TesseractEngine"""
+    def __init__(self, backend='subprocess'):
+        self.tesseract_backend = backend
+        self.tesseract_language = 'eng'
+
+
+class FakePersistentBackend(_PersistentBackend):
+    """Records every call a real Tesseract handle would receive"""
+    name = 'fake'
+
+    def __init__(self):
+        super().__init__()
+        self.variables = {'tessedit_char_whitelist': ''}
+        self.calls = []
+
+    def _set_page_seg_mode(self, psm):
+        self.calls.append(('psm', psm))
+
+    def _get_variable(self, name):
+        return self.variables.get(name)
+
+    def _set_variable(self, name, value):
+        self.calls.append(('set', name, value))
+        self.variables[name] = value
+
+    def _recognize_image(self, image):
+        return '1211'
+
+
+class TestParseTesseractConfig(unittest.TestCase):
+    """Tests for parse_tesseract_config helper"""
+
+    def test_parses_psm_and_variables(self):
+        """Page segmentation mode and -c variables are extracted"""
+        psm, variables = parse_tesseract_config('--psm 8 -c tessedit_char_whitelist=0123456789')
+        self.assertEqual(psm, 8)
+        self.assertEqual(variables, {'tessedit_char_whitelist': '0123456789'})
+
+    def test_parses_psm_only(self):
+        """A config without variables yields an empty dict"""
+        self.assertEqual(parse_tesseract_config('--psm 7'), (7, {}))
+
+    def test_parses_empty_config(self):
+        """An empty config has no settings"""
+        self.assertEqual(parse_tesseract_config(''), (None, {}))
+
+
+class TestTesseractEngine(unittest.TestCase):
+    """Tests for TesseractEngine functionality"""
+
+    def test_subprocess_backend_uses_pytesseract(self):
+        """The subprocess backend passes the config string to pytesseract"""
+        engine = TesseractEngine(EngineTestConfig('subprocess'))
+        image = np.zeros((10, 20), dtype=np.uint8)
+
+        with patch('processing.tesseract_engine.pytesseract.image_to_string', return_value='864') as mock_ocr:
+            text = engine.image_to_string(image, config='--psm 8')
+
+        self.assertEqual(text, '864')
+        self.assertEqual(mock_ocr.call_args[1]['config'], '--psm 8')
+        self.assertEqual(engine.call_count, 1)
+
+    def test_unknown_backend_falls_back_to_subprocess(self):
+        """An unknown backend name never leaves the engine without a backend"""
+        debug_logger = Mock()
+        engine = TesseractEngine(EngineTestConfig('does-not-exist'), debug_logger)
+        self.assertEqual(engine.backend.name, 'subprocess')
+
+    def test_persistent_backend_skips_unchanged_settings(self):
+        """Repeated configs do not resend the same settings to the handle"""
+        backend = FakePersistentBackend()
+        backend.recognize(None, 8, {'tessedit_char_whitelist': '0123456789'})
+        backend.recognize(None, 8, {'tessedit_char_whitelist': '0123456789'})
+
+        self.assertEqual(backend.calls, [
+            ('psm', 8),
+            ('set', 'tessedit_char_whitelist', '0123456789'),
+        ])
+
+    def test_persistent_backend_restores_default_variables(self):
+        """A variable dropped from the config is restored to its default"""
+        backend = FakePersistentBackend()
+        backend.recognize(None, 8, {'tessedit_char_whitelist': '0123456789'})
+        backend.recognize(None, 7, {})
+
+        self.assertEqual(backend.variables['tessedit_char_whitelist'], '')
+
+    def test_persistent_backend_resets_psm_without_flag(self):
+        """A config without --psm returns the handle to the default mode"""
+        backend = FakePersistentBackend()
+        backend.recognize(None, 8, {})
+        backend.recognize(None, None, {})
+
+        self.assertEqual(backend.calls, [('psm', 8), ('psm', _PersistentBackend.DEFAULT_PSM)])
+
+    def test_first_ocr_thread_gets_the_initial_handle(self):
+        """The handle made at construction goes to the first thread that runs OCR"""
+        engine = TesseractEngine(EngineTestConfig('subprocess'))
+        used = []
+        worker = threading.Thread(target=lambda: used.append(engine._thread_backend()))
+        worker.start()
+        worker.join()
+
+        self.assertIs(used[0], engine.backend)
+        self.assertIsNot(engine._thread_backend(), engine.backend)
+        self.assertEqual(len(engine._backends), 2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)